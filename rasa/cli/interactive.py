@@ -1,6 +1,7 @@
 import argparse
 import os
 import shutil
+import tempfile
 from typing import List
 
 import rasa.cli.run as run
@@ -93,7 +94,7 @@ def perform_interactive_learning(args, zipped_model):
     from rasa.core.train import do_interactive_learning
 
     if zipped_model:
-        model_path = model.unpack_model(zipped_model)
+        model_path = model.unpack_model(zipped_model, tempfile.mkdtemp())
         args.core, args.nlu = model.get_model_subdirectories(model_path)
         stories_directory = data.get_core_directory(args.data)
 
@@ -67,5 +67,6 @@ def show_stories(args: argparse.Namespace):
             args.nlu_data,
             args.output,
             args.max_history,
+            args.max_nodes,
         )
     )
@@ -124,6 +124,21 @@ def _add_nlu_arguments(
         help="number of CV folds (crossvalidation only)",
     )
 
+    parser.add_argument(
+        "--worker-processes",
+        type=int,
+        default=1,
+        help="number of processes which train and evaluate the CV folds "
+        "in parallel (crossvalidation only)",
+    )
+
+    parser.add_argument(
+        "--random-seed",
+        type=int,
+        default=None,
+        help="seed of the CV fold split (crossvalidation only)",
+    )
+
     parser.add_argument(
         "--report",
         required=False,
@@ -209,7 +224,7 @@ def test_core(args: argparse.Namespace) -> None:
         )
 
     else:
-        test_compare(args.model, stories, output)
+        test_compare(args.model, stories, output, args.worker_processes)
 
 
 def test_nlu(args: argparse.Namespace) -> None:
@@ -226,7 +241,13 @@ def test_nlu(args: argparse.Namespace) -> None:
         print ("No model specified. Model will be trained using cross validation.")
         config = get_validated_path(args.config, "config", DEFAULT_CONFIG_PATH)
 
-        test_nlu_with_cross_validation(config, nlu_data, args.folds)
+        test_nlu_with_cross_validation(
+            config,
+            nlu_data,
+            args.folds,
+            worker_processes=args.worker_processes,
+            random_seed=args.random_seed,
+        )
 
 
 def test(args: argparse.Namespace):
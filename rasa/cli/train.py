@@ -54,6 +54,7 @@ def add_subparser(
         core_cli.add_general_args(p)
     add_stories_param(train_core_parser)
     _add_core_compare_arguments(train_core_parser)
+    _add_core_continue_arguments(train_core_parser)
 
     add_nlu_data_param(train_nlu_parser)
 
@@ -84,6 +85,13 @@ def add_general_arguments(parser: argparse.ArgumentParser):
         default=DEFAULT_MODELS_PATH,
         help="Directory where your models are stored",
     )
+    parser.add_argument(
+        "--archive-format",
+        choices=["gz", "tar", "zst"],
+        default="gz",
+        help="Format of the model archive. Uncompressed ('tar') models load "
+        "fastest, 'zst' requires the 'zstd' extra ('pip install rasa[zstd]').",
+    )
 
 
 def _add_core_compare_arguments(parser: argparse.ArgumentParser):
@@ -108,6 +116,18 @@ def _add_core_compare_arguments(parser: argparse.ArgumentParser):
     )
 
 
+def _add_core_continue_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--continue-from",
+        type=str,
+        default=None,
+        help="Trained model whose Core model should continue training on "
+        "the given stories instead of training a new model. The policies "
+        "are trained on the new stories and a bounded sample of their "
+        "previous training data.",
+    )
+
+
 def train(args: argparse.Namespace) -> Optional[Text]:
     import rasa
 
@@ -125,6 +145,7 @@ def train(args: argparse.Namespace) -> Optional[Text]:
         args.out,
         args.force,
         extract_additional_arguments(args),
+        args.archive_format,
     )
 
 
@@ -140,6 +161,14 @@ def train_core(
     args.domain = get_validated_path(args.domain, "domain", DEFAULT_DOMAIN_PATH)
     stories = get_validated_path(args.stories, "stories", DEFAULT_DATA_PATH)
 
+    continue_from = getattr(args, "continue_from", None)
+    if continue_from:
+        from rasa.train import continue_training
+
+        return continue_training(
+            continue_from, stories, output, archive_format=args.archive_format
+        )
+
     _train_path = train_path or tempfile.mkdtemp()
 
     # Policies might be a list for the compare training. Do normal training
@@ -157,11 +186,18 @@ def train_core(
             output,
             train_path,
             extract_additional_arguments(args),
+            args.archive_format,
         )
     else:
         from rasa.core.train import do_compare_training
 
-        loop.run_until_complete(do_compare_training(args, stories, None))
+        additional_arguments = extract_additional_arguments(args)
+        # `do_compare_training` passes the `dump_stories` flag separately
+        additional_arguments.pop("dump_stories", None)
+
+        loop.run_until_complete(
+            do_compare_training(args, stories, additional_arguments)
+        )
         return None
 
 
@@ -175,7 +211,7 @@ def train_nlu(
     config = args.config or DEFAULT_CONFIG_PATH
     nlu_data = get_validated_path(args.nlu, "nlu", DEFAULT_DATA_PATH)
 
-    return train_nlu(config, nlu_data, output, train_path)
+    return train_nlu(config, nlu_data, output, train_path, args.archive_format)
 
 
 def extract_additional_arguments(args: argparse.Namespace) -> Dict:
@@ -187,5 +223,9 @@ def extract_additional_arguments(args: argparse.Namespace) -> Dict:
         arguments["dump_stories"] = args.dump_stories
     if "debug_plots" in args:
         arguments["debug_plots"] = args.debug_plots
+    if "worker_processes" in args:
+        arguments["worker_processes"] = args.worker_processes
+    if "cache_dir" in args:
+        arguments["cache_dir"] = args.cache_dir
 
     return arguments
@@ -91,24 +91,30 @@ def parse_last_positional_argument_as_model_path() -> None:
 
 
 def create_output_path(
-    output_path: Text = DEFAULT_MODELS_PATH, prefix: Text = ""
+    output_path: Text = DEFAULT_MODELS_PATH,
+    prefix: Text = "",
+    archive_format: Text = "gz",
 ) -> Text:
     """Creates an output path which includes the current timestamp.
 
     Args:
         output_path: The path where the model should be stored.
         prefix: A prefix which should be included in the output path.
+        archive_format: The format of the model archive (`gz`, `tar` or `zst`).
 
     Returns:
         The generated output path, e.g. "20191201-103002.tar.gz".
     """
     import time
+    from rasa.model import ARCHIVE_FORMATS, archive_format_from_path
 
-    if output_path.endswith("tar.gz"):
+    if archive_format_from_path(output_path):
         return output_path
     else:
         time_format = "%Y%m%d-%H%M%S"
-        file_name = "{}{}.tar.gz".format(prefix, time.strftime(time_format))
+        file_name = "{}{}{}".format(
+            prefix, time.strftime(time_format), ARCHIVE_FORMATS[archive_format]
+        )
         return os.path.join(output_path, file_name)
 
 
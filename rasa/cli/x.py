@@ -8,10 +8,8 @@ from multiprocessing import get_context
 from typing import List, Text
 
 import rasa.utils.io
-import questionary
 
 import rasa.cli.run
-import rasa.core.utils
 from rasa.cli.utils import print_success, get_validated_path
 
 from rasa.constants import (
@@ -111,6 +109,7 @@ def start_event_service():
 
 def is_metrics_collection_enabled(args: argparse.Namespace) -> bool:
     """Make sure the user consents to any metrics collection."""
+    import questionary
 
     try:
         allow_metrics = read_global_config_value("metrics", unavailable_ok=False)
@@ -1,5 +1,4 @@
 import os
-import pkg_resources
 
 DEFAULT_ENDPOINTS_PATH = "endpoints.yml"
 DEFAULT_CREDENTIALS_PATH = "credentials.yml"
@@ -9,10 +8,11 @@ DEFAULT_ACTIONS_PATH = "actions"
 DEFAULT_MODELS_PATH = "models"
 DEFAULT_DATA_PATH = "data"
 DEFAULT_RESULTS_PATH = "results"
+DEFAULT_CACHE_PATH = os.path.join(".rasa", "cache")
 DEFAULT_REQUEST_TIMEOUT = 60 * 5  # 5 minutes
 
-FALLBACK_CONFIG_PATH = pkg_resources.resource_filename(
-    __name__, "cli/default_config.yml"
+FALLBACK_CONFIG_PATH = os.path.join(
+    os.path.dirname(__file__), "cli", "default_config.yml"
 )
 CONFIG_MANDATORY_KEYS_CORE = ["policies"]
 CONFIG_MANDATORY_KEYS_NLU = ["language", "pipeline"]
@@ -23,6 +23,7 @@ from rasa.core.policies import FormPolicy, Policy
 from rasa.core.policies.ensemble import PolicyEnsemble, SimplePolicyEnsemble
 from rasa.core.policies.memoization import MemoizationPolicy
 from rasa.core.processor import MessageProcessor
+from rasa.core.reminders import ReminderScheduler, ReminderStore
 from rasa.core.tracker_store import InMemoryTrackerStore
 from rasa.core.trackers import DialogueStateTracker
 from rasa.core.utils import LockCounter
@@ -35,6 +36,7 @@ if typing.TYPE_CHECKING:
     # noinspection PyPep8Naming
     from rasa.core.nlg import NaturalLanguageGenerator as NLG
     from rasa.core.tracker_store import TrackerStore
+    from rasa.core.training.cache import TrainingDataCache
     from sanic import Sanic
 
 
@@ -84,7 +86,9 @@ def _load_and_set_updated_model(
 
         nlu_model = os.path.join(stack_model_directory, "nlu")
         core_model = os.path.join(stack_model_directory, "core")
-        interpreter = RasaNLUInterpreter(model_directory=nlu_model)
+        interpreter = RasaNLUInterpreter(
+            model_directory=nlu_model, num_threads=agent.num_threads
+        )
     else:
         interpreter = agent.interpreter
         core_model = model_directory
@@ -94,7 +98,9 @@ def _load_and_set_updated_model(
 
     # noinspection PyBroadException
     try:
-        policy_ensemble = PolicyEnsemble.load(core_model)
+        policy_ensemble = PolicyEnsemble.load(
+            core_model, agent.num_threads, agent.lazy_policies
+        )
         agent.update_model(domain, policy_ensemble, fingerprint, interpreter)
         logger.debug("Finished updating agent to new model.")
     except Exception:
@@ -230,6 +236,9 @@ class Agent(object):
         tracker_store: Optional["TrackerStore"] = None,
         action_endpoint: Optional[EndpointConfig] = None,
         fingerprint: Optional[Text] = None,
+        reminder_store: Optional[ReminderStore] = None,
+        num_threads: int = 1,
+        lazy_policies: bool = False,
     ):
         # Initializing variables with the passed parameters.
         self.domain = self._create_domain(domain)
@@ -247,7 +256,13 @@ class Agent(object):
         self.nlg = NaturalLanguageGenerator.create(generator, self.domain)
         self.tracker_store = self.create_tracker_store(tracker_store, self.domain)
         self.action_endpoint = action_endpoint
+        self.reminder_scheduler = ReminderScheduler(
+            reminder_store, self.create_processor
+        )
         self.conversations_in_processing = {}
+        # used to load the models pulled from a model server
+        self.num_threads = num_threads
+        self.lazy_policies = lazy_policies
 
         self._set_fingerprint(fingerprint)
 
@@ -279,8 +294,15 @@ class Agent(object):
         generator: Union[EndpointConfig, "NLG"] = None,
         tracker_store: Optional["TrackerStore"] = None,
         action_endpoint: Optional[EndpointConfig] = None,
+        num_threads: int = 1,
+        lazy_policies: bool = False,
+        reminder_store: Optional[ReminderStore] = None,
     ) -> "Agent":
-        """Load a persisted model from the passed path."""
+        """Load a persisted model from the passed path.
+
+        The policies are loaded with `num_threads` threads. If
+        `lazy_policies` is set, they are loaded in the background and the
+        first prediction waits until they are ready."""
 
         if not path:
             raise ValueError(
@@ -301,7 +323,9 @@ class Agent(object):
             )
 
         domain = Domain.load(os.path.join(path, DEFAULT_DOMAIN_PATH))
-        ensemble = PolicyEnsemble.load(path) if path else None
+        ensemble = (
+            PolicyEnsemble.load(path, num_threads, lazy_policies) if path else None
+        )
 
         # ensures the domain hasn't changed between test and train
         domain.compare_with_specification(path)
@@ -313,6 +337,9 @@ class Agent(object):
             generator=generator,
             tracker_store=tracker_store,
             action_endpoint=action_endpoint,
+            reminder_store=reminder_store,
+            num_threads=num_threads,
+            lazy_policies=lazy_policies,
         )
 
     def is_ready(self):
@@ -514,6 +541,8 @@ class Agent(object):
         use_story_concatenation: bool = True,
         debug_plots: bool = False,
         exclusion_percentage: int = None,
+        worker_processes: int = 1,
+        cache: Optional["TrainingDataCache"] = None,
     ) -> List[DialogueStateTracker]:
         """Load training data from a resource."""
 
@@ -548,6 +577,8 @@ class Agent(object):
             use_story_concatenation,
             debug_plots,
             exclusion_percentage=exclusion_percentage,
+            worker_processes=worker_processes,
+            cache=cache,
         )
 
     def train(
@@ -688,6 +719,7 @@ class Agent(object):
         nlu_training_data: Optional[Text] = None,
         should_merge_nodes: bool = True,
         fontsize: int = 12,
+        max_nodes: Optional[int] = None,
     ) -> None:
         from rasa.core.training.visualization import visualize_stories
         from rasa.core.training.dsl import StoryFileReader
@@ -708,6 +740,7 @@ class Agent(object):
             nlu_training_data,
             should_merge_nodes,
             fontsize,
+            max_nodes=max_nodes,
         )
 
     def _ensure_agent_is_ready(self) -> None:
@@ -738,6 +771,7 @@ class Agent(object):
             self.nlg,
             action_endpoint=self.action_endpoint,
             message_preprocessor=preprocessor,
+            reminder_scheduler=self.reminder_scheduler,
         )
 
     @staticmethod
@@ -785,7 +819,10 @@ class Agent(object):
     def _is_form_policy_present(self) -> bool:
         """Check whether form policy is present and used."""
 
-        has_form_policy = self.policy_ensemble and any(
+        if not self.domain or not self.domain.form_names:
+            # avoids waiting for policies which are loaded in the background
+            return True
+
+        return bool(self.policy_ensemble) and any(
             isinstance(p, FormPolicy) for p in self.policy_ensemble.policies
         )
-        return not self.domain or not self.domain.form_names or has_form_policy
@@ -1,6 +1,11 @@
+import atexit
+import gzip
 import json
 import logging
-from typing import Any, Dict, Optional, Text
+import threading
+import time
+from queue import Empty, Full, Queue
+from typing import Any, Dict, List, Optional, Text
 
 from rasa.core.utils import class_from_module_path
 from rasa.utils.endpoints import EndpointConfig
@@ -54,17 +59,244 @@ class EventChannel(object):
         raise NotImplementedError("Event broker must implement the `publish` method.")
 
 
-class PikaProducer(EventChannel):
+class BatchingEventChannel(EventChannel):
+    """Event channel which publishes the events in a background thread.
+
+    `publish` only serializes the event and puts it into a bounded in-memory
+    queue, hence the response time to users doesn't depend on the latency
+    of the broker. A background thread takes the queued events in batches
+    and passes them to `_publish_batch`.
+
+    A batch is complete if it contains `batch_size` events, at least
+    `max_batch_bytes` bytes or if no further event was queued during
+    `linger` seconds after its first event.
+
+    If the queue is full, the event is dropped. `publish` is called on the
+    event loop of the server, hence it only waits for the broker to catch
+    up if `publish_timeout` is set, for at most that many seconds. The
+    `metrics` show how often this happens. `close` publishes the queued
+    events before the producer is closed, it is called when the interpreter
+    exits and waits at most `close_timeout` seconds then."""
+
+    def __init__(
+        self,
+        max_queue_size: int = 10000,
+        batch_size: int = 100,
+        max_batch_bytes: int = 1024 * 1024,
+        linger: float = 0.0,
+        publish_timeout: float = 0,
+        close_timeout: float = 10,
+    ) -> None:
+        self.batch_size = batch_size
+        self.max_batch_bytes = max_batch_bytes
+        self.linger = linger
+        self.publish_timeout = publish_timeout
+        self.close_timeout = close_timeout
+
+        self._events = Queue(maxsize=max_queue_size)
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self._closing = threading.Event()
+
+        # counters are changed by the publishing threads and the background
+        # thread
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "published": 0,
+            "batches": 0,
+            "failed_publishes": 0,
+            "blocked_publishes": 0,
+            "blocked_seconds": 0.0,
+            "dropped": 0,
+        }
+
+    def publish(self, event: Dict[Text, Any]) -> None:
+        """Queues the event, it is published by a background thread."""
+
+        if self._closing.is_set():
+            logger.error(
+                "Can't publish event, the event broker {} is closed.".format(self)
+            )
+            self._count("dropped")
+            return
+
+        self._ensure_worker()
+        body = json.dumps(event)
+        try:
+            self._events.put_nowait(body)
+            return
+        except Full:
+            pass
+
+        if self.publish_timeout > 0:
+            start = time.time()
+            try:
+                self._events.put(body, timeout=self.publish_timeout)
+                return
+            except Full:
+                pass
+            finally:
+                self._count("blocked_publishes")
+                self._count("blocked_seconds", time.time() - start)
+
+        logger.error(
+            "Dropped event, because the queue of the event broker {} is "
+            "full.".format(self)
+        )
+        self._count("dropped")
+
+    def _count(self, metric: Text, value: float = 1) -> None:
+        with self._metrics_lock:
+            self._metrics[metric] += value
+
+    def metrics(self) -> Dict[Text, Any]:
+        """Returns the number of queued, published and dropped events, how
+        often and how long `publish` was blocked by a full queue, and how
+        often publishing a batch failed."""
+
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        metrics["queued"] = self._events.qsize()
+        metrics["max_queue_size"] = self._events.maxsize
+        return metrics
+
+    def flush(self) -> None:
+        """Waits until all queued events are published (or dropped)."""
+
+        if self._worker is not None:
+            self._events.join()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Publishes the queued events and closes the producer."""
+
+        self._closing.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+            if self._worker.is_alive():
+                logger.error(
+                    "Failed to publish the {} queued events with the event "
+                    "broker {} in time.".format(self._events.qsize(), self)
+                )
+
+    def _ensure_worker(self) -> None:
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._publish_queued_events,
+                    name="{}-worker".format(type(self).__name__),
+                    daemon=True,
+                )
+                self._worker.start()
+                atexit.register(self.close, self.close_timeout)
+
+    def _publish_queued_events(self) -> None:
+        while not (self._closing.is_set() and self._events.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._publish_and_count(batch)
+            else:
+                self._on_idle()
+
+        self._close()
+
+    def _next_batch(self) -> List[Text]:
+        try:
+            # wake up regularly to call `_on_idle` and check for `close`
+            batch = [self._events.get(timeout=1)]
+        except Empty:
+            return []
+
+        num_bytes = len(batch[0])
+        deadline = time.time() + self.linger
+        while len(batch) < self.batch_size and num_bytes < self.max_batch_bytes:
+            remaining = deadline - time.time()
+            try:
+                if remaining > 0:
+                    body = self._events.get(timeout=remaining)
+                else:
+                    body = self._events.get_nowait()
+            except Empty:
+                break
+            batch.append(body)
+            num_bytes += len(body)
+        return batch
+
+    def _publish_and_count(self, batch: List[Text]) -> None:
+        try:
+            published = self._publish_batch(batch)
+        except Exception as e:
+            logger.error(
+                "Failed to publish {} events with the event broker {}: {}"
+                "".format(len(batch), self, e)
+            )
+            self._count("failed_publishes")
+            published = 0
+
+        self._count("published", published)
+        self._count("dropped", len(batch) - published)
+        self._count("batches")
+        for _ in batch:
+            self._events.task_done()
+
+    def _publish_batch(self, batch: List[Text]) -> int:
+        """Publishes the json-formatted events and returns how many of them
+        were published."""
+
+        raise NotImplementedError(
+            "Event broker must implement the `_publish_batch` method."
+        )
+
+    def _on_idle(self) -> None:
+        """Called regularly while there are no events to publish."""
+
+        pass
+
+    def _close(self) -> None:
+        """Closes the connection to the broker, called by the background
+        thread after the last batch."""
+
+        pass
+
+
+class PikaProducer(BatchingEventChannel):
+    """Publishes events to a RabbitMQ queue.
+
+    The events are published in batches over a long-lived connection, which
+    is reopened if it breaks. Every publish is confirmed by the broker,
+    unconfirmed events are published again."""
+
     def __init__(
-        self, host, username, password, queue="rasa_core_events", loglevel=logging.INFO
+        self,
+        host,
+        username,
+        password,
+        queue="rasa_core_events",
+        loglevel=logging.INFO,
+        confirm_delivery=True,
+        connection_attempts=20,
+        retry_delay=5,
+        **kwargs: Any
     ):
         import pika
 
+        super(PikaProducer, self).__init__(**kwargs)
         logging.getLogger("pika").setLevel(loglevel)
 
         self.queue = queue
         self.host = host
         self.credentials = pika.PlainCredentials(username, password)
+        self.confirm_delivery = confirm_delivery
+        self.connection_attempts = connection_attempts
+        self.retry_delay = retry_delay
+
+        self._connection = None
+        self._channel = None
+        self._metrics["connections"] = 0
+        # a failure while closing drops the remaining events
+        self._gave_up = False
+
+    def __str__(self) -> Text:
+        return "pika ({} at {})".format(self.queue, self.host)
 
     @classmethod
     def from_endpoint_config(
@@ -75,45 +307,119 @@ class PikaProducer(EventChannel):
 
         return cls(broker_config.url, **broker_config.kwargs)
 
-    def publish(self, event):
-        self._open_connection()
-        self._publish(json.dumps(event))
-        self._close()
+    def _publish_batch(self, batch: List[Text]) -> int:
+        published = 0
+        while published < len(batch) and not self._gave_up:
+            try:
+                channel = self._get_channel()
+                for body in batch[published:]:
+                    # returns `False` if the broker didn't confirm the publish
+                    if channel.basic_publish("", self.queue, body) is False:
+                        raise ValueError("Publish was not confirmed by the broker.")
+                    published += 1
+            except Exception as e:
+                self._count("failed_publishes")
+                self._close()
+                # retry until the producer is closed, then drop the events
+                if self._closing.is_set():
+                    logger.error(
+                        "Dropped the queued events, failed to publish them to "
+                        "queue {} at {} before closing the producer: {}"
+                        "".format(self.queue, self.host, e)
+                    )
+                    self._gave_up = True
+                    break
+                logger.warning(
+                    "Failed to publish events to queue {} at {}, retrying in {} "
+                    "seconds: {}".format(self.queue, self.host, self.retry_delay, e)
+                )
+                # `close` interrupts the waiting, the events get one last try
+                self._closing.wait(self.retry_delay)
+
+        logger.debug(
+            "Published {} pika events to queue {} at {}."
+            "".format(published, self.queue, self.host)
+        )
+        return published
+
+    def _get_channel(self):
+        if self._connection is None or self._connection.is_closed:
+            self._open_connection()
+        return self._channel
 
-    def _open_connection(self):
+    def _open_connection(self) -> None:
         import pika
 
+        # the queued events get a single attempt while closing
+        attempts = 1 if self._closing.is_set() else self.connection_attempts
         parameters = pika.ConnectionParameters(
             self.host,
             credentials=self.credentials,
-            connection_attempts=20,
-            retry_delay=5,
+            connection_attempts=attempts,
+            retry_delay=self.retry_delay,
         )
-        self.connection = pika.BlockingConnection(parameters)
-        self.channel = self.connection.channel()
-        self.channel.queue_declare(self.queue, durable=True)
-
-    def _publish(self, body):
-        self.channel.basic_publish("", self.queue, body)
-        logger.debug(
-            "Published pika events to queue {} at "
-            "{}:\n{}".format(self.queue, self.host, body)
-        )
-
-    def _close(self):
-        self.connection.close()
-
-
-class FileProducer(EventChannel):
+        self._connection = pika.BlockingConnection(parameters)
+        self._channel = self._connection.channel()
+        self._channel.queue_declare(self.queue, durable=True)
+        if self.confirm_delivery:
+            self._channel.confirm_delivery()
+        self._count("connections")
+
+    def _on_idle(self) -> None:
+        """Answers heartbeats of the broker while no events are published."""
+
+        if self._connection is None:
+            return
+        try:
+            self._connection.process_data_events(time_limit=0)
+        except Exception as e:
+            logger.debug("Lost connection to {}: {}".format(self.host, e))
+            self._close()
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            try:
+                if not self._connection.is_closed:
+                    self._connection.close()
+            except Exception as e:
+                logger.debug(
+                    "Failed to close connection to {}: {}".format(self.host, e)
+                )
+        self._connection = None
+        self._channel = None
+
+
+class FileProducer(BatchingEventChannel):
     """Log events to a file in json format.
 
-    There will be one event per line and each event is stored as json."""
+    There will be one event per line and each event is stored as json. Each
+    batch of events is written at once. If `compression` is `gzip`, every
+    batch is appended as gzip member, the file can be read with `gzip.open`."""
 
     DEFAULT_LOG_FILE_NAME = "rasa_event.log"
 
-    def __init__(self, path: Optional[Text] = None) -> None:
+    def __init__(
+        self,
+        path: Optional[Text] = None,
+        compression: Optional[Text] = None,
+        **kwargs: Any
+    ) -> None:
+        super(FileProducer, self).__init__(**kwargs)
+
+        if compression not in [None, "gzip"]:
+            raise ValueError(
+                "Unsupported compression '{}' for the file event broker, "
+                "use 'gzip' or none.".format(compression)
+            )
+
         self.path = path or self.DEFAULT_LOG_FILE_NAME
-        self.event_logger = self._event_logger()
+        self.compression = compression
+        self._file = None
+
+        logger.info("Logging events to '{}'.".format(self.path))
+
+    def __str__(self) -> Text:
+        return "file ({})".format(self.path)
 
     @classmethod
     def from_endpoint_config(
@@ -125,30 +431,32 @@ class FileProducer(EventChannel):
         # noinspection PyArgumentList
         return cls(**broker_config.kwargs)
 
-    def _event_logger(self):
-        """Instantiate the file logger."""
+    def _publish_batch(self, batch: List[Text]) -> int:
+        """Write the events to the file."""
 
-        logger_file = self.path
-        # noinspection PyTypeChecker
-        query_logger = logging.getLogger("event-logger")
-        query_logger.setLevel(logging.INFO)
-        handler = logging.FileHandler(logger_file)
-        handler.setFormatter(logging.Formatter("%(message)s"))
-        query_logger.propagate = False
-        query_logger.addHandler(handler)
+        data = "".join(body + "\n" for body in batch).encode("utf-8")
+        if self.compression == "gzip":
+            data = gzip.compress(data)
 
-        logger.info("Logging events to '{}'.".format(logger_file))
+        if self._file is None:
+            self._file = open(self.path, "ab")
+        self._file.write(data)
+        self._file.flush()
+        return len(batch)
 
-        return query_logger
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
 
-    def publish(self, event: Dict) -> None:
-        """Write event to file."""
 
-        self.event_logger.info(json.dumps(event))
-        self.event_logger.handlers[0].flush()
+class KafkaProducer(BatchingEventChannel):
+    """Publishes events to a Kafka topic.
 
+    One Kafka producer is used for all events. It sends the events of a
+    batch together, compressed with `compression_type` (e.g. `gzip`), and
+    the batch is complete once Kafka acknowledged all of its events."""
 
-class KafkaProducer(EventChannel):
     def __init__(
         self,
         host,
@@ -161,7 +469,10 @@ class KafkaProducer(EventChannel):
         topic="rasa_core_events",
         security_protocol="SASL_PLAINTEXT",
         loglevel=logging.ERROR,
+        compression_type=None,
+        **kwargs: Any
     ):
+        super(KafkaProducer, self).__init__(**kwargs)
 
         self.host = host
         self.topic = topic
@@ -172,9 +483,15 @@ class KafkaProducer(EventChannel):
         self.ssl_certfile = ssl_certfile
         self.ssl_keyfile = ssl_keyfile
         self.ssl_check_hostname = ssl_check_hostname
+        self.compression_type = compression_type
+
+        self.producer = None
 
         logging.getLogger("kafka").setLevel(loglevel)
 
+    def __str__(self) -> Text:
+        return "kafka ({} at {})".format(self.topic, self.host)
+
     @classmethod
     def from_endpoint_config(cls, broker_config) -> Optional["KafkaProducer"]:
         if broker_config is None:
@@ -182,36 +499,56 @@ class KafkaProducer(EventChannel):
 
         return cls(broker_config.url, **broker_config.kwargs)
 
-    def publish(self, event):
-        self._create_producer()
-        self._publish(event)
-        self._close()
-
     def _create_producer(self):
         import kafka
 
+        # the events of a batch are sent together
+        batching = {
+            "batch_size": self.max_batch_bytes,
+            "compression_type": self.compression_type,
+        }
+
         if self.security_protocol == "SASL_PLAINTEXT":
             self.producer = kafka.KafkaProducer(
                 bootstrap_servers=[self.host],
-                value_serializer=lambda v: json.dumps(v).encode("utf-8"),
                 sasl_plain_username=self.sasl_username,
                 sasl_plain_password=self.sasl_password,
                 sasl_mechanism="PLAIN",
                 security_protocol=self.security_protocol,
+                **batching
             )
         elif self.security_protocol == "SSL":
             self.producer = kafka.KafkaProducer(
                 bootstrap_servers=[self.host],
-                value_serializer=lambda v: json.dumps(v).encode("utf-8"),
                 ssl_cafile=self.ssl_cafile,
                 ssl_certfile=self.ssl_certfile,
                 ssl_keyfile=self.ssl_keyfile,
                 ssl_check_hostname=False,
                 security_protocol=self.security_protocol,
+                **batching
             )
 
-    def _publish(self, event):
-        self.producer.send(self.topic, event)
+    def _publish_batch(self, batch: List[Text]) -> int:
+        if self.producer is None:
+            self._create_producer()
+
+        futures = [
+            self.producer.send(self.topic, body.encode("utf-8")) for body in batch
+        ]
+        self.producer.flush()
+
+        published = 0
+        for future in futures:
+            if future.succeeded():
+                published += 1
+            else:
+                logger.error(
+                    "Failed to publish event to topic {} at {}: {}"
+                    "".format(self.topic, self.host, future.exception)
+                )
+        return published
 
     def _close(self):
-        self.producer.close()
+        if self.producer is not None:
+            self.producer.close()
+            self.producer = None
@@ -1,6 +1,9 @@
 import logging
+import os
 
-import pkg_resources
+DEFAULT_CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "default_config.yml"
+)
 
 
 def add_config_arg(parser, nargs="*", **kwargs):
@@ -11,7 +14,7 @@ def add_config_arg(parser, nargs="*", **kwargs):
         "--config",
         type=str,
         nargs=nargs,
-        default=[pkg_resources.resource_filename(__name__, "../default_config.yml")],
+        default=[DEFAULT_CONFIG_PATH],
         help="Policy specification yaml file.",
         **kwargs
     )
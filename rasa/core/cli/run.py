@@ -27,6 +27,19 @@ def add_run_arguments(parser):
         action="store_true",
         help="Start the web server api in addition to the input channel",
     )
+    server_arguments.add_argument(
+        "--loading-threads",
+        default=constants.DEFAULT_LOADING_THREADS,
+        type=int,
+        help="Number of threads used to load the NLU components and the "
+        "Core policies of the model",
+    )
+    server_arguments.add_argument(
+        "--lazy-policies",
+        action="store_true",
+        help="Load the Core policies in the background and only wait for "
+        "them when the first message is handled",
+    )
 
     parser.add_argument(
         "-o",
@@ -38,5 +38,11 @@ def add_evaluation_arguments(parser):
         "is thrown. This can be used to validate stories during "
         "tests, e.g. on travis.",
     )
+    parser.add_argument(
+        "--worker-processes",
+        type=int,
+        default=1,
+        help="Number of processes which evaluate the stories in parallel",
+    )
 
     arguments.add_core_model_arg(parser)
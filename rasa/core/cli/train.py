@@ -1,3 +1,4 @@
+from rasa.constants import DEFAULT_CACHE_PATH
 from rasa.core.cli import arguments
 
 
@@ -84,6 +85,23 @@ def add_general_args(parser):
         "and their connections between story blocks in a  "
         "file called `story_blocks_connections.html`.",
     )
+    parser.add_argument(
+        "--worker-processes",
+        type=int,
+        default=1,
+        help="Number of processes used to generate the training data of "
+        "story parts which do not share any checkpoints. If policies are "
+        "compared, the number of models which are trained in parallel.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        nargs="?",
+        const=DEFAULT_CACHE_PATH,
+        help="Cache the generated training data in this directory (default: "
+        "{}), so it can be reused if only the policy configuration changes. "
+        "The cache is not cleaned up automatically.".format(DEFAULT_CACHE_PATH),
+    )
 
     arguments.add_logging_option_arguments(parser)
 
@@ -13,6 +13,13 @@ def add_visualization_arguments(parser):
         type=int,
         help="max history to consider when merging paths in the output graph",
     )
+    parser.add_argument(
+        "--max-nodes",
+        default=None,
+        type=int,
+        help="maximum number of nodes of the graph, stories which don't fit "
+        "into it are not visualized",
+    )
     parser.add_argument(
         "-nlu",
         "--nlu-data",
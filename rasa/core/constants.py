@@ -4,6 +4,8 @@ DEFAULT_SERVER_FORMAT = "http://localhost:{}"
 
 DEFAULT_SERVER_URL = DEFAULT_SERVER_FORMAT.format(DEFAULT_SERVER_PORT)
 
+DEFAULT_LOADING_THREADS = 4
+
 DOCS_BASE_URL = "https://rasa.com/docs/core"
 
 DEFAULT_NLU_FALLBACK_THRESHOLD = 0.0
@@ -5,7 +5,6 @@ import os
 import typing
 from typing import Any, Dict, List, Optional, Text, Tuple
 
-import pkg_resources
 from pykwalify.errors import SchemaError
 
 import rasa.utils.io
@@ -209,6 +208,7 @@ class Domain(object):
     @classmethod
     def validate_domain_yaml(cls, yaml):
         """Validate domain yaml."""
+        import pkg_resources
         from pykwalify.core import Core
 
         log = logging.getLogger("pykwalify")
@@ -273,12 +273,16 @@ class TrackerFeaturizer(object):
         tracker: DialogueStateTracker,
         domain: Domain,
         is_binary_training: bool = False,
+        max_states: Optional[int] = None,
     ) -> List[Dict[Text, float]]:
         """Create states: a list of dictionaries.
             If use_intent_probabilities is False (default behaviour),
             pick the most probable intent out of all provided ones and
-            set its probability to 1.0, while all the others to 0.0."""
+            set its probability to 1.0, while all the others to 0.0.
+            If max_states is given, only the latest states are created."""
         states = tracker.past_states(domain)
+        if max_states is not None and len(states) > max_states:
+            states = list(states)[-max_states:]
 
         # during training we encounter only 1 or 0
         if not self.use_intent_probabilities and not is_binary_training:
@@ -313,56 +317,131 @@ class TrackerFeaturizer(object):
     def _pad_states(self, states: List[Any]) -> List[Any]:
         return states
 
-    def _featurize_states(
-        self, trackers_as_states: List[List[Dict[Text, float]]]
-    ) -> Tuple[np.ndarray, List[int]]:
-        """Create X"""
-        features = []
-        true_lengths = []
+    @staticmethod
+    def _allocate(
+        shape: Tuple[int, ...], dtype: Any, out_file: Optional[Text] = None
+    ) -> np.ndarray:
+        """Create an uninitialized array, which is a memory map of the
+        `.npy` file `out_file` if one is given."""
 
-        for tracker_states in trackers_as_states:
-            dialogue_len = len(tracker_states)
+        if out_file is None:
+            return np.empty(shape, dtype)
+        return np.lib.format.open_memmap(out_file, mode="w+", dtype=dtype, shape=shape)
 
-            # len(trackers_as_states) = 1 means
-            # it is called during prediction or we have
-            # only one story, so no padding is needed
+    @staticmethod
+    def _upcast_to_float(
+        X: np.ndarray, num_filled: int, out_file: Optional[Text] = None
+    ) -> np.ndarray:
+        """Convert an integer array to floats, keeping its first
+        `num_filled` rows."""
 
-            if len(trackers_as_states) > 1:
-                tracker_states = self._pad_states(tracker_states)
+        if out_file is None:
+            return X.astype(np.float64)
 
-            story_features = [
-                self.state_featurizer.encode(state) for state in tracker_states
-            ]
+        X_float = np.lib.format.open_memmap(
+            out_file + ".tmp", mode="w+", dtype=np.float64, shape=X.shape
+        )
+        X_float[:num_filled] = X[:num_filled]
+        X_float.flush()
+        del X_float
+        os.replace(out_file + ".tmp", out_file)
+        return np.lib.format.open_memmap(out_file, mode="r+")
+
+    @staticmethod
+    def _only_int_features(trackers_as_states: List[List[Dict[Text, float]]]) -> bool:
+        for tracker_states in trackers_as_states:
+            for state in tracker_states:
+                if state and not all(utils.is_int(p) for p in state.values()):
+                    return False
+        return True
 
-            features.append(story_features)
-            true_lengths.append(dialogue_len)
+    def _featurize_states(
+        self,
+        trackers_as_states: List[List[Dict[Text, float]]],
+        out_file: Optional[Text] = None,
+    ) -> Tuple[np.ndarray, List[int]]:
+        """Create X
+
+        The encoded states are written into a preallocated array instead
+        of collecting them in nested lists first. If `out_file` is given,
+        the array is a memory map of this `.npy` file."""
+
+        true_lengths = [len(tracker_states) for tracker_states in trackers_as_states]
+
+        # len(trackers_as_states) = 1 means
+        # it is called during prediction or we have
+        # only one story, so no padding is needed
+        if len(trackers_as_states) > 1:
+            trackers_as_states = [self._pad_states(s) for s in trackers_as_states]
+
+        lengths = {len(tracker_states) for tracker_states in trackers_as_states}
+        if len(lengths) != 1 or 0 in lengths:
+            # there is nothing to preallocate, e.g. because there are no states
+            # noinspection PyPep8Naming
+            X = np.array(
+                [
+                    [self.state_featurizer.encode(state) for state in tracker_states]
+                    for tracker_states in trackers_as_states
+                ]
+            )
+            return X, true_lengths
+
+        # the encoded states are integers unless a state has a probability
+        num_features = len(self.state_featurizer.encode(trackers_as_states[0][0]))
+        if self._only_int_features(trackers_as_states):
+            dtype = np.int32
+        else:
+            dtype = np.float64
+        shape = (len(trackers_as_states), lengths.pop(), num_features)
 
         # noinspection PyPep8Naming
-        X = np.array(features)
+        X = self._allocate(shape, dtype, out_file)
+        for i, tracker_states in enumerate(trackers_as_states):
+            story_features = np.array(
+                [self.state_featurizer.encode(state) for state in tracker_states]
+            )
+            if story_features.dtype.kind == "f" and X.dtype.kind != "f":
+                X = self._upcast_to_float(X, i, out_file)
+            X[i] = story_features
 
         return X, true_lengths
 
     def _featurize_labels(
-        self, trackers_as_actions: List[List[Text]], domain: Domain
+        self,
+        trackers_as_actions: List[List[Text]],
+        domain: Domain,
+        out_file: Optional[Text] = None,
     ) -> np.ndarray:
-        """Create y"""
-
-        labels = []
-        for tracker_actions in trackers_as_actions:
-
-            if len(trackers_as_actions) > 1:
-                tracker_actions = self._pad_states(tracker_actions)
+        """Create y
+
+        If `out_file` is given, the array is a memory map of this
+        `.npy` file."""
+
+        if len(trackers_as_actions) > 1:
+            trackers_as_actions = [self._pad_states(a) for a in trackers_as_actions]
+
+        lengths = {len(tracker_actions) for tracker_actions in trackers_as_actions}
+        if len(lengths) != 1:
+            # there is nothing to preallocate, e.g. because there are no actions
+            labels = [
+                [
+                    self.state_featurizer.action_as_one_hot(action, domain)
+                    for action in tracker_actions
+                ]
+                for tracker_actions in trackers_as_actions
+            ]
+            return np.array(labels).squeeze()
 
-            story_labels = [
+        shape = (len(trackers_as_actions), lengths.pop(), domain.num_actions)
+        # if it is MaxHistoryFeaturizer, squeeze out time axis
+        y = self._allocate(tuple(d for d in shape if d != 1), np.int_, out_file)
+        unsqueezed_y = y.reshape(shape)
+        for i, tracker_actions in enumerate(trackers_as_actions):
+            unsqueezed_y[i] = [
                 self.state_featurizer.action_as_one_hot(action, domain)
                 for action in tracker_actions
             ]
 
-            labels.append(story_labels)
-
-        # if it is MaxHistoryFeaturizer, squeeze out time axis
-        y = np.array(labels).squeeze()
-
         return y
 
     def training_states_and_actions(
@@ -374,9 +453,16 @@ class TrackerFeaturizer(object):
         )
 
     def featurize_trackers(
-        self, trackers: List[DialogueStateTracker], domain: Domain
+        self,
+        trackers: List[DialogueStateTracker],
+        domain: Domain,
+        out_dir: Optional[Text] = None,
     ) -> DialogueTrainingData:
-        """Create training data"""
+        """Create training data
+
+        If `out_dir` is given, the featurized data is written to the
+        files `X.npy` and `y.npy` in this directory and returned as
+        memory maps of them, instead of being held in memory."""
         self.state_featurizer.prepare_from_domain(domain)
 
         (trackers_as_states, trackers_as_actions) = self.training_states_and_actions(
@@ -384,8 +470,14 @@ class TrackerFeaturizer(object):
         )
 
         # noinspection PyPep8Naming
-        X, true_lengths = self._featurize_states(trackers_as_states)
-        y = self._featurize_labels(trackers_as_actions, domain)
+        X, true_lengths = self._featurize_states(
+            trackers_as_states, out_dir and os.path.join(out_dir, "X.npy")
+        )
+        # the states are not needed anymore, free them before creating `y`
+        del trackers_as_states
+        y = self._featurize_labels(
+            trackers_as_actions, domain, out_dir and os.path.join(out_dir, "y.npy")
+        )
 
         return DialogueTrainingData(X, y, true_lengths)
 
@@ -403,10 +495,20 @@ class TrackerFeaturizer(object):
     ) -> np.ndarray:
         """Create X for prediction"""
 
-        trackers_as_states = self.prediction_states(trackers, domain)
-        X, _ = self._featurize_states(trackers_as_states)
+        X, _ = self.create_X_with_lengths(trackers, domain)
         return X
 
+    # noinspection PyPep8Naming
+    def create_X_with_lengths(
+        self, trackers: List[DialogueStateTracker], domain: Domain
+    ) -> Tuple[np.ndarray, List[int]]:
+        """Create X for prediction and the number of states of each tracker.
+
+        The states of shorter trackers are padded to the longest tracker."""
+
+        trackers_as_states = self.prediction_states(trackers, domain)
+        return self._featurize_states(trackers_as_states)
+
     def persist(self, path):
         featurizer_file = os.path.join(path, "featurizer.json")
         utils.create_dir_for_file(featurizer_file)
@@ -630,7 +732,8 @@ class MaxHistoryTrackerFeaturizer(TrackerFeaturizer):
     ) -> List[List[Dict[Text, float]]]:
 
         trackers_as_states = [
-            self._create_states(tracker, domain) for tracker in trackers
+            self._create_states(tracker, domain, max_states=self.max_history)
+            for tracker in trackers
         ]
         trackers_as_states = [
             self.slice_state_history(states, self.max_history)
@@ -1,5 +1,7 @@
 import aiohttp
 
+import asyncio
+import functools
 import json
 import logging
 import re
@@ -13,6 +15,9 @@ from rasa.utils.endpoints import EndpointConfig
 
 logger = logging.getLogger(__name__)
 
+# maximum number of messages which are parsed concurrently by `parse_batch`
+PARSE_BATCH_SIZE = 64
+
 
 class NaturalLanguageInterpreter(object):
     async def parse(self, text, message_id=None):
@@ -20,8 +25,21 @@ class NaturalLanguageInterpreter(object):
             "Interpreter needs to be able to parse messages into structured output."
         )
 
+    async def parse_batch(self, texts: List[Text]) -> List[Dict[Text, Any]]:
+        """Parse multiple text messages.
+
+        By default the messages are parsed concurrently in chunks of
+        `PARSE_BATCH_SIZE` messages. Interpreters which can parse several
+        messages at once more efficiently should override this."""
+
+        results = []
+        for i in range(0, len(texts), PARSE_BATCH_SIZE):
+            chunk = texts[i : i + PARSE_BATCH_SIZE]
+            results.extend(await asyncio.gather(*[self.parse(t) for t in chunk]))
+        return results
+
     @staticmethod
-    def create(obj, endpoint=None):
+    def create(obj, endpoint=None, num_threads=1):
         if isinstance(obj, NaturalLanguageInterpreter):
             return obj
 
@@ -42,7 +60,7 @@ class NaturalLanguageInterpreter(object):
             return RegexInterpreter()  # default interpreter
 
         if not endpoint:
-            return RasaNLUInterpreter(model_directory=obj)
+            return RasaNLUInterpreter(model_directory=obj, num_threads=num_threads)
 
         name_parts = os.path.split(obj)
 
@@ -153,10 +171,21 @@ class RegexInterpreter(NaturalLanguageInterpreter):
             )
             return None, 0.0, []
 
+    @staticmethod
+    @functools.lru_cache(maxsize=10000)
+    def _cached_intent_and_entities(user_input: Text) -> object:
+        """Memoized `extract_intent_and_entities`, e.g. stories contain the
+        same intents over and over again."""
+
+        intent, confidence, entities = RegexInterpreter.extract_intent_and_entities(
+            user_input
+        )
+        return intent, confidence, tuple(entities)
+
     async def parse(self, text, message_id=None):
         """Parse a text message."""
 
-        intent, confidence, entities = self.extract_intent_and_entities(text)
+        intent, confidence, entities = self._cached_intent_and_entities(text)
 
         if self._starts_with_intent_prefix(text):
             message_text = text
@@ -167,7 +196,8 @@ class RegexInterpreter(NaturalLanguageInterpreter):
             "text": message_text,
             "intent": {"name": intent, "confidence": confidence},
             "intent_ranking": [{"name": intent, "confidence": confidence}],
-            "entities": entities,
+            # the cached entities must not be modified by the caller
+            "entities": [dict(e) for e in entities],
         }
 
 
@@ -237,10 +267,13 @@ class RasaNLUHttpInterpreter(NaturalLanguageInterpreter):
 
 
 class RasaNLUInterpreter(NaturalLanguageInterpreter):
-    def __init__(self, model_directory, config_file=None, lazy_init=False):
+    def __init__(
+        self, model_directory, config_file=None, lazy_init=False, num_threads=1
+    ):
         self.model_directory = model_directory
         self.lazy_init = lazy_init
         self.config_file = config_file
+        self.num_threads = num_threads
 
         if not lazy_init:
             self._load_interpreter()
@@ -252,6 +285,17 @@ class RasaNLUInterpreter(NaturalLanguageInterpreter):
 
         Return a default value if the parsing of the text failed."""
 
+        return self._parse(text)
+
+    async def parse_batch(self, texts: List[Text]) -> List[Dict[Text, Any]]:
+        """Parse multiple text messages.
+
+        The messages are processed by the pipeline one after another
+        without returning to the event loop in between."""
+
+        return [self._parse(t) for t in texts]
+
+    def _parse(self, text):
         if self.lazy_init and self.interpreter is None:
             self._load_interpreter()
         result = self.interpreter.parse(text)
@@ -265,4 +309,6 @@ class RasaNLUInterpreter(NaturalLanguageInterpreter):
     def _load_interpreter(self):
         from rasa.nlu.model import Interpreter
 
-        self.interpreter = Interpreter.load(self.model_directory)
+        self.interpreter = Interpreter.load(
+            self.model_directory, num_threads=self.num_threads
+        )
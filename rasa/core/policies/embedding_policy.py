@@ -1,4 +1,4 @@
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
 import copy
 import json
 import logging
@@ -11,6 +11,7 @@ from tqdm import tqdm
 from typing import Any, List, Optional, Text, Dict, Tuple, Union
 
 import rasa.utils.io
+from rasa.utils import tf_graph
 from rasa.core import utils
 from rasa.core.actions.action import ACTION_LISTEN_NAME
 from rasa.core.domain import Domain
@@ -38,6 +39,30 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+FROZEN_GRAPH_FILE_NAME = "tensorflow_embedding.frozen.pb"
+
+# names of the tensors persisted with the model
+PERSISTED_TENSOR_NAMES = [
+    "intent_placeholder",
+    "action_placeholder",
+    "slots_placeholder",
+    "prev_act_placeholder",
+    "dialogue_len",
+    "x_for_no_intent",
+    "y_for_no_action",
+    "y_for_action_listen",
+    "similarity_op",
+    "alignment_history",
+    "user_embed",
+    "bot_embed",
+    "slot_embed",
+    "dial_embed",
+    "rnn_embed",
+    "attn_embed",
+    "copy_attn_debug",
+    "all_time_masks",
+]
+
 # namedtuple for all tf session related data
 SessionData = namedtuple(
     "SessionData",
@@ -80,6 +105,9 @@ class EmbeddingPolicy(Policy):
         # initial and final batch sizes - batch size will be
         # linearly increased for each epoch
         "batch_size": [8, 32],
+        # flag if to put dialogues of similar length into the same batch,
+        # so that less padding has to be fed through the rnn
+        "bucket_by_dialogue_length": False,
         # number of epochs
         "epochs": 1,
         # set random seed to any int to get reproducible results
@@ -246,6 +274,7 @@ class EmbeddingPolicy(Policy):
         self.layer_norm = config["layer_norm"]
 
         self.batch_size = config["batch_size"]
+        self.bucket_by_dialogue_length = config["bucket_by_dialogue_length"]
 
         self.epochs = config["epochs"]
 
@@ -1081,7 +1110,7 @@ class EmbeddingPolicy(Policy):
             # train tensorflow graph
             self.session = tf.Session(config=self._tf_config)
 
-            self._train_tf(session_data, loss, mask)
+            self._train_tf(session_data, loss, mask, training_data.true_length)
 
     # training helpers
     def _linearly_increasing_batch_size(self, epoch: int) -> int:
@@ -1154,18 +1183,44 @@ class EmbeddingPolicy(Policy):
             )
             full_X = full_X.reshape((-1, full_X.shape[-1]))
 
-            _, i, c = np.unique(full_X, return_inverse=True, return_counts=True, axis=0)
+            unique, i, c = np.unique(
+                full_X, return_inverse=True, return_counts=True, axis=0
+            )
 
             counts = c[i].reshape((X.shape[0], X.shape[1]))
 
             # do not include [-1 -1 ... -1 0] in averaging
+            # (a batch without padding doesn't contain it)
             # and smooth it by taking sqrt
-            return np.maximum(np.sqrt(np.mean(c[1:]) / counts), 1)
+            is_padding = unique[:, 0] == -1
+            return np.maximum(np.sqrt(np.mean(c[~is_padding]) / counts), 1)
         else:
             return [[None]]
 
+    def _create_batch_ids(
+        self, batch_size: int, true_length: List[int]
+    ) -> List[np.ndarray]:
+        """Split the randomly permuted example ids into batches.
+
+        If `bucket_by_dialogue_length` is set, the batches consist of
+        dialogues with similar lengths and are shuffled afterwards."""
+
+        ids = np.random.permutation(len(true_length))
+        if self.bucket_by_dialogue_length:
+            # a stable sort keeps the random order of dialogues of equal length
+            ids = ids[np.argsort(np.asarray(true_length)[ids], kind="mergesort")]
+
+        batches = [ids[i : i + batch_size] for i in range(0, len(ids), batch_size)]
+        if self.bucket_by_dialogue_length:
+            np.random.shuffle(batches)
+        return batches
+
     def _train_tf(
-        self, session_data: SessionData, loss: tf.Tensor, mask: tf.Tensor
+        self,
+        session_data: SessionData,
+        loss: tf.Tensor,
+        mask: tf.Tensor,
+        true_length: List[int],
     ) -> None:
         """Train tf graph."""
 
@@ -1180,33 +1235,31 @@ class EmbeddingPolicy(Policy):
         train_acc = 0
         last_loss = 0
         for ep in pbar:
-            # randomize training data for the current epoch
-            ids = np.random.permutation(session_data.X.shape[0])
-
             # calculate batch size for the current epoch
             batch_size = self._linearly_increasing_batch_size(ep)
-            # calculate number of batches in the current epoch
-            batches_per_epoch = session_data.X.shape[0] // batch_size + int(
-                session_data.X.shape[0] % batch_size > 0
-            )
+            # randomize training data for the current epoch
+            all_batch_ids = self._create_batch_ids(batch_size, true_length)
+            batches_per_epoch = len(all_batch_ids)
 
             # collect average loss over the batches
             ep_loss = 0
-            for i in range(batches_per_epoch):
-                start_idx = i * batch_size
-                end_idx = (i + 1) * batch_size
-                batch_ids = ids[start_idx:end_idx]
+            for batch_ids in all_batch_ids:
+                if self.bucket_by_dialogue_length:
+                    # cut off the padding all dialogues of the batch share
+                    batch_len = max(1, max(true_length[i] for i in batch_ids))
+                else:
+                    batch_len = session_data.X.shape[1]
 
                 # get randomized data for current batch
-                batch_a = session_data.X[batch_ids]
-                batch_pos_b = session_data.Y[batch_ids]
-                actions_for_b = session_data.actions_for_Y[batch_ids]
+                batch_a = session_data.X[batch_ids, :batch_len]
+                batch_pos_b = session_data.Y[batch_ids, :batch_len]
+                actions_for_b = session_data.actions_for_Y[batch_ids, :batch_len]
 
                 # add negatives - incorrect bot actions predictions
                 batch_b = self._create_batch_b(batch_pos_b, actions_for_b)
 
-                batch_c = session_data.slots[batch_ids]
-                batch_b_prev = session_data.previous_actions[batch_ids]
+                batch_c = session_data.slots[batch_ids, :batch_len]
+                batch_b_prev = session_data.previous_actions[batch_ids, :batch_len]
 
                 # calculate how much the loss from each action
                 # should be scaled based on action rarity
@@ -1222,7 +1275,7 @@ class EmbeddingPolicy(Policy):
                         self.b_in: batch_b,
                         self.c_in: batch_c,
                         self.b_prev_in: batch_b_prev,
-                        self._dialogue_len: session_data.X.shape[1],
+                        self._dialogue_len: batch_len,
                         self._x_for_no_intent_in: session_data.x_for_no_intent,
                         self._y_for_no_action_in: session_data.y_for_no_action,
                         self._y_for_action_listen_in: session_data.y_for_action_listen,
@@ -1297,10 +1350,11 @@ class EmbeddingPolicy(Policy):
 
         batch_size = kwargs.get("batch_size", 5)
         epochs = kwargs.get("epochs", 50)
+        num_new_trackers = kwargs.get("num_new_trackers", 1)
 
         for _ in range(epochs):
             training_data = self._training_data_for_continue_training(
-                batch_size, training_trackers, domain
+                batch_size, training_trackers, domain, num_new_trackers
             )
 
             session_data = self._create_tf_session_data(
@@ -1341,16 +1395,27 @@ class EmbeddingPolicy(Policy):
         Return the list of probabilities for the next actions.
         """
 
+        return self.predict_action_probabilities_batch([tracker], domain)[0]
+
+    def predict_action_probabilities_batch(
+        self, trackers: List[DialogueStateTracker], domain: Domain
+    ) -> List[List[float]]:
+        """Predict the next action for each of the trackers in one run
+        of the graph.
+
+        Shorter dialogues are padded at the end, which does not change
+        the similarities of their own time steps."""
+
         if self.session is None:
             logger.error(
                 "There is no trained tf.session: "
                 "component is either not trained or "
                 "didn't receive enough training data"
             )
-            return [0.0] * domain.num_actions
+            return [[0.0] * domain.num_actions for _ in trackers]
 
         # noinspection PyPep8Naming
-        data_X = self.featurizer.create_X([tracker], domain)
+        data_X, true_lengths = self.featurizer.create_X_with_lengths(trackers, domain)
         session_data = self._create_tf_session_data(domain, data_X)
         # noinspection PyPep8Naming
         all_Y_d_x = np.stack(
@@ -1371,16 +1436,44 @@ class EmbeddingPolicy(Policy):
             },
         )
 
-        result = _sim[0, -1, :]
-        if self.similarity_type == "cosine":
-            # clip negative values to zero
-            result[result < 0] = 0
-        elif self.similarity_type == "inner":
-            # normalize result to [0, 1] with softmax
-            result = np.exp(result)
-            result /= np.sum(result)
-
-        return result.tolist()
+        results = []
+        for i, length in enumerate(true_lengths):
+            result = _sim[i, length - 1, :]
+            if self.similarity_type == "cosine":
+                # clip negative values to zero
+                result[result < 0] = 0
+            elif self.similarity_type == "inner":
+                # normalize result to [0, 1] with softmax
+                result = np.exp(result)
+                result /= np.sum(result)
+            results.append(result.tolist())
+
+        return results
+
+    def _tensors_to_persist(self) -> Dict[Text, Optional[tf.Tensor]]:
+        """Tensors needed for prediction, stored by their collection name."""
+
+        tensors = [
+            self.a_in,
+            self.b_in,
+            self.c_in,
+            self.b_prev_in,
+            self._dialogue_len,
+            self._x_for_no_intent_in,
+            self._y_for_no_action_in,
+            self._y_for_action_listen_in,
+            self.sim_op,
+            self.alignment_history,
+            self.user_embed,
+            self.bot_embed,
+            self.slot_embed,
+            self.dial_embed,
+            self.rnn_embed,
+            self.attn_embed,
+            self.copy_attn_debug,
+            self.all_time_masks,
+        ]
+        return OrderedDict(zip(PERSISTED_TENSOR_NAMES, tensors))
 
     def _persist_tensor(self, name: Text, tensor: tf.Tensor) -> None:
         if tensor is not None:
@@ -1409,34 +1502,23 @@ class EmbeddingPolicy(Policy):
         checkpoint = os.path.join(path, file_name)
         utils.create_dir_for_file(checkpoint)
 
-        with self.graph.as_default():
-            self._persist_tensor("intent_placeholder", self.a_in)
-            self._persist_tensor("action_placeholder", self.b_in)
-            self._persist_tensor("slots_placeholder", self.c_in)
-            self._persist_tensor("prev_act_placeholder", self.b_prev_in)
-            self._persist_tensor("dialogue_len", self._dialogue_len)
-            self._persist_tensor("x_for_no_intent", self._x_for_no_intent_in)
-            self._persist_tensor("y_for_no_action", self._y_for_no_action_in)
-            self._persist_tensor("y_for_action_listen", self._y_for_action_listen_in)
-
-            self._persist_tensor("similarity_op", self.sim_op)
-
-            self._persist_tensor("alignment_history", self.alignment_history)
-
-            self._persist_tensor("user_embed", self.user_embed)
-            self._persist_tensor("bot_embed", self.bot_embed)
-            self._persist_tensor("slot_embed", self.slot_embed)
-            self._persist_tensor("dial_embed", self.dial_embed)
-
-            self._persist_tensor("rnn_embed", self.rnn_embed)
-            self._persist_tensor("attn_embed", self.attn_embed)
-            self._persist_tensor("copy_attn_debug", self.copy_attn_debug)
+        tensors = self._tensors_to_persist()
 
-            self._persist_tensor("all_time_masks", self.all_time_masks)
+        with self.graph.as_default():
+            for name, tensor in tensors.items():
+                self._persist_tensor(name, tensor)
 
             saver = tf.train.Saver()
             saver.save(self.session, checkpoint)
 
+        # inference only graph, which is faster to load and run
+        tf_graph.persist_frozen_graph(
+            self.session,
+            self.graph,
+            tensors,
+            os.path.join(path, FROZEN_GRAPH_FILE_NAME),
+        )
+
         encoded_actions_file = os.path.join(
             path, file_name + ".encoded_all_actions.pkl"
         )
@@ -1480,36 +1562,23 @@ class EmbeddingPolicy(Policy):
         with open(tf_config_file, "rb") as f:
             _tf_config = pickle.load(f)
 
-        graph = tf.Graph()
-        with graph.as_default():
-            sess = tf.Session(config=_tf_config)
-            saver = tf.train.import_meta_graph(checkpoint + ".meta")
-
-            saver.restore(sess, checkpoint)
-
-            a_in = cls.load_tensor("intent_placeholder")
-            b_in = cls.load_tensor("action_placeholder")
-            c_in = cls.load_tensor("slots_placeholder")
-            b_prev_in = cls.load_tensor("prev_act_placeholder")
-            dialogue_len = cls.load_tensor("dialogue_len")
-            x_for_no_intent = cls.load_tensor("x_for_no_intent")
-            y_for_no_action = cls.load_tensor("y_for_no_action")
-            y_for_action_listen = cls.load_tensor("y_for_action_listen")
-
-            sim_op = cls.load_tensor("similarity_op")
-
-            alignment_history = cls.load_tensor("alignment_history")
-
-            user_embed = cls.load_tensor("user_embed")
-            bot_embed = cls.load_tensor("bot_embed")
-            slot_embed = cls.load_tensor("slot_embed")
-            dial_embed = cls.load_tensor("dial_embed")
+        frozen_graph = os.path.join(path, FROZEN_GRAPH_FILE_NAME)
+        if tf_graph.has_frozen_graph(frozen_graph):
+            graph, sess, tensors = tf_graph.load_frozen_graph(
+                frozen_graph, _tf_config
+            )
+        else:
+            # models persisted before frozen graphs were introduced
+            graph = tf.Graph()
+            with graph.as_default():
+                sess = tf.Session(config=tf_graph.session_config(_tf_config))
+                saver = tf.train.import_meta_graph(checkpoint + ".meta")
 
-            rnn_embed = cls.load_tensor("rnn_embed")
-            attn_embed = cls.load_tensor("attn_embed")
-            copy_attn_debug = cls.load_tensor("copy_attn_debug")
+                saver.restore(sess, checkpoint)
 
-            all_time_masks = cls.load_tensor("all_time_masks")
+                tensors = {
+                    name: cls.load_tensor(name) for name in PERSISTED_TENSOR_NAMES
+                }
 
         encoded_actions_file = os.path.join(
             path, "{}.encoded_all_actions.pkl".format(file_name)
@@ -1524,22 +1593,22 @@ class EmbeddingPolicy(Policy):
             encoded_all_actions=encoded_all_actions,
             graph=graph,
             session=sess,
-            intent_placeholder=a_in,
-            action_placeholder=b_in,
-            slots_placeholder=c_in,
-            prev_act_placeholder=b_prev_in,
-            dialogue_len=dialogue_len,
-            x_for_no_intent=x_for_no_intent,
-            y_for_no_action=y_for_no_action,
-            y_for_action_listen=y_for_action_listen,
-            similarity_op=sim_op,
-            alignment_history=alignment_history,
-            user_embed=user_embed,
-            bot_embed=bot_embed,
-            slot_embed=slot_embed,
-            dial_embed=dial_embed,
-            rnn_embed=rnn_embed,
-            attn_embed=attn_embed,
-            copy_attn_debug=copy_attn_debug,
-            all_time_masks=all_time_masks,
+            intent_placeholder=tensors.get("intent_placeholder"),
+            action_placeholder=tensors.get("action_placeholder"),
+            slots_placeholder=tensors.get("slots_placeholder"),
+            prev_act_placeholder=tensors.get("prev_act_placeholder"),
+            dialogue_len=tensors.get("dialogue_len"),
+            x_for_no_intent=tensors.get("x_for_no_intent"),
+            y_for_no_action=tensors.get("y_for_no_action"),
+            y_for_action_listen=tensors.get("y_for_action_listen"),
+            similarity_op=tensors.get("similarity_op"),
+            alignment_history=tensors.get("alignment_history"),
+            user_embed=tensors.get("user_embed"),
+            bot_embed=tensors.get("bot_embed"),
+            slot_embed=tensors.get("slot_embed"),
+            dial_embed=tensors.get("dial_embed"),
+            rnn_embed=tensors.get("rnn_embed"),
+            attn_embed=tensors.get("attn_embed"),
+            copy_attn_debug=tensors.get("copy_attn_debug"),
+            all_time_masks=tensors.get("all_time_masks"),
         )
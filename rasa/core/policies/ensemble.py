@@ -4,8 +4,9 @@ import logging
 import os
 import sys
 from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Text, Optional, Any, List, Dict, Tuple
+from typing import Text, Optional, Any, List, Dict, Tuple, Type
 
 import numpy as np
 
@@ -23,6 +24,7 @@ from rasa.core.policies import Policy
 from rasa.core.policies.fallback import FallbackPolicy
 from rasa.core.policies.memoization import MemoizationPolicy, AugmentedMemoizationPolicy
 from rasa.core.trackers import DialogueStateTracker
+from rasa.core.training.replay import ReplayBuffer
 from rasa.core import registry
 
 logger = logging.getLogger(__name__)
@@ -37,6 +39,7 @@ class PolicyEnsemble(object):
         self.policies = policies
         self.training_trackers = None
         self.date_trained = None
+        self.replay_buffer = ReplayBuffer()
 
         if action_fingerprints:
             self.action_fingerprints = action_fingerprints
@@ -45,6 +48,22 @@ class PolicyEnsemble(object):
 
         self._check_priorities()
 
+    @property
+    def policies(self) -> List[Policy]:
+        loading = self._loading_policies
+        if loading is not None:
+            # the policies are still loaded in the background (see `load`),
+            # wait for them on first use
+            self._policies = [f.result() for f in loading]
+            self._loading_policies = None
+            self._check_priorities()
+        return self._policies
+
+    @policies.setter
+    def policies(self, policies: List[Policy]) -> None:
+        self._policies = policies
+        self._loading_policies = None  # type: Optional[List[Future]]
+
     @staticmethod
     def _training_events_from_trackers(training_trackers):
         events_metadata = defaultdict(set)
@@ -83,21 +102,52 @@ class PolicyEnsemble(object):
         self,
         training_trackers: List[DialogueStateTracker],
         domain: Domain,
+        reused_policies: Optional[Dict[int, Text]] = None,
         **kwargs: Any
     ) -> None:
+        """Train the policies.
+
+        Policies whose index is in `reused_policies` are loaded from the
+        given path of an earlier training instead of being trained."""
+
+        reused_policies = reused_policies or {}
+
         if training_trackers:
-            for policy in self.policies:
-                policy.train(training_trackers, domain, **kwargs)
+            for i, policy in enumerate(self.policies):
+                if i in reused_policies:
+                    self.policies[i] = self._load_reused_policy(
+                        type(policy), reused_policies[i]
+                    )
+                else:
+                    policy.train(training_trackers, domain, **kwargs)
         else:
             logger.info("Skipped training, because there are no training samples.")
         self.training_trackers = training_trackers
+        self.replay_buffer = ReplayBuffer()
+        self.replay_buffer.add(training_trackers)
         self.date_trained = datetime.now().strftime("%Y%m%d-%H%M%S")
 
+    @classmethod
+    def _load_reused_policy(cls, policy_cls: Type[Policy], path: Text) -> Policy:
+        logger.info(
+            "Reusing trained {} from '{}'.".format(policy_cls.__name__, path)
+        )
+        policy = policy_cls.load(path)
+        cls._ensure_loaded_policy(policy, policy_cls, policy_cls.__name__)
+        return policy
+
     def probabilities_using_best_policy(
         self, tracker: DialogueStateTracker, domain: Domain
     ) -> Tuple[List[float], Text]:
         raise NotImplementedError
 
+    def probabilities_using_best_policy_batch(
+        self, trackers: List[DialogueStateTracker], domain: Domain
+    ) -> List[Tuple[List[float], Text]]:
+        """Predicts the next action for each of the trackers."""
+
+        return [self.probabilities_using_best_policy(t, domain) for t in trackers]
+
     def _max_histories(self):
         # type: () -> List[Optional[int]]
         """Return max history."""
@@ -147,9 +197,14 @@ class PolicyEnsemble(object):
 
         policy_names = [utils.module_path_from_instance(p) for p in self.policies]
 
-        training_events = self._training_events_from_trackers(self.training_trackers)
-
-        action_fingerprints = self._create_action_fingerprints(training_events)
+        if self.training_trackers is not None:
+            training_events = self._training_events_from_trackers(
+                self.training_trackers
+            )
+            action_fingerprints = self._create_action_fingerprints(training_events)
+        else:
+            # the ensemble was loaded, its training data is not available
+            action_fingerprints = self.action_fingerprints or None
 
         metadata = {
             "action_fingerprints": action_fingerprints,
@@ -166,13 +221,14 @@ class PolicyEnsemble(object):
 
         # if there are lots of stories, saving flattened stories takes a long
         # time, so this is turned off by default
-        if dump_flattened_stories:
+        if dump_flattened_stories and self.training_trackers is not None:
             training.persist_data(self.training_trackers, training_data_path)
 
     def persist(self, path: Text, dump_flattened_stories: bool = False) -> None:
         """Persists the policy to storage."""
 
         self._persist_metadata(path, dump_flattened_stories)
+        self.replay_buffer.persist(path)
 
         for i, policy in enumerate(self.policies):
             dir_name = "policy_{}_{}".format(i, type(policy).__name__)
@@ -219,22 +275,58 @@ class PolicyEnsemble(object):
             )
 
     @classmethod
-    def load(cls, path: Text) -> "PolicyEnsemble":
-        """Loads policy and domain specification from storage"""
+    def _load_policy(cls, path: Text, index: int, policy_name: Text) -> Policy:
+        policy_cls = registry.policy_from_module_path(policy_name)
+        dir_name = "policy_{}_{}".format(index, policy_cls.__name__)
+        policy_path = os.path.join(path, dir_name)
+        policy = policy_cls.load(policy_path)
+        cls._ensure_loaded_policy(policy, policy_cls, policy_name)
+        return policy
+
+    @classmethod
+    def load(
+        cls, path: Text, num_threads: int = 1, lazy: bool = False
+    ) -> "PolicyEnsemble":
+        """Loads policy and domain specification from storage.
+
+        Args:
+            path: directory of the persisted ensemble
+            num_threads: number of threads used to load the policies
+            lazy: if `True`, return immediately and keep loading the
+                policies in the background. Accessing `policies`, e.g.
+                for the first prediction, waits until they are loaded.
+        """
 
         metadata = cls.load_metadata(path)
         cls.ensure_model_compatibility(metadata)
-        policies = []
-        for i, policy_name in enumerate(metadata["policy_names"]):
-            policy_cls = registry.policy_from_module_path(policy_name)
-            dir_name = "policy_{}_{}".format(i, policy_cls.__name__)
-            policy_path = os.path.join(path, dir_name)
-            policy = policy_cls.load(policy_path)
-            cls._ensure_loaded_policy(policy, policy_cls, policy_name)
-            policies.append(policy)
+        policy_names = metadata["policy_names"]
+
         ensemble_cls = utils.class_from_module_path(metadata["ensemble_name"])
         fingerprints = metadata.get("action_fingerprints", {})
-        ensemble = ensemble_cls(policies, fingerprints)
+
+        if num_threads <= 1 and not lazy:
+            policies = [
+                cls._load_policy(path, i, policy_name)
+                for i, policy_name in enumerate(policy_names)
+            ]
+            ensemble = ensemble_cls(policies, fingerprints)
+            ensemble.replay_buffer = ReplayBuffer.load(path)
+            return ensemble
+
+        executor = ThreadPoolExecutor(max_workers=max(num_threads, 1))
+        futures = [
+            executor.submit(cls._load_policy, path, i, policy_name)
+            for i, policy_name in enumerate(policy_names)
+        ]
+        # without waiting, the submitted loads still finish in the background
+        executor.shutdown(wait=not lazy)
+
+        if not lazy:
+            ensemble = ensemble_cls([f.result() for f in futures], fingerprints)
+        else:
+            ensemble = ensemble_cls([], fingerprints)
+            ensemble._loading_policies = futures
+        ensemble.replay_buffer = ReplayBuffer.load(path)
         return ensemble
 
     @classmethod
@@ -316,10 +408,34 @@ class PolicyEnsemble(object):
     def continue_training(
         self, trackers: List[DialogueStateTracker], domain: Domain, **kwargs: Any
     ) -> None:
+        """Continues training the policies on the new `trackers`.
 
-        self.training_trackers.extend(trackers)
+        The policies get the dialogues of the replay buffer followed by the
+        new trackers, hence the time this takes doesn't depend on the size
+        of the original training data."""
+
+        replayed = self.replay_buffer.trackers(domain)
         for p in self.policies:
-            p.continue_training(self.training_trackers, domain, **kwargs)
+            p.continue_training(
+                replayed + trackers, domain, num_new_trackers=len(trackers), **kwargs
+            )
+
+        self.replay_buffer.add(trackers)
+        if self.training_trackers is not None:
+            self.training_trackers.extend(trackers)
+        else:
+            self._add_action_fingerprints(trackers)
+        self.date_trained = datetime.now().strftime("%Y%m%d-%H%M%S")
+
+    def _add_action_fingerprints(self, trackers: List[DialogueStateTracker]) -> None:
+        training_events = self._training_events_from_trackers(trackers)
+        new_fingerprints = self._create_action_fingerprints(training_events) or {}
+
+        for action, fingerprint in new_fingerprints.items():
+            slots = self.action_fingerprints.get(action, {}).get("slots", [])
+            self.action_fingerprints[action] = {
+                "slots": sorted(set(slots) | set(fingerprint["slots"]))
+            }
 
 
 class SimplePolicyEnsemble(PolicyEnsemble):
@@ -334,14 +450,41 @@ class SimplePolicyEnsemble(PolicyEnsemble):
     def probabilities_using_best_policy(
         self, tracker: DialogueStateTracker, domain: Domain
     ) -> Tuple[List[float], Text]:
+        predictions = [
+            p.predict_action_probabilities(tracker, domain) for p in self.policies
+        ]
+        return self._best_policy_prediction(tracker, domain, predictions)
+
+    def probabilities_using_best_policy_batch(
+        self, trackers: List[DialogueStateTracker], domain: Domain
+    ) -> List[Tuple[List[float], Text]]:
+        """Predicts the next action for each of the trackers, every policy
+        predicts the actions of all trackers at once."""
+
+        predictions = [
+            p.predict_action_probabilities_batch(trackers, domain)
+            for p in self.policies
+        ]
+        return [
+            self._best_policy_prediction(tracker, domain, [ps[i] for ps in predictions])
+            for i, tracker in enumerate(trackers)
+        ]
+
+    def _best_policy_prediction(
+        self,
+        tracker: DialogueStateTracker,
+        domain: Domain,
+        predictions: List[List[float]],
+    ) -> Tuple[List[float], Text]:
+        """Picks the prediction of the best policy given the predictions
+        of all policies for `tracker`."""
+
         result = None
         max_confidence = -1
         best_policy_name = None
         best_policy_priority = -1
 
-        for i, p in enumerate(self.policies):
-            probabilities = p.predict_action_probabilities(tracker, domain)
-
+        for i, (p, probabilities) in enumerate(zip(self.policies, predictions)):
             if isinstance(tracker.events[-1], ActionExecutionRejected):
                 probabilities[
                     domain.index_for_action(tracker.events[-1].action_name)
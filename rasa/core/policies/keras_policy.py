@@ -17,6 +17,7 @@ from rasa.core.featurizers import (
 )
 from rasa.core.featurizers import TrackerFeaturizer
 from rasa.core.policies.policy import Policy
+from rasa.utils import tf_graph
 from rasa.core.trackers import DialogueStateTracker
 
 try:
@@ -221,11 +222,12 @@ class KerasPolicy(Policy):
 
         batch_size = kwargs.get("batch_size", 5)
         epochs = kwargs.get("epochs", 50)
+        num_new_trackers = kwargs.get("num_new_trackers", 1)
 
         with self.graph.as_default(), self.session.as_default():
             for _ in range(epochs):
                 training_data = self._training_data_for_continue_training(
-                    batch_size, training_trackers, domain
+                    batch_size, training_trackers, domain, num_new_trackers
                 )
 
                 # fit to one extra example using updated trackers
@@ -244,16 +246,31 @@ class KerasPolicy(Policy):
         self, tracker: DialogueStateTracker, domain: Domain
     ) -> List[float]:
 
+        return self.predict_action_probabilities_batch([tracker], domain)[0]
+
+    def predict_action_probabilities_batch(
+        self, trackers: List[DialogueStateTracker], domain: Domain
+    ) -> List[List[float]]:
+
         # noinspection PyPep8Naming
-        X = self.featurizer.create_X([tracker], domain)
+        X, true_lengths = self.featurizer.create_X_with_lengths(trackers, domain)
+
+        if len(self.model.output_shape) == 2 and len(set(true_lengths)) > 1:
+            # the model only predicts the action after the last state,
+            # which would be a padded one for the shorter trackers
+            return super(KerasPolicy, self).predict_action_probabilities_batch(
+                trackers, domain
+            )
 
         with self.graph.as_default(), self.session.as_default():
-            y_pred = self.model.predict(X, batch_size=1)
+            y_pred = self.model.predict(X, batch_size=len(trackers))
 
         if len(y_pred.shape) == 2:
-            return y_pred[-1].tolist()
+            return y_pred.tolist()
         elif len(y_pred.shape) == 3:
-            return y_pred[0, -1].tolist()
+            return [
+                y_pred[i, length - 1].tolist() for i, length in enumerate(true_lengths)
+            ]
 
     def persist(self, path: Text) -> None:
 
@@ -303,7 +320,7 @@ class KerasPolicy(Policy):
 
                 graph = tf.Graph()
                 with graph.as_default():
-                    session = tf.Session(config=_tf_config)
+                    session = tf.Session(config=tf_graph.session_config(_tf_config))
                     with session.as_default():
                         with warnings.catch_warnings():
                             warnings.simplefilter("ignore")
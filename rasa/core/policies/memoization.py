@@ -165,11 +165,12 @@ class MemoizationPolicy(Policy):
         **kwargs: Any
     ) -> None:
 
-        # add only the last tracker, because it is the only new one
+        # add only the new trackers, the others are memorized already
+        new_trackers = training_trackers[-kwargs.get("num_new_trackers", 1) :]
         (
             trackers_as_states,
             trackers_as_actions,
-        ) = self.featurizer.training_states_and_actions(training_trackers[-1:], domain)
+        ) = self.featurizer.training_states_and_actions(new_trackers, domain)
         self._add_states_to_lookup(
             trackers_as_states, trackers_as_actions, domain, online=True
         )
@@ -1,9 +1,10 @@
 import copy
 import logging
-import tensorflow as tf
+import typing
 from typing import Any, List, Optional, Text, Dict, Callable
 
 import rasa.utils.common
+from rasa.utils import tf_graph
 from rasa.core.domain import Domain
 from rasa.core.featurizers import (
     MaxHistoryTrackerFeaturizer,
@@ -13,6 +14,9 @@ from rasa.core.featurizers import TrackerFeaturizer
 from rasa.core.trackers import DialogueStateTracker
 from rasa.core.training.data import DialogueTrainingData
 
+if typing.TYPE_CHECKING:
+    import tensorflow as tf
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,12 +35,18 @@ class Policy(object):
             return cls._standard_featurizer()
 
     @staticmethod
-    def _load_tf_config(config: Dict[Text, Any]) -> Optional[tf.ConfigProto]:
-        """Prepare tf.ConfigProto for training"""
+    def _load_tf_config(config: Dict[Text, Any]) -> Optional["tf.ConfigProto"]:
+        """Prepare tf.ConfigProto for training.
+
+        The thread counts can be overridden with the environment variables
+        `TF_INTRA_OP_PARALLELISM_THREADS` and `TF_INTER_OP_PARALLELISM_THREADS`."""
+        import tensorflow as tf
+
         if config.get("tf_config") is not None:
-            return tf.ConfigProto(**config.pop("tf_config"))
+            tf_config = tf.ConfigProto(**config.pop("tf_config"))
         else:
-            return None
+            tf_config = None
+        return tf_graph.session_config(tf_config)
 
     def __init__(
         self,
@@ -72,9 +82,31 @@ class Policy(object):
     ) -> DialogueTrainingData:
         """Transform training trackers into a vector representation.
         The trackers, consisting of multiple turns, will be transformed
-        into a float vector which can be used by a ML model."""
+        into a float vector which can be used by a ML model.
 
-        training_data = self.featurizer.featurize_trackers(training_trackers, domain)
+        If a `training_data_cache` is passed, the data is reused from
+        earlier trainings with the same trackers and featurizer."""
+
+        cache = kwargs.get("training_data_cache")
+        cache_key = None
+        if cache is not None:
+            cache_key = cache.training_data_key(training_trackers, self.featurizer)
+
+        cached = cache.load_training_data(cache_key) if cache_key else None
+        if cached is not None:
+            # the cached featurizer is prepared for the domain already
+            self.__featurizer = cached["featurizer"]
+            training_data = cached["training_data"]
+        else:
+            # featurize directly into the cache entry, so the training data
+            # doesn't have to be held in memory
+            training_data = self.featurizer.featurize_trackers(
+                training_trackers,
+                domain,
+                out_dir=cache.training_data_dir(cache_key) if cache_key else None,
+            )
+            if cache_key:
+                cache.persist_training_data(cache_key, training_data, self.featurizer)
 
         max_training_samples = kwargs.get("max_training_samples")
         if max_training_samples is not None:
@@ -101,22 +133,26 @@ class Policy(object):
         batch_size: int,
         training_trackers: List[DialogueStateTracker],
         domain: Domain,
+        num_new_trackers: int = 1,
     ) -> DialogueTrainingData:
         """Creates training_data for `continue_training` by
-            taking the new labelled example training_trackers[-1:]
-            and inserting it in batch_size-1 parts of the old training data,
+            taking the new labelled examples training_trackers[-n:]
+            and inserting each of them in batch_size-1 parts of the old
+            training data,
         """
         import numpy as np
 
-        num_samples = batch_size - 1
-        num_prev_examples = len(training_trackers) - 1
+        num_new_trackers = max(1, min(num_new_trackers, len(training_trackers)))
+        num_samples = (batch_size - 1) * num_new_trackers
+        num_prev_examples = len(training_trackers) - num_new_trackers
 
         sampled_idx = np.random.choice(
             range(num_prev_examples),
             replace=False,
             size=min(num_samples, num_prev_examples),
         )
-        trackers = [training_trackers[i] for i in sampled_idx] + training_trackers[-1:]
+        trackers = [training_trackers[i] for i in sampled_idx]
+        trackers += training_trackers[-num_new_trackers:]
         return self.featurize_for_training(trackers, domain)
 
     def continue_training(
@@ -129,7 +165,11 @@ class Policy(object):
 
         This doesn't need to be supported by every policy. If it is supported,
         the policy can be used for online training and the implementation for
-        the continued training should be put into this function."""
+        the continued training should be put into this function.
+
+        The last `num_new_trackers` (keyword argument, defaults to 1) of
+        `training_trackers` are new, the ones before are a sample of the
+        earlier training data."""
 
         pass
 
@@ -143,6 +183,16 @@ class Policy(object):
 
         raise NotImplementedError("Policy must have the capacity to predict.")
 
+    def predict_action_probabilities_batch(
+        self, trackers: List[DialogueStateTracker], domain: Domain
+    ) -> List[List[float]]:
+        """Predicts the next action for each of the trackers.
+
+        Policies which can featurize and predict several trackers at once
+        (e.g. neural networks) should override this."""
+
+        return [self.predict_action_probabilities(t, domain) for t in trackers]
+
     def persist(self, path: Text) -> None:
         """Persists the policy to a storage."""
         raise NotImplementedError("Policy must have the capacity to persist itself.")
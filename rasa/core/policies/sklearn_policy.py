@@ -128,7 +128,7 @@ class SklearnPolicy(Policy):
         training_data = self.featurize_for_training(training_trackers, domain, **kwargs)
 
         X, y = self._extract_training_data(training_data)
-        model = self.model_architecture(**kwargs)
+        model = self.model_architecture()
         score = None
         # Note: clone is called throughout to avoid mutating default
         # arguments.
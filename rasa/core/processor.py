@@ -6,11 +6,10 @@ from typing import Any, Dict, List, Optional, Text, Tuple
 import numpy as np
 import time
 
-from rasa.core import jobs
 from rasa.core.actions import Action
 from rasa.core.actions.action import ACTION_LISTEN_NAME, ActionExecutionRejection
 from rasa.core.channels import CollectingOutputChannel, UserMessage
-from rasa.core.constants import ACTION_NAME_SENDER_ID_CONNECTOR_STR, USER_INTENT_RESTART
+from rasa.core.constants import USER_INTENT_RESTART
 from rasa.core.dispatcher import Dispatcher
 from rasa.core.domain import Domain
 from rasa.core.events import (
@@ -30,6 +29,7 @@ from rasa.core.interpreter import (
 )
 from rasa.core.nlg import NaturalLanguageGenerator
 from rasa.core.policies.ensemble import PolicyEnsemble
+from rasa.core.reminders import ReminderScheduler
 from rasa.core.tracker_store import TrackerStore
 from rasa.core.trackers import DialogueStateTracker, EventVerbosity
 from rasa.utils.endpoints import EndpointConfig
@@ -49,6 +49,7 @@ class MessageProcessor(object):
         max_number_of_predictions: int = 10,
         message_preprocessor: Optional[LambdaType] = None,
         on_circuit_break: Optional[LambdaType] = None,
+        reminder_scheduler: Optional[ReminderScheduler] = None,
     ):
         self.interpreter = interpreter
         self.nlg = generator
@@ -59,6 +60,9 @@ class MessageProcessor(object):
         self.message_preprocessor = message_preprocessor
         self.on_circuit_break = on_circuit_break
         self.action_endpoint = action_endpoint
+        self.reminder_scheduler = reminder_scheduler or ReminderScheduler(
+            create_processor=lambda: self
+        )
 
     async def handle_message(self, message: UserMessage) -> Optional[List[Text]]:
         """Handle a single message with this processor."""
@@ -166,6 +170,34 @@ class MessageProcessor(object):
         )
         return action, policy, probabilities[max_index]
 
+    def predict_next_actions(
+        self, trackers: List[DialogueStateTracker]
+    ) -> List[Tuple[Action, Text, float]]:
+        """Predicts the next action for each of the trackers.
+
+        The policies predict the actions of all trackers without a follow up
+        action at once, which is faster than predicting them one by one."""
+
+        predictions = [None] * len(trackers)
+        batch = []
+        for i, tracker in enumerate(trackers):
+            if tracker.followup_action:
+                predictions[i] = self.predict_next_action(tracker)
+            else:
+                batch.append(i)
+
+        if batch:
+            ensemble = self.policy_ensemble
+            batch_predictions = ensemble.probabilities_using_best_policy_batch(
+                [trackers[i] for i in batch], self.domain
+            )
+            for i, (probabilities, policy) in zip(batch, batch_predictions):
+                max_index = int(np.argmax(probabilities))
+                action = self.domain.action_for_index(max_index, self.action_endpoint)
+                predictions[i] = (action, policy, probabilities[max_index])
+
+        return predictions
+
     @staticmethod
     def _is_reminder(e: Event, name: Text) -> bool:
         return isinstance(e, ReminderScheduled) and e.name == name
@@ -357,38 +389,17 @@ class MessageProcessor(object):
 
         for e in events:
             if isinstance(e, ReminderScheduled):
-                (await jobs.scheduler()).add_job(
-                    self.handle_reminder,
-                    "date",
-                    run_date=e.trigger_date_time,
-                    args=[e, dispatcher],
-                    id=e.name,
-                    replace_existing=True,
-                    name=(
-                        str(e.action_name)
-                        + ACTION_NAME_SENDER_ID_CONNECTOR_STR
-                        + tracker.sender_id
-                    ),
-                )
+                self.reminder_scheduler.schedule(e, tracker.sender_id, dispatcher)
 
-    @staticmethod
     async def _cancel_reminders(
-        events: List[Event], tracker: DialogueStateTracker
+        self, events: List[Event], tracker: DialogueStateTracker
     ) -> None:
         """Cancel reminders by action_name"""
 
         # All Reminders with the same action name will be cancelled
         for e in events:
             if isinstance(e, ReminderCancelled):
-                name_to_check = (
-                    str(e.action_name)
-                    + ACTION_NAME_SENDER_ID_CONNECTOR_STR
-                    + tracker.sender_id
-                )
-                scheduler = await jobs.scheduler()
-                for j in scheduler.get_jobs():
-                    if j.name == name_to_check:
-                        scheduler.remove_job(j.id)
+                self.reminder_scheduler.cancel(e.action_name, tracker.sender_id)
 
     async def _run_action(
         self, action, tracker, dispatcher, policy=None, confidence=None
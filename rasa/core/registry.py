@@ -11,11 +11,20 @@ if typing.TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# policies which are not imported by `rasa.core.policies` to avoid loading
+# their dependencies (e.g. tensorflow) if they are not used
+LAZILY_IMPORTED_POLICIES = {
+    "EmbeddingPolicy": "rasa.core.policies.embedding_policy.EmbeddingPolicy",
+    "KerasPolicy": "rasa.core.policies.keras_policy.KerasPolicy",
+    "SklearnPolicy": "rasa.core.policies.sklearn_policy.SklearnPolicy",
+}
+
 
 def policy_from_module_path(module_path: Text) -> Type["Policy"]:
     """Given the name of a policy module tries to retrieve the policy."""
     from rasa.core import utils
 
+    module_path = LAZILY_IMPORTED_POLICIES.get(module_path, module_path)
     try:
         return utils.class_from_module_path(
             module_path, lookup_path="rasa.core.policies"
@@ -0,0 +1,504 @@
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import time
+import typing
+import uuid
+from collections import OrderedDict, defaultdict, namedtuple
+from typing import Callable, Dict, List, Optional, Set, Text, Tuple
+
+from rasa.core.channels import CollectingOutputChannel
+from rasa.core.dispatcher import Dispatcher
+from rasa.core.events import Event, ReminderScheduled
+from rasa.core.utils import class_from_module_path
+
+if typing.TYPE_CHECKING:
+    from rasa.core.processor import MessageProcessor
+    from rasa.utils.endpoints import EndpointConfig
+
+logger = logging.getLogger(__name__)
+
+# a reminder which was scheduled for the conversation with `sender_id`,
+# `output_channel` is the name of the channel the conversation took place on
+ScheduledReminder = namedtuple("ScheduledReminder", "sender_id reminder output_channel")
+
+
+def trigger_time(reminder: ReminderScheduled) -> float:
+    """Unix time at which the reminder is due.
+
+    Naive trigger dates are interpreted in the local timezone."""
+
+    return reminder.trigger_date_time.timestamp()
+
+
+class ReminderStore(object):
+    """Stores the pending reminders of all conversations.
+
+    Reminders are identified by their name, scheduling a reminder replaces
+    the pending reminder with the same name."""
+
+    @staticmethod
+    def find_reminder_store(
+        store: Optional["EndpointConfig"] = None
+    ) -> "ReminderStore":
+        if store is None or store.type is None:
+            return InMemoryReminderStore()
+        elif store.type.lower() == "sql":
+            return SQLReminderStore(host=store.url, **store.kwargs)
+        else:
+            return ReminderStore.load_reminder_store_from_module_string(store)
+
+    @staticmethod
+    def load_reminder_store_from_module_string(
+        store: "EndpointConfig"
+    ) -> "ReminderStore":
+        custom_store = None
+        try:
+            custom_store = class_from_module_path(store.type)
+        except (AttributeError, ImportError):
+            logger.warning(
+                "Store type '{}' not found. "
+                "Using InMemoryReminderStore instead".format(store.type)
+            )
+
+        if custom_store:
+            return custom_store(url=store.url, **store.kwargs)
+        else:
+            return InMemoryReminderStore()
+
+    def schedule(self, scheduled: ScheduledReminder) -> None:
+        raise NotImplementedError()
+
+    def cancel(self, sender_id: Text, action_name: Text) -> List[Text]:
+        """Removes the reminders of `action_name` for the conversation.
+
+        Returns the names of the removed reminders."""
+
+        raise NotImplementedError()
+
+    def claim_due(self, until: float, limit: int) -> List[ScheduledReminder]:
+        """Returns at most `limit` reminders due at `until`.
+
+        The earliest reminders are returned first. Claimed reminders are
+        not returned again, `complete` removes them once they are handled."""
+
+        raise NotImplementedError()
+
+    def complete(self, scheduled: ScheduledReminder) -> None:
+        """Removes a claimed reminder after it was handled."""
+
+        pass
+
+    def next_trigger_time(self) -> Optional[float]:
+        """Trigger time of the earliest pending reminder."""
+
+        raise NotImplementedError()
+
+
+class InMemoryReminderStore(ReminderStore):
+    """Stores the pending reminders in memory.
+
+    The reminders are lost when Rasa is restarted, hence they are removed
+    as soon as they are claimed."""
+
+    def __init__(self) -> None:
+        self._reminders = {}  # type: Dict[Text, ScheduledReminder]
+        # names of the pending reminders per conversation and action
+        self._names = defaultdict(set)  # type: Dict[Tuple[Text, Text], Set[Text]]
+        # heap of the trigger times, cancelled and replaced reminders are
+        # removed lazily
+        self._queue = []  # type: List[Tuple[float, int, ScheduledReminder]]
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._reminders)
+
+    @staticmethod
+    def _key(scheduled: ScheduledReminder) -> Tuple[Text, Text]:
+        return scheduled.sender_id, str(scheduled.reminder.action_name)
+
+    def schedule(self, scheduled: ScheduledReminder) -> None:
+        self._remove(scheduled.reminder.name)
+        self._reminders[scheduled.reminder.name] = scheduled
+        self._names[self._key(scheduled)].add(scheduled.reminder.name)
+        entry = (trigger_time(scheduled.reminder), next(self._counter), scheduled)
+        heapq.heappush(self._queue, entry)
+        self._compact()
+
+    def _remove(self, name: Text) -> None:
+        scheduled = self._reminders.pop(name, None)
+        if scheduled is not None:
+            key = self._key(scheduled)
+            self._names[key].discard(name)
+            if not self._names[key]:
+                del self._names[key]
+
+    def _is_pending(self, scheduled: ScheduledReminder) -> bool:
+        return self._reminders.get(scheduled.reminder.name) is scheduled
+
+    def _compact(self) -> None:
+        # rebuilds the heap once most of its entries are outdated, this keeps
+        # the memory bounded if most reminders are cancelled
+        if len(self._queue) > 2 * len(self._reminders) + 1000:
+            self._queue = [e for e in self._queue if self._is_pending(e[2])]
+            heapq.heapify(self._queue)
+
+    def cancel(self, sender_id: Text, action_name: Text) -> List[Text]:
+        names = self._names.pop((sender_id, str(action_name)), set())
+        for name in names:
+            del self._reminders[name]
+        self._compact()
+        return list(names)
+
+    def claim_due(self, until: float, limit: int) -> List[ScheduledReminder]:
+        due = []
+        while self._queue and len(due) < limit and self._queue[0][0] <= until:
+            _, _, scheduled = heapq.heappop(self._queue)
+            if self._is_pending(scheduled):
+                self._remove(scheduled.reminder.name)
+                due.append(scheduled)
+        return due
+
+    def next_trigger_time(self) -> Optional[float]:
+        while self._queue and not self._is_pending(self._queue[0][2]):
+            heapq.heappop(self._queue)
+        return self._queue[0][0] if self._queue else None
+
+
+class SQLReminderStore(ReminderStore):
+    """Stores the pending reminders in an SQL database.
+
+    The reminders survive restarts and can be shared by several Rasa
+    instances, every reminder is fired by one of them. Claimed reminders
+    stay in the database until they are handled, if they aren't handled
+    within `claim_timeout` seconds (e.g. because Rasa crashed), they are
+    claimed again."""
+
+    from sqlalchemy.ext.declarative import declarative_base
+
+    Base = declarative_base()
+
+    class SQLReminder(Base):
+        from sqlalchemy import Column, Float, Index, String
+
+        __tablename__ = "reminders"
+        # cancelling looks up the reminders of a conversation and action
+        __table_args__ = (
+            Index("ix_reminders_sender_id_action_name", "sender_id", "action_name"),
+        )
+
+        name = Column(String, primary_key=True)
+        sender_id = Column(String, nullable=False)
+        action_name = Column(String, nullable=False)
+        trigger_time = Column(Float, nullable=False, index=True)
+        output_channel = Column(String)
+        data = Column(String, nullable=False)
+        # time and id of the claim of the instance which fires the reminder
+        claimed_at = Column(Float)
+        claim = Column(String)
+
+    def __init__(
+        self,
+        dialect: Text = "sqlite",
+        host: Optional[Text] = None,
+        port: Optional[int] = None,
+        db: Text = "rasa.db",
+        username: Text = None,
+        password: Text = None,
+        claim_timeout: float = 300,
+    ) -> None:
+        import sqlalchemy
+        from sqlalchemy import create_engine
+        from sqlalchemy.engine.url import URL
+        from sqlalchemy.orm import sessionmaker
+
+        engine_url = URL(dialect, username, password, host, port, database=db)
+
+        logger.debug(
+            "Attempting to connect to database "
+            'via "{}"'.format(engine_url.__to_string__())
+        )
+
+        self.engine = create_engine(engine_url)
+        try:
+            self.Base.metadata.create_all(self.engine)
+        except (sqlalchemy.exc.OperationalError, sqlalchemy.exc.ProgrammingError) as e:
+            # another Rasa instance may create the table at the same time
+            logger.error("Could not create tables: {}".format(e))
+
+        self.session = sessionmaker(bind=self.engine)()
+        self.claim_timeout = claim_timeout
+        # ids of the claims of this instance, a reminder which is scheduled
+        # again with the same name must not be removed by `complete`
+        self._claims = {}  # type: Dict[Text, Text]
+
+        logger.debug("Connection to SQL database '{}' successful".format(db))
+
+    def schedule(self, scheduled: ScheduledReminder) -> None:
+        reminder = scheduled.reminder
+        self.session.merge(
+            self.SQLReminder(
+                name=reminder.name,
+                sender_id=scheduled.sender_id,
+                action_name=str(reminder.action_name),
+                trigger_time=trigger_time(reminder),
+                output_channel=scheduled.output_channel,
+                data=json.dumps(reminder.as_dict()),
+                # a replaced reminder is not claimed anymore
+                claimed_at=None,
+                claim=None,
+            )
+        )
+        self.session.commit()
+
+    def cancel(self, sender_id: Text, action_name: Text) -> List[Text]:
+        query = self.session.query(self.SQLReminder).filter(
+            self.SQLReminder.sender_id == sender_id,
+            self.SQLReminder.action_name == str(action_name),
+        )
+        names = [name for name, in query.with_entities(self.SQLReminder.name)]
+        if names:
+            query.delete(synchronize_session=False)
+        self.session.commit()
+        return names
+
+    def _unclaimed(self, now: float):
+        from sqlalchemy import or_
+
+        return or_(
+            self.SQLReminder.claimed_at.is_(None),
+            self.SQLReminder.claimed_at <= now - self.claim_timeout,
+        )
+
+    def claim_due(self, until: float, limit: int) -> List[ScheduledReminder]:
+        # reminders which another instance is claiming right now are skipped,
+        # `FOR UPDATE` is ignored by databases which lock the whole table
+        now = time.time()
+        rows = (
+            self.session.query(self.SQLReminder)
+            .filter(self.SQLReminder.trigger_time <= until, self._unclaimed(now))
+            .order_by(self.SQLReminder.trigger_time)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        due = []
+        for row in rows:
+            row.claimed_at = now
+            row.claim = uuid.uuid4().hex
+            self._claims[row.name] = row.claim
+            due.append(
+                ScheduledReminder(
+                    row.sender_id,
+                    Event.from_parameters(json.loads(row.data)),
+                    row.output_channel,
+                )
+            )
+        self.session.commit()
+        return due
+
+    def complete(self, scheduled: ScheduledReminder) -> None:
+        claim = self._claims.pop(scheduled.reminder.name, None)
+        if claim is None:
+            return
+
+        self.session.query(self.SQLReminder).filter(
+            self.SQLReminder.name == scheduled.reminder.name,
+            self.SQLReminder.claim == claim,
+        ).delete(synchronize_session=False)
+        self.session.commit()
+
+    def next_trigger_time(self) -> Optional[float]:
+        from sqlalchemy import func
+
+        now = time.time()
+        earliest = (
+            self.session.query(func.min(self.SQLReminder.trigger_time))
+            .filter(self._unclaimed(now))
+            .scalar()
+        )
+        # claimed reminders are due again once their claim expires
+        earliest_claim = (
+            self.session.query(func.min(self.SQLReminder.claimed_at))
+            .filter(self.SQLReminder.claimed_at > now - self.claim_timeout)
+            .scalar()
+        )
+        self.session.commit()
+
+        if earliest_claim is not None:
+            expires = earliest_claim + self.claim_timeout
+            earliest = expires if earliest is None else min(earliest, expires)
+        return earliest
+
+
+class ReminderScheduler(object):
+    """Fires the reminders of a reminder store when they are due.
+
+    Due reminders are claimed from the store in batches of `batch_size`,
+    the reminders of a batch are handled concurrently for different
+    conversations and in order for the same conversation. Each reminder is
+    removed from the store once it is handled. The store is checked at
+    least every `poll_interval` seconds, so reminders which were scheduled
+    by other Rasa instances are fired as well.
+
+    The output channels of the conversations are kept for at most
+    `max_dispatchers` reminders, the least recently scheduled reminders
+    are answered on a collecting channel if there are more."""
+
+    def __init__(
+        self,
+        store: Optional[ReminderStore] = None,
+        create_processor: Optional[Callable[[], "MessageProcessor"]] = None,
+        batch_size: int = 1000,
+        poll_interval: float = 1.0,
+        max_dispatchers: int = 10000,
+    ) -> None:
+        self.store = store or InMemoryReminderStore()
+        self.create_processor = create_processor
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_dispatchers = max_dispatchers
+        # dispatchers of the reminders scheduled by this instance, reminders
+        # from the store without one are answered on a collecting channel.
+        # Reminders fired by other instances never remove their entry, hence
+        # the least recently scheduled ones are dropped.
+        self._dispatchers = OrderedDict()  # type: Dict[Text, Dispatcher]
+        self._task = None
+        self._loop = None
+        self._wakeup = None
+        self._next_wakeup = None
+
+    @property
+    def is_running(self) -> bool:
+        return (
+            self._task is not None
+            and not self._task.done()
+            and self._loop is asyncio.get_event_loop()
+        )
+
+    def start(self) -> None:
+        """Starts firing reminders on the current event loop."""
+
+        if self.is_running:
+            return
+
+        self._loop = asyncio.get_event_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.ensure_future(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def schedule(
+        self, reminder: ReminderScheduled, sender_id: Text, dispatcher: Dispatcher
+    ) -> None:
+        """Schedules the reminder of the conversation with `sender_id`.
+
+        The reminder replaces a pending reminder with the same name."""
+
+        self.store.schedule(
+            ScheduledReminder(sender_id, reminder, dispatcher.output_channel.name())
+        )
+        self._dispatchers.pop(reminder.name, None)
+        self._dispatchers[reminder.name] = dispatcher
+        while len(self._dispatchers) > self.max_dispatchers:
+            self._dispatchers.popitem(last=False)
+
+        self.start()
+        if self._next_wakeup is None or trigger_time(reminder) < self._next_wakeup:
+            self._wakeup.set()
+
+    def cancel(self, action_name: Text, sender_id: Text) -> None:
+        """Cancels the reminders of `action_name` of the conversation."""
+
+        for name in self.store.cancel(sender_id, action_name):
+            self._dispatchers.pop(name, None)
+
+    def _seconds_until_next_reminder(self) -> float:
+        now = time.time()
+        next_trigger_time = self.store.next_trigger_time()
+        if next_trigger_time is None:
+            self._next_wakeup = now + self.poll_interval
+        else:
+            self._next_wakeup = min(next_trigger_time, now + self.poll_interval)
+        return max(self._next_wakeup - now, 0)
+
+    async def _run(self) -> None:
+        while True:
+            # noinspection PyBroadException
+            try:
+                due = self.store.claim_due(time.time(), self.batch_size)
+                if due:
+                    await self._fire(due)
+                if len(due) == self.batch_size:
+                    # there might be more reminders which are due
+                    continue
+                timeout = self._seconds_until_next_reminder()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Failed to fire the due reminders.")
+                timeout = self.poll_interval
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _fire(self, due: List[ScheduledReminder]) -> None:
+        per_conversation = OrderedDict()
+        for scheduled in due:
+            per_conversation.setdefault(scheduled.sender_id, []).append(scheduled)
+
+        await asyncio.gather(
+            *[self._fire_in_order(reminders) for reminders in per_conversation.values()]
+        )
+
+    async def _fire_in_order(self, reminders: List[ScheduledReminder]) -> None:
+        for scheduled in reminders:
+            # noinspection PyBroadException
+            try:
+                await self._handle(scheduled)
+            except Exception:
+                logger.exception(
+                    "Failed to handle reminder '{}' of conversation "
+                    "'{}'.".format(scheduled.reminder.name, scheduled.sender_id)
+                )
+
+            # noinspection PyBroadException
+            try:
+                self.store.complete(scheduled)
+            except Exception:
+                # the reminder is claimed again once its claim expires
+                logger.exception(
+                    "Failed to remove reminder '{}' from the reminder "
+                    "store.".format(scheduled.reminder.name)
+                )
+
+    async def _handle(self, scheduled: ScheduledReminder) -> None:
+        dispatcher = self._dispatchers.pop(scheduled.reminder.name, None)
+        if self.create_processor is None:
+            logger.warning(
+                "Dropped reminder '{}' as there is no processor to handle "
+                "it.".format(scheduled.reminder.name)
+            )
+            return
+
+        processor = self.create_processor()
+        if dispatcher is None:
+            # the reminder was scheduled before a restart or by another
+            # instance, the output channel isn't available here
+            logger.debug(
+                "Handling reminder '{}' without its '{}' output "
+                "channel.".format(scheduled.reminder.name, scheduled.output_channel)
+            )
+            dispatcher = Dispatcher(
+                scheduled.sender_id, CollectingOutputChannel(), processor.nlg
+            )
+
+        await processor.handle_reminder(scheduled.reminder, dispatcher)
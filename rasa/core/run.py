@@ -1,8 +1,10 @@
 import argparse
 import asyncio
 import logging
+import time
+from collections import OrderedDict
 from functools import partial
-from typing import List, Optional, Text
+from typing import Any, Callable, List, Optional, Text
 
 from sanic import Sanic
 from sanic_cors import CORS
@@ -13,6 +15,7 @@ import rasa.utils
 from rasa.core import constants, utils, cli
 from rasa.core.channels import BUILTIN_CHANNELS, InputChannel, console
 from rasa.core.interpreter import NaturalLanguageInterpreter
+from rasa.core.reminders import ReminderStore
 from rasa.core.tracker_store import TrackerStore
 
 logger = logging.getLogger()  # get the root logger
@@ -124,6 +127,29 @@ def configure_app(
     return app
 
 
+class StartupTimer(object):
+    """Measures the duration of the phases of the server startup."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.phases = OrderedDict()
+
+    def timed(self, phase: Text, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.phases[phase] = time.perf_counter() - start
+        return result
+
+    def report(self) -> Text:
+        phases = ", ".join(
+            "{}: {:.2f}s".format(phase, duration)
+            for phase, duration in self.phases.items()
+        )
+        return "Server is ready after {:.2f}s ({}).".format(
+            time.perf_counter() - self.started, phases
+        )
+
+
 def serve_application(
     core_model=None,
     nlu_model=None,
@@ -136,7 +162,11 @@ def serve_application(
     jwt_secret=None,
     jwt_method=None,
     endpoints=None,
+    loading_threads=constants.DEFAULT_LOADING_THREADS,
+    lazy_policies=False,
 ):
+    timer = StartupTimer()
+
     if not channel and not credentials:
         channel = "cmdline"
 
@@ -152,47 +182,114 @@ def serve_application(
     )
 
     app.register_listener(
-        partial(load_agent_on_start, core_model, endpoints, nlu_model),
+        partial(
+            load_agent_on_start,
+            core_model,
+            endpoints,
+            nlu_model,
+            num_threads=loading_threads,
+            lazy_policies=lazy_policies,
+            timer=timer,
+        ),
         "before_server_start",
     )
+
+    # noinspection PyUnusedLocal
+    async def report_startup_time(app, loop):
+        logger.info(timer.report())
+
+    app.register_listener(report_startup_time, "after_server_start")
     app.run(host="0.0.0.0", port=port, access_log=logger.isEnabledFor(logging.DEBUG))
 
 
 # noinspection PyUnusedLocal
-async def load_agent_on_start(core_model, endpoints, nlu_model, app, loop):
+async def load_agent_on_start(
+    core_model,
+    endpoints,
+    nlu_model,
+    app,
+    loop,
+    num_threads=1,
+    lazy_policies=False,
+    timer=None,
+):
     """Load an agent.
 
     Used to be scheduled on server start
-    (hence the `app` and `loop` arguments)."""
+    (hence the `app` and `loop` arguments).
+
+    The NLU and the Core model are loaded in parallel, the duration of
+    each loading phase is recorded by `timer`."""
     from rasa.core import broker
     from rasa.core.agent import Agent
 
-    _interpreter = NaturalLanguageInterpreter.create(nlu_model, endpoints.nlu)
-    _broker = broker.from_endpoint_config(endpoints.event_broker)
+    timer = timer or StartupTimer()
+
+    loading_interpreter = loop.run_in_executor(
+        None,
+        timer.timed,
+        "nlu model",
+        NaturalLanguageInterpreter.create,
+        nlu_model,
+        endpoints.nlu,
+        num_threads,
+    )
 
-    _tracker_store = TrackerStore.find_tracker_store(
-        None, endpoints.tracker_store, _broker
+    _broker = timer.timed(
+        "event broker", broker.from_endpoint_config, endpoints.event_broker
+    )
+    _tracker_store = timer.timed(
+        "tracker store",
+        TrackerStore.find_tracker_store,
+        None,
+        endpoints.tracker_store,
+        _broker,
+    )
+    _reminder_store = timer.timed(
+        "reminder store",
+        ReminderStore.find_reminder_store,
+        endpoints.reminder_store,
     )
 
     if endpoints and endpoints.model:
         from rasa.core import agent
 
         app.agent = Agent(
-            interpreter=_interpreter,
+            interpreter=await loading_interpreter,
             generator=endpoints.nlg,
             tracker_store=_tracker_store,
             action_endpoint=endpoints.action,
+            reminder_store=_reminder_store,
+            num_threads=num_threads,
+            lazy_policies=lazy_policies,
         )
 
+        start = time.perf_counter()
         await agent.load_from_server(app.agent, model_server=endpoints.model)
+        timer.phases["core model"] = time.perf_counter() - start
     else:
-        app.agent = Agent.load(
-            core_model,
-            interpreter=_interpreter,
-            generator=endpoints.nlg,
-            tracker_store=_tracker_store,
-            action_endpoint=endpoints.action,
+        loading_agent = loop.run_in_executor(
+            None,
+            partial(
+                timer.timed,
+                "core model",
+                Agent.load,
+                core_model,
+                generator=endpoints.nlg,
+                tracker_store=_tracker_store,
+                action_endpoint=endpoints.action,
+                num_threads=num_threads,
+                lazy_policies=lazy_policies,
+                reminder_store=_reminder_store,
+            ),
         )
+        _interpreter, app.agent = await asyncio.gather(
+            loading_interpreter, loading_agent
+        )
+        app.agent.interpreter = _interpreter
+
+    # fire the reminders which are pending in the store
+    app.agent.reminder_scheduler.start()
 
     return app.agent
 
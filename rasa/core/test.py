@@ -1,18 +1,30 @@
 import argparse
 import asyncio
+import copy
 import json
 import logging
 import os
 import typing
 import warnings
-from collections import defaultdict, namedtuple
-from typing import Any, Dict, List, Optional, Text, Tuple
-
-from rasa.core.events import ActionExecuted, UserUttered
+from collections import defaultdict, deque, namedtuple
+from typing import Any, Dict, Generator, List, Optional, Text, Tuple
+
+from rasa.constants import DEFAULT_DOMAIN_PATH
+from rasa.core.events import (
+    ActionExecuted,
+    ActionReverted,
+    Event,
+    Form,
+    Restarted,
+    UserUttered,
+    UserUtteranceReverted,
+)
+from rasa.core.trackers import DialogueStateTracker
 
 if typing.TYPE_CHECKING:
     from rasa.core.agent import Agent
-    from rasa.core.trackers import DialogueStateTracker
+    from rasa.core.domain import Domain
+    from rasa.core.processor import MessageProcessor
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +33,14 @@ StoryEvalution = namedtuple(
     "evaluation_store failed_stories action_list in_training_data_fraction",
 )
 
+# number of stories which are stepped through together, the policies predict
+# the next actions of all of them at once
+PREDICTION_BATCH_SIZE = 64
+
+# evaluation results of a single story: the evaluation store, the story with
+# the wrong predictions and the predicted actions
+TrackerPredictions = Tuple["EvaluationStore", DialogueStateTracker, List[Dict]]
+
 
 def create_argument_parser():
     """Create argument parser for the evaluate script."""
@@ -209,6 +229,62 @@ class WronglyClassifiedUserUtterance(UserUttered):
         )
 
 
+class _EvaluationTracker(DialogueStateTracker):
+    """A tracker which derives its past states incrementally while the
+    events of a story are added one by one.
+
+    The states of a tracker with a form depend on the whole event history,
+    they are derived from scratch as soon as a form is involved."""
+
+    def __init__(self, sender_id, slots, max_event_history=None):
+        super(_EvaluationTracker, self).__init__(sender_id, slots, max_event_history)
+        self._states = None
+        self._states_domain = None
+        self._cache_states = max_event_history is None
+
+    def past_states(self, domain: "Domain") -> deque:
+        if not self._cache_states:
+            return super(_EvaluationTracker, self).past_states(domain)
+
+        if self._states is None or self._states_domain is not domain:
+            self._states = super(_EvaluationTracker, self).past_states(domain)
+            self._states_domain = domain
+
+        return copy.copy(self._states)
+
+    def __getstate__(self) -> Dict[Text, Any]:
+        # the cached states are only used while predicting the story, the
+        # domain would be pickled along with them
+        state = self.__dict__.copy()
+        state.update(_states=None, _states_domain=None)
+        return state
+
+    def update(self, event) -> None:
+        super(_EvaluationTracker, self).update(event)
+
+        if isinstance(event, Form) or self.active_form:
+            self._cache_states = False
+            self._states = None
+        elif self._states is None:
+            pass
+        elif isinstance(event, ActionReverted) and len(self._states) > 1:
+            # the states after and before the reverted action are replaced
+            # by the current state
+            self._states.pop()
+            self._states.pop()
+            state = self._states_domain.get_active_states(self)
+            self._states.append(frozenset(state.items()))
+        elif isinstance(event, (Restarted, ActionReverted, UserUtteranceReverted)):
+            self._states = None
+        else:
+            # the last state is the current one, an executed action makes it
+            # the state the action was predicted in
+            if not isinstance(event, ActionExecuted):
+                self._states.pop()
+            state = self._states_domain.get_active_states(self)
+            self._states.append(frozenset(state.items()))
+
+
 async def _generate_trackers(resource_name, agent, max_stories=None, use_e2e=False):
     from rasa.core.training.generator import TrainingDataGenerator
 
@@ -311,7 +387,7 @@ def _emulate_form_rejection(processor, partial_tracker):
 
 
 def _collect_action_executed_predictions(
-    processor, partial_tracker, event, fail_on_prediction_errors
+    processor, partial_tracker, event, fail_on_prediction_errors, prediction=None
 ):
     from rasa.core.policies.form_policy import FormPolicy
 
@@ -319,7 +395,9 @@ def _collect_action_executed_predictions(
 
     gold = event.action_name
 
-    action, policy, confidence = processor.predict_next_action(partial_tracker)
+    if prediction is None:
+        prediction = processor.predict_next_action(partial_tracker)
+    action, policy, confidence = prediction
     predicted = action.name()
 
     if policy and predicted != gold and FormPolicy.__name__ in policy:
@@ -360,26 +438,33 @@ def _collect_action_executed_predictions(
     return action_executed_eval_store, policy, confidence
 
 
-def _predict_tracker_actions(
-    tracker, agent: "Agent", fail_on_prediction_errors=False, use_e2e=False
-):
-    from rasa.core.trackers import DialogueStateTracker
+def _story_predictions(
+    tracker: DialogueStateTracker,
+    processor: "MessageProcessor",
+    fail_on_prediction_errors: bool = False,
+    use_e2e: bool = False,
+) -> Generator[DialogueStateTracker, Tuple, TrackerPredictions]:
+    """Steps through the events of the story `tracker`.
+
+    Yields the partial tracker whenever the next action has to be
+    predicted and expects the prediction of the processor to be sent back,
+    so that the actions of several stories can be predicted together."""
 
-    processor = agent.create_processor()
     tracker_eval_store = EvaluationStore()
 
     events = list(tracker.events)
 
-    partial_tracker = DialogueStateTracker.from_events(
-        tracker.sender_id, events[:1], agent.domain.slots
+    partial_tracker = _EvaluationTracker.from_events(
+        tracker.sender_id, events[:1], processor.domain.slots
     )
 
     tracker_actions = []
 
     for event in events[1:]:
         if isinstance(event, ActionExecuted):
+            prediction = yield partial_tracker
             action_executed_result, policy, confidence = _collect_action_executed_predictions(
-                processor, partial_tracker, event, fail_on_prediction_errors
+                processor, partial_tracker, event, fail_on_prediction_errors, prediction
             )
             tracker_eval_store.merge_store(action_executed_result)
             tracker_actions.append(
@@ -402,6 +487,134 @@ def _predict_tracker_actions(
     return tracker_eval_store, partial_tracker, tracker_actions
 
 
+def _predict_stories_actions(
+    trackers: List[DialogueStateTracker],
+    agent: "Agent",
+    fail_on_prediction_errors: bool = False,
+    use_e2e: bool = False,
+    progress_bar: Optional[Any] = None,
+) -> List[TrackerPredictions]:
+    """Evaluates the stories in batches of `PREDICTION_BATCH_SIZE`.
+
+    The stories of a batch are stepped through together, all actions
+    which have to be predicted at the same step are predicted at once."""
+
+    processor = agent.create_processor()
+    results = [None] * len(trackers)
+
+    for start in range(0, len(trackers), PREDICTION_BATCH_SIZE):
+        batch = range(start, min(start + PREDICTION_BATCH_SIZE, len(trackers)))
+        stories = {
+            i: _story_predictions(
+                trackers[i], processor, fail_on_prediction_errors, use_e2e
+            )
+            for i in batch
+        }
+        predictions = {i: None for i in batch}
+
+        while stories:
+            waiting = {}
+            for i, story in stories.items():
+                try:
+                    waiting[i] = story.send(predictions[i])
+                except StopIteration as finished:
+                    results[i] = finished.value
+                    if progress_bar is not None:
+                        progress_bar.update(1)
+
+            stories = {i: stories[i] for i in waiting}
+            if waiting:
+                predictions = dict(
+                    zip(waiting, processor.predict_next_actions(list(waiting.values())))
+                )
+
+    return results
+
+
+def _predict_tracker_actions(
+    tracker, agent: "Agent", fail_on_prediction_errors=False, use_e2e=False
+):
+    return _predict_stories_actions(
+        [tracker], agent, fail_on_prediction_errors, use_e2e
+    )[0]
+
+
+# agent of a story evaluation worker process
+_worker_agent = None  # type: Optional[Agent]
+
+
+def _init_story_evaluation_worker(model_path: Text) -> None:
+    from rasa.core.agent import Agent
+
+    global _worker_agent
+
+    _worker_agent = Agent.load(model_path)
+
+
+def _predict_stories_actions_in_worker(
+    args: Tuple[List[Tuple[Text, List]], bool, bool]
+) -> List[TrackerPredictions]:
+    stories, fail_on_prediction_errors, use_e2e = args
+    slots = _worker_agent.domain.slots
+    trackers = [
+        DialogueStateTracker.from_events(sender_id, events, slots)
+        for sender_id, events in stories
+    ]
+    results = _predict_stories_actions(
+        trackers, _worker_agent, fail_on_prediction_errors, use_e2e
+    )
+    # only the failed stories are needed by the parent process
+    return [
+        (store, tracker if store.has_prediction_target_mismatch() else None, actions)
+        for store, tracker, actions in results
+    ]
+
+
+def _predict_stories_actions_in_processes(
+    trackers: List[DialogueStateTracker],
+    model_path: Text,
+    worker_processes: int,
+    fail_on_prediction_errors: bool = False,
+    use_e2e: bool = False,
+    progress_bar: Optional[Any] = None,
+) -> List[TrackerPredictions]:
+    """Shards the stories across `worker_processes` processes, which load
+    the Core model from `model_path`."""
+
+    import multiprocessing
+    from rasa.utils.common import limited_threads
+
+    # several shards per process balance stories of different lengths
+    shard_size = max(1, -(-len(trackers) // (4 * worker_processes)))
+    shards = [
+        (
+            [(t.sender_id, list(t.events)) for t in trackers[i : i + shard_size]],
+            fail_on_prediction_errors,
+            use_e2e,
+        )
+        for i in range(0, len(trackers), shard_size)
+    ]
+    num_threads = max(1, (os.cpu_count() or 1) // worker_processes)
+
+    # forked processes would inherit the initialized tensorflow sessions
+    with limited_threads(num_threads):
+        pool = multiprocessing.get_context("spawn").Pool(
+            worker_processes,
+            initializer=_init_story_evaluation_worker,
+            initargs=(model_path,),
+        )
+    try:
+        results = []
+        for shard_results in pool.imap(_predict_stories_actions_in_worker, shards):
+            results.extend(shard_results)
+            if progress_bar is not None:
+                progress_bar.update(len(shard_results))
+        return results
+    finally:
+        pool.terminate()
+        pool.join()
+
+
 def _in_training_data_fraction(action_list):
     """Given a list of action items, returns the fraction of actions
 
@@ -422,8 +635,13 @@ def collect_story_predictions(
     agent: "Agent",
     fail_on_prediction_errors: bool = False,
     use_e2e: bool = False,
+    worker_processes: int = 1,
+    model_path: Optional[Text] = None,
 ) -> Tuple[StoryEvalution, int]:
-    """Test the stories from a file, running them through the stored model."""
+    """Test the stories from a file, running them through the stored model.
+
+    The stories can be evaluated in `worker_processes` processes, each of
+    them loads the Core model of `agent` from its directory `model_path`."""
     from rasa.nlu.test import get_evaluation_metrics
     from tqdm import tqdm
 
@@ -434,13 +652,35 @@ def collect_story_predictions(
 
     logger.info("Evaluating {} stories\nProgress:".format(num_stories))
 
+    if worker_processes > 1 and model_path is None:
+        logger.warning(
+            "The stories are evaluated in a single process, the worker "
+            "processes need the path of the model to load it."
+        )
+        worker_processes = 1
+
     action_list = []
 
-    for tracker in tqdm(completed_trackers):
-        tracker_results, predicted_tracker, tracker_actions = _predict_tracker_actions(
-            tracker, agent, fail_on_prediction_errors, use_e2e
-        )
+    with tqdm(total=num_stories) as progress_bar:
+        if worker_processes > 1:
+            results = _predict_stories_actions_in_processes(
+                completed_trackers,
+                model_path,
+                worker_processes,
+                fail_on_prediction_errors,
+                use_e2e,
+                progress_bar,
+            )
+        else:
+            results = _predict_stories_actions(
+                completed_trackers,
+                agent,
+                fail_on_prediction_errors,
+                use_e2e,
+                progress_bar,
+            )
 
+    for tracker_results, predicted_tracker, tracker_actions in results:
         story_eval_store.merge_store(tracker_results)
 
         action_list.extend(tracker_actions)
@@ -507,14 +747,24 @@ async def test(
     out_directory: Optional[Text] = None,
     fail_on_prediction_errors: bool = False,
     e2e: bool = False,
+    worker_processes: int = 1,
+    model_path: Optional[Text] = None,
 ):
-    """Run the evaluation of the stories, optionally plot the results."""
+    """Run the evaluation of the stories, optionally plot the results.
+
+    To evaluate the stories in `worker_processes` processes, the directory
+    `agent` was loaded from has to be passed as `model_path`."""
     from rasa.nlu.test import get_evaluation_metrics
 
     completed_trackers = await _generate_trackers(stories, agent, max_stories, e2e)
 
     story_evaluation, _ = collect_story_predictions(
-        completed_trackers, agent, fail_on_prediction_errors, e2e
+        completed_trackers,
+        agent,
+        fail_on_prediction_errors,
+        e2e,
+        worker_processes,
+        model_path,
     )
 
     evaluation_store = story_evaluation.evaluation_store
@@ -617,33 +867,57 @@ def plot_story_evaluation(
     fig.savefig(os.path.join(out_directory, "story_confmat.pdf"), bbox_inches="tight")
 
 
-async def compare(models: Text, stories_file: Text, output: Text) -> None:
-    """Evaluates multiple trained models on a test set."""
+async def compare(
+    models: Text, stories_file: Text, output: Text, worker_processes: int = 1
+) -> None:
+    """Evaluates multiple trained models on a test set.
+
+    The test trackers are generated once for all models with the same
+    domain. The models can be evaluated in `worker_processes` processes."""
     from rasa.core.agent import Agent
+    from rasa.core.domain import Domain
     import rasa.nlu.utils as nlu_utils
     from rasa.core import utils
 
-    num_correct = defaultdict(list)
-
-    for run in nlu_utils.list_subdirectories(models):
-        num_correct_run = defaultdict(list)
-
-        for model in sorted(nlu_utils.list_subdirectories(run)):
-            logger.info("Evaluating model {}".format(model))
+    runs = [
+        (run, sorted(nlu_utils.list_subdirectories(run)))
+        for run in nlu_utils.list_subdirectories(models)
+    ]
 
-            agent = Agent.load(model)
+    stories = {}  # type: Dict[Text, List[Tuple[Text, List[Event]]]]
+    jobs = []
+    for _, run_models in runs:
+        for model in run_models:
+            domain = Domain.load(os.path.join(model, DEFAULT_DOMAIN_PATH))
+            domain_key = utils.get_text_hash(
+                json.dumps(domain.as_dict(), sort_keys=True)
+            )
+            if domain_key not in stories:
+                trackers = await _generate_trackers(stories_file, Agent(domain))
+                stories[domain_key] = [(t.sender_id, list(t.events)) for t in trackers]
+            jobs.append((model, domain_key))
+
+    if worker_processes > 1:
+        num_correct_models = _evaluate_models_in_processes(
+            jobs, stories, worker_processes
+        )
+    else:
+        num_correct_models = [
+            _num_correct_stories(model, stories[domain_key])
+            for model, domain_key in jobs
+        ]
+    num_correct_models = iter(num_correct_models)
 
-            completed_trackers = await _generate_trackers(stories_file, agent)
+    num_correct = defaultdict(list)
 
-            story_eval_store, no_of_stories = collect_story_predictions(
-                completed_trackers, agent
-            )
+    for _, run_models in runs:
+        num_correct_run = defaultdict(list)
 
-            failed_stories = story_eval_store.failed_stories
+        for model in run_models:
             policy_name = "".join(
                 [i for i in os.path.basename(model) if not i.isdigit()]
             )
-            num_correct_run[policy_name].append(no_of_stories - len(failed_stories))
+            num_correct_run[policy_name].append(next(num_correct_models))
 
         for k, v in num_correct_run.items():
             num_correct[k].append(v)
@@ -651,6 +925,64 @@ async def compare(models: Text, stories_file: Text, output: Text) -> None:
     utils.dump_obj_as_json_to_file(os.path.join(output, "results.json"), num_correct)
 
 
+def _num_correct_stories(
+    model_path: Text, stories: List[Tuple[Text, List[Event]]]
+) -> int:
+    """Loads the Core model from `model_path` and returns the number of
+    `stories` it predicts correctly."""
+    from rasa.core.agent import Agent
+
+    logger.info("Evaluating model {}".format(model_path))
+
+    agent = Agent.load(model_path)
+    trackers = [
+        DialogueStateTracker.from_events(sender_id, events, agent.domain.slots)
+        for sender_id, events in stories
+    ]
+    results = _predict_stories_actions(trackers, agent)
+
+    return sum(
+        1 for store, _, _ in results if not store.has_prediction_target_mismatch()
+    )
+
+
+# test stories of a model comparison worker process, by domain
+_worker_stories = {}  # type: Dict[Text, List[Tuple[Text, List[Event]]]]
+
+
+def _init_compare_worker(stories: Dict[Text, List[Tuple[Text, List[Event]]]]) -> None:
+    global _worker_stories
+
+    _worker_stories = stories
+
+
+def _num_correct_stories_in_worker(job: Tuple[Text, Text]) -> int:
+    model_path, domain_key = job
+    return _num_correct_stories(model_path, _worker_stories[domain_key])
+
+
+def _evaluate_models_in_processes(
+    jobs: List[Tuple[Text, Text]],
+    stories: Dict[Text, List[Tuple[Text, List[Event]]]],
+    worker_processes: int,
+) -> List[int]:
+    import multiprocessing
+    from rasa.utils.common import limited_threads
+
+    num_threads = max(1, (os.cpu_count() or 1) // worker_processes)
+
+    # forked processes would inherit the initialized tensorflow sessions
+    with limited_threads(num_threads):
+        pool = multiprocessing.get_context("spawn").Pool(
+            worker_processes, initializer=_init_compare_worker, initargs=(stories,)
+        )
+    try:
+        return pool.map(_num_correct_stories_in_worker, jobs, chunksize=1)
+    finally:
+        pool.terminate()
+        pool.join()
+
+
 def plot_curve(output: Text, no_stories: List[int]) -> None:
     """Plot the results from run_comparison_evaluation.
 
@@ -734,12 +1066,19 @@ def main():
                 cmdline_arguments.output,
                 cmdline_arguments.fail_on_prediction_errors,
                 cmdline_arguments.e2e,
+                cmdline_arguments.worker_processes,
+                cmdline_arguments.core,
             )
         )
 
     elif cmdline_arguments.mode == "compare":
-        compare(
-            cmdline_arguments.core, cmdline_arguments.stories, cmdline_arguments.output
+        loop.run_until_complete(
+            compare(
+                cmdline_arguments.core,
+                cmdline_arguments.stories,
+                cmdline_arguments.output,
+                cmdline_arguments.worker_processes,
+            )
         )
 
         story_n_path = os.path.join(cmdline_arguments.core, "num_stories.json")
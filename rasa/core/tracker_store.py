@@ -18,6 +18,10 @@ logger = logging.getLogger(__name__)
 
 
 class TrackerStore(object):
+    # stores which mark the trackers as persisted whenever they save them,
+    # only these can rely on `DialogueStateTracker.events_since_persisted`
+    marks_persisted_events = False
+
     def __init__(
         self, domain: Optional[Domain], event_broker: Optional[EventChannel] = None
     ) -> None:
@@ -69,9 +73,13 @@ class TrackerStore(object):
 
     def init_tracker(self, sender_id):
         if self.domain:
-            return DialogueStateTracker(
+            tracker = DialogueStateTracker(
                 sender_id, self.domain.slots, max_event_history=self.max_event_history
             )
+            if self.marks_persisted_events:
+                # nothing is persisted for a new tracker
+                tracker.mark_events_as_persisted()
+            return tracker
         else:
             return None
 
@@ -94,10 +102,20 @@ class TrackerStore(object):
         raise NotImplementedError()
 
     def stream_events(self, tracker: DialogueStateTracker) -> None:
-        old_tracker = self.retrieve(tracker.sender_id)
-        offset = len(old_tracker.events) if old_tracker else 0
-        evts = tracker.events
-        for evt in list(itertools.islice(evts, offset, len(evts))):
+        """Publishes the events which are not persisted yet."""
+
+        new_events = None
+        if self.marks_persisted_events:
+            new_events = tracker.events_since_persisted()
+        if new_events is None:
+            # the tracker was not retrieved from this store, compare it with
+            # the stored tracker instead
+            old_tracker = self.retrieve(tracker.sender_id)
+            offset = len(old_tracker.events) if old_tracker else 0
+            evts = tracker.events
+            new_events = list(itertools.islice(evts, offset, len(evts)))
+
+        for evt in new_events:
             body = {"sender_id": tracker.sender_id}
             body.update(evt.as_dict())
             self.event_broker.publish(body)
@@ -114,10 +132,14 @@ class TrackerStore(object):
         dialogue = pickle.loads(_json)
         tracker = self.init_tracker(sender_id)
         tracker.recreate_from_dialogue(dialogue)
+        if self.marks_persisted_events:
+            tracker.mark_events_as_persisted()
         return tracker
 
 
 class InMemoryTrackerStore(TrackerStore):
+    marks_persisted_events = True
+
     def __init__(
         self, domain: Domain, event_broker: Optional[EventChannel] = None
     ) -> None:
@@ -129,6 +151,7 @@ class InMemoryTrackerStore(TrackerStore):
             self.stream_events(tracker)
         serialised = InMemoryTrackerStore.serialise_tracker(tracker)
         self.store[tracker.sender_id] = serialised
+        tracker.mark_events_as_persisted()
 
     def retrieve(self, sender_id: Text) -> Optional[DialogueStateTracker]:
         if sender_id in self.store:
@@ -143,6 +166,8 @@ class InMemoryTrackerStore(TrackerStore):
 
 
 class RedisTrackerStore(TrackerStore):
+    marks_persisted_events = True
+
     def keys(self) -> Iterable[Text]:
         return self.red.keys()
 
@@ -172,6 +197,7 @@ class RedisTrackerStore(TrackerStore):
 
         serialised_tracker = self.serialise_tracker(tracker)
         self.red.set(tracker.sender_id, serialised_tracker, ex=timeout)
+        tracker.mark_events_as_persisted()
 
     def retrieve(self, sender_id):
         stored = self.red.get(sender_id)
@@ -182,6 +208,8 @@ class RedisTrackerStore(TrackerStore):
 
 
 class MongoTrackerStore(TrackerStore):
+    marks_persisted_events = True
+
     def __init__(
         self,
         domain,
@@ -227,6 +255,7 @@ class MongoTrackerStore(TrackerStore):
         self.conversations.update_one(
             {"sender_id": tracker.sender_id}, {"$set": state}, upsert=True
         )
+        tracker.mark_events_as_persisted()
 
     def retrieve(self, sender_id):
         stored = self.conversations.find_one({"sender_id": sender_id})
@@ -244,9 +273,11 @@ class MongoTrackerStore(TrackerStore):
 
         if stored is not None:
             if self.domain:
-                return DialogueStateTracker.from_dict(
+                tracker = DialogueStateTracker.from_dict(
                     sender_id, stored.get("events"), self.domain.slots
                 )
+                tracker.mark_events_as_persisted()
+                return tracker
             else:
                 logger.warning(
                     "Can't recreate tracker from mongo storage "
@@ -264,6 +295,8 @@ class MongoTrackerStore(TrackerStore):
 class SQLTrackerStore(TrackerStore):
     """Store which can save and retrieve trackers from an SQL database."""
 
+    marks_persisted_events = True
+
     from sqlalchemy.ext.declarative import declarative_base
 
     Base = declarative_base()
@@ -394,7 +427,11 @@ class SQLTrackerStore(TrackerStore):
         if self.domain and len(events) > 0:
             logger.debug("Recreating tracker from sender id '{}'".format(sender_id))
 
-            return DialogueStateTracker.from_dict(sender_id, events, self.domain.slots)
+            tracker = DialogueStateTracker.from_dict(
+                sender_id, events, self.domain.slots
+            )
+            tracker.mark_events_as_persisted()
+            return tracker
         else:
             logger.debug(
                 "Can't retrieve tracker matching"
@@ -429,6 +466,7 @@ class SQLTrackerStore(TrackerStore):
                 )
             )
         self.session.commit()
+        tracker.mark_events_as_persisted()
 
         logger.debug(
             "Tracker with sender_id '{}' "
@@ -438,6 +476,10 @@ class SQLTrackerStore(TrackerStore):
     def _additional_events(self, tracker: DialogueStateTracker) -> Iterator:
         """Return events from the tracker which aren't currently stored."""
 
+        new_events = tracker.events_since_persisted()
+        if new_events is not None:
+            return iter(new_events)
+
         from sqlalchemy import func
 
         query = self.session.query(func.max(self.SQLEvent.timestamp))
@@ -1,4 +1,5 @@
 import copy
+import itertools
 import logging
 import typing
 from collections import deque
@@ -93,6 +94,12 @@ class DialogueStateTracker(object):
         self._max_event_history = max_event_history
         # list of previously seen events
         self.events = self._create_events([])
+        # number of events which were added to the tracker, including the
+        # ones which were dropped because of `max_event_history`
+        self._num_added_events = 0
+        # `_num_added_events` when the events were persisted by a tracker
+        # store, `None` if it is unknown which events are persisted
+        self._num_persisted_events = None
         # id of the source of the messages
         self.sender_id = sender_id
         # slots that can be filled in this domain
@@ -373,6 +380,7 @@ class DialogueStateTracker(object):
 
         self._reset()
         self.events.extend(dialogue.events)
+        self._num_added_events += len(dialogue.events)
         self.replay_events()
 
     def copy(self):
@@ -411,8 +419,30 @@ class DialogueStateTracker(object):
             raise ValueError("event to log must be an instance of a subclass of Event.")
 
         self.events.append(event)
+        self._num_added_events += 1
         event.apply_to(self)
 
+    def mark_events_as_persisted(self) -> None:
+        """Marks the current events as persisted by a tracker store.
+
+        Called by the tracker stores when they retrieve or save the tracker."""
+
+        self._num_persisted_events = self._num_added_events
+
+    def events_since_persisted(self) -> Optional[List[Event]]:
+        """Returns the events which were added since the events were
+        persisted, `None` if the tracker doesn't know which events are
+        persisted (e.g. if it was not retrieved from a tracker store)."""
+
+        if self._num_persisted_events is None:
+            return None
+
+        num_new = self._num_added_events - self._num_persisted_events
+        num_new = min(num_new, len(self.events))
+        # only iterate over the new events at the end of the deque
+        new_events = list(itertools.islice(reversed(self.events), num_new))
+        return new_events[::-1]
+
     def export_stories(self, e2e=False) -> Text:
         """Dump the tracker as a story in the Rasa Core story format.
 
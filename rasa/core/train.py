@@ -3,10 +3,14 @@ import asyncio
 import logging
 import os
 import typing
-from typing import Dict, Optional, Text
+from typing import Any, Dict, List, Optional, Text, Tuple
 
 if typing.TYPE_CHECKING:
+    from rasa.core.agent import Agent
     from rasa.core.interpreter import NaturalLanguageInterpreter
+    from rasa.core.trackers import DialogueStateTracker
+    from rasa.core.training.cache import TrainingDataCache
+    from rasa.core.utils import AvailableEndpoints
 
 logger = logging.getLogger(__name__)
 
@@ -59,51 +63,89 @@ async def train(
     policy_config: Text = None,
     exclusion_percentage: int = None,
     kwargs: Optional[Dict] = None,
+    cache_namespace: Optional[Text] = None,
 ):
+    agent = _create_agent(domain_file, policy_config, interpreter, endpoints)
+
+    training_data, cache, kwargs = await _load_training_data(
+        agent, stories_file, exclusion_percentage, kwargs, cache_namespace
+    )
+    if cache is not None:
+        kwargs["training_data_cache"] = cache
+    agent.train(training_data, **kwargs)
+    agent.persist(output_path, dump_stories)
+
+    return agent
+
+
+def _create_agent(
+    domain_file: Text,
+    policy_config: Text,
+    interpreter: Optional["NaturalLanguageInterpreter"] = None,
+    endpoints: "AvailableEndpoints" = None,
+) -> "Agent":
     from rasa.core.agent import Agent
-    from rasa.core import config, utils
+    from rasa.core import config
     from rasa.core.utils import AvailableEndpoints
 
     if not endpoints:
         endpoints = AvailableEndpoints()
 
-    if not kwargs:
-        kwargs = {}
-
-    policies = config.load(policy_config)
-
-    agent = Agent(
+    return Agent(
         domain_file,
         generator=endpoints.nlg,
         action_endpoint=endpoints.action,
         interpreter=interpreter,
-        policies=policies,
+        policies=config.load(policy_config),
     )
 
+
+async def _load_training_data(
+    agent: "Agent",
+    stories_file: Text,
+    exclusion_percentage: int = None,
+    kwargs: Optional[Dict] = None,
+    cache_namespace: Optional[Text] = None,
+) -> Tuple[List["DialogueStateTracker"], Optional["TrainingDataCache"], Dict]:
+    """Load the training trackers of `agent`.
+
+    Returns the trackers, the cache they were loaded with and the
+    remaining `kwargs` which are meant for the training of the policies."""
+    from rasa.core import utils
+    from rasa.core.training.cache import TrainingDataCache
+
     data_load_args, kwargs = utils.extract_args(
-        kwargs,
+        kwargs or {},
         {
             "use_story_concatenation",
             "unique_last_num_states",
             "augmentation_factor",
             "remove_duplicates",
             "debug_plots",
+            "worker_processes",
         },
     )
+    cache_args, kwargs = utils.extract_args(kwargs, {"cache_dir"})
+
+    cache = None
+    if cache_args.get("cache_dir"):
+        cache = TrainingDataCache(cache_args["cache_dir"], cache_namespace)
 
     training_data = await agent.load_data(
-        stories_file, exclusion_percentage=exclusion_percentage, **data_load_args
+        stories_file,
+        exclusion_percentage=exclusion_percentage,
+        cache=cache,
+        **data_load_args
     )
-    agent.train(training_data, **kwargs)
-    agent.persist(output_path, dump_stories)
-
-    return agent
+    return training_data, cache, kwargs
 
 
 def _additional_arguments(args):
     additional = {
         "augmentation_factor": args.augmentation,
         "debug_plots": args.debug_plots,
+        "worker_processes": args.worker_processes,
+        "cache_dir": args.cache_dir,
     }
     # remove None values
     return {k: v for k, v in additional.items() if v is not None}
@@ -119,15 +161,29 @@ async def train_comparison_models(
     dump_stories=False,
     kwargs=None,
 ):
-    """Train multiple models for comparison of policies"""
+    """Train multiple models for comparison of policies.
+
+    The training trackers of a run and exclusion percentage are generated
+    once and shared by all policies through the training data cache (a
+    temporary one if `kwargs` contain no `cache_dir`). If `kwargs` contain
+    more than one `worker_processes`, the models are trained in that many
+    parallel processes."""
+    import shutil
+    import tempfile
     from rasa.core import config
 
     exclusion_percentages = exclusion_percentages or []
     policy_configs = policy_configs or []
+    kwargs = dict(kwargs or {})
+    worker_processes = kwargs.pop("worker_processes", None) or 1
 
-    for r in range(runs):
-        logging.info("Starting run {}/{}".format(r + 1, runs))
+    temporary_cache_dir = None
+    if not kwargs.get("cache_dir"):
+        temporary_cache_dir = tempfile.mkdtemp()
+        kwargs["cache_dir"] = temporary_cache_dir
 
+    jobs = []
+    for r in range(runs):
         for i in exclusion_percentages:
             current_round = exclusion_percentages.index(i) + 1
 
@@ -144,21 +200,90 @@ async def train_comparison_models(
                     output_path, "run_" + str(r + 1), policy_name + str(current_round)
                 )
 
-                logging.info(
-                    "Starting to train {} round {}/{}"
-                    " with {}% exclusion"
-                    "".format(policy_name, current_round, len(exclusion_percentages), i)
+                description = (
+                    "{} round {}/{} with {}% exclusion (run {}/{})"
+                    "".format(
+                        policy_name,
+                        current_round,
+                        len(exclusion_percentages),
+                        i,
+                        r + 1,
+                        runs,
+                    )
                 )
-
-                await train(
-                    domain,
-                    stories,
-                    output,
+                train_args = dict(
+                    domain_file=domain,
+                    stories_file=stories,
+                    output_path=output,
                     policy_config=policy_config,
                     exclusion_percentage=i,
                     kwargs=kwargs,
                     dump_stories=dump_stories,
+                    # all policies of a run share the same excluded stories
+                    cache_namespace="run_{}".format(r + 1),
                 )
+                jobs.append((description, train_args))
+
+    try:
+        if worker_processes > 1:
+            await _generate_comparison_training_data(jobs)
+            _train_comparison_models_in_processes(jobs, worker_processes)
+        else:
+            for description, train_args in jobs:
+                logging.info("Starting to train {}".format(description))
+                await train(**train_args)
+    finally:
+        if temporary_cache_dir:
+            shutil.rmtree(temporary_cache_dir, ignore_errors=True)
+
+
+async def _generate_comparison_training_data(
+    jobs: List[Tuple[Text, Dict[Text, Any]]]
+) -> None:
+    """Fill the training data cache before the comparison models are trained,
+    so the training processes don't generate the same trackers concurrently.
+
+    The trackers are generated in the same order and with the same arguments
+    as by sequentially trained models, so the comparison results don't
+    depend on the number of worker processes."""
+
+    for description, train_args in jobs:
+        logging.info("Generating the training data of {}".format(description))
+        agent = _create_agent(train_args["domain_file"], train_args["policy_config"])
+        await _load_training_data(
+            agent,
+            train_args["stories_file"],
+            train_args["exclusion_percentage"],
+            train_args["kwargs"],
+            train_args["cache_namespace"],
+        )
+
+
+def _train_comparison_model_in_worker(job: Tuple[Text, Dict[Text, Any]]) -> None:
+    description, train_args = job
+    logging.info("Starting to train {}".format(description))
+    loop = asyncio.get_event_loop()
+    # the agent is not returned, it might not be picklable
+    loop.run_until_complete(train(**train_args))
+
+
+def _train_comparison_models_in_processes(
+    jobs: List[Tuple[Text, Dict[Text, Any]]], worker_processes: int
+) -> None:
+    import multiprocessing
+    from rasa.utils.common import limited_threads
+
+    num_threads = max(1, (os.cpu_count() or 1) // worker_processes)
+
+    # forked processes would inherit the initialized tensorflow sessions
+    with limited_threads(num_threads):
+        pool = multiprocessing.get_context("spawn").Pool(worker_processes)
+    try:
+        # one model at a time, the training times of the policies differ
+        pool.map(_train_comparison_model_in_worker, jobs, chunksize=1)
+    finally:
+        pool.terminate()
+        pool.join()
 
 
 async def get_no_of_stories(story_file, domain):
@@ -6,6 +6,7 @@ if typing.TYPE_CHECKING:
     from rasa.core.interpreter import NaturalLanguageInterpreter
     from rasa.core.trackers import DialogueStateTracker
     from rasa.core.training.structures import StoryGraph
+    from rasa.core.training.cache import TrainingDataCache
 
 
 async def extract_story_graph(
@@ -41,11 +42,30 @@ async def load_data(
     use_story_concatenation: bool = True,
     debug_plots=False,
     exclusion_percentage: int = None,
+    worker_processes: int = 1,
+    cache: Optional["TrainingDataCache"] = None,
 ) -> List["DialogueStateTracker"]:
     from rasa.core.training import extract_story_graph
     from rasa.core.training.generator import TrainingDataGenerator
 
     if resource_name:
+        cache_key = None
+        if cache is not None:
+            cache_key = cache.trackers_key(
+                resource_name,
+                domain,
+                exclusion_percentage,
+                remove_duplicates=remove_duplicates,
+                unique_last_num_states=unique_last_num_states,
+                augmentation_factor=augmentation_factor,
+                tracker_limit=tracker_limit,
+                use_story_concatenation=use_story_concatenation,
+            )
+        if cache_key is not None:
+            trackers = cache.load_trackers(cache_key, domain)
+            if trackers is not None:
+                return trackers
+
         graph = await extract_story_graph(
             resource_name, domain, exclusion_percentage=exclusion_percentage
         )
@@ -59,8 +79,13 @@ async def load_data(
             tracker_limit,
             use_story_concatenation,
             debug_plots,
+            worker_processes=worker_processes,
         )
-        return g.generate()
+        trackers = g.generate()
+
+        if cache_key is not None:
+            trackers = cache.persist_trackers(cache_key, trackers)
+        return trackers
     else:
         return []
 
@@ -0,0 +1,209 @@
+import io
+import json
+import logging
+import os
+import pickle
+import typing
+from typing import Any, Dict, List, Optional, Text
+
+import rasa
+from rasa.core import utils
+
+if typing.TYPE_CHECKING:
+    from rasa.core.domain import Domain
+    from rasa.core.featurizers import TrackerFeaturizer
+    from rasa.core.trackers import DialogueStateTracker
+    from rasa.core.training.data import DialogueTrainingData
+
+logger = logging.getLogger(__name__)
+
+TRACKERS_DIR = "trackers"
+TRAINING_DATA_DIR = "training_data"
+
+
+class CachedTrackers(list):
+    """Training trackers which are stored in the cache under `key`, so
+    the featurized data can be looked up without hashing the trackers."""
+
+    def __init__(self, trackers: List["DialogueStateTracker"], key: Text) -> None:
+        super(CachedTrackers, self).__init__(trackers)
+        self.key = key
+
+
+class TrainingDataCache(object):
+    """On disk cache of generated training trackers and featurized data.
+
+    Entries are content addressed: trackers are stored under a hash of
+    the stories, the domain and the generator configuration, training
+    data under a hash of the trackers' key and the featurizer
+    configuration. The featurized matrices are stored as `.npy` files
+    and loaded as read only memory maps.
+
+    Stories are excluded at random if an exclusion percentage is set,
+    hence these trackers are only cached if a `namespace` is given, e.g.
+    the run of a model comparison."""
+
+    def __init__(self, cache_dir: Text, namespace: Optional[Text] = None) -> None:
+        self.cache_dir = cache_dir
+        self.namespace = namespace
+
+    @staticmethod
+    def fingerprint(*parts: Any) -> Text:
+        return utils.get_text_hash(json.dumps(parts, sort_keys=True, default=str))
+
+    @staticmethod
+    def story_fingerprint(resource_name: Text) -> Text:
+        """Hash the names and contents of all story files in `resource_name`."""
+
+        import rasa.nlu.utils as nlu_utils
+
+        files = sorted(nlu_utils.list_files(resource_name))
+        return TrainingDataCache.fingerprint(
+            [(os.path.relpath(f, resource_name), utils.get_file_hash(f)) for f in files]
+        )
+
+    def trackers_key(
+        self,
+        resource_name: Text,
+        domain: "Domain",
+        exclusion_percentage: Optional[int] = None,
+        **generator_config: Any
+    ) -> Optional[Text]:
+        """Key of the trackers generated from `resource_name`.
+
+        Returns `None` if the trackers must not be cached."""
+
+        if not exclusion_percentage:
+            namespace = None
+        elif self.namespace is None:
+            return None
+        else:
+            namespace = self.namespace
+
+        return self.fingerprint(
+            # the featurization might change between versions
+            rasa.__version__,
+            self.story_fingerprint(resource_name),
+            domain.as_dict(),
+            exclusion_percentage,
+            namespace,
+            generator_config,
+        )
+
+    def load_trackers(self, key: Text, domain: "Domain") -> Optional[CachedTrackers]:
+        path = self._trackers_file(key)
+        if not os.path.exists(path):
+            logger.info("Training trackers cache miss ({}).".format(key))
+            return None
+
+        with open(path, "rb") as f:
+            trackers = pickle.load(f)
+        for t in trackers:
+            # the domain of the trackers is compared by identity
+            t.domain = domain
+
+        logger.info(
+            "Training trackers cache hit ({}), loaded {} trackers."
+            "".format(key, len(trackers))
+        )
+        return CachedTrackers(trackers, key)
+
+    def persist_trackers(
+        self, key: Text, trackers: List["DialogueStateTracker"]
+    ) -> CachedTrackers:
+        path = self._trackers_file(key)
+        utils.create_dir_for_file(path)
+        # write to a temporary file first, so a concurrent training
+        # never reads a partially written cache entry
+        with open(path + ".tmp", "wb") as f:
+            pickle.dump(trackers, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + ".tmp", path)
+        return CachedTrackers(trackers, key)
+
+    def training_data_key(
+        self,
+        trackers: List["DialogueStateTracker"],
+        featurizer: "TrackerFeaturizer",
+        **kwargs: Any
+    ) -> Optional[Text]:
+        """Key of the data the (not yet prepared) `featurizer` creates
+        from `trackers`.
+
+        Returns `None` if the trackers were not loaded from or persisted
+        to the cache."""
+
+        import jsonpickle
+
+        if not isinstance(trackers, CachedTrackers):
+            return None
+
+        return self.fingerprint(trackers.key, jsonpickle.encode(featurizer), kwargs)
+
+    def load_training_data(self, key: Text) -> Optional[Dict[Text, Any]]:
+        """Load the featurized data and the prepared featurizer.
+
+        Returns a dict with the keys `training_data` and `featurizer`."""
+
+        import jsonpickle
+        import numpy as np
+        from rasa.core.training.data import DialogueTrainingData
+
+        path = os.path.join(self.cache_dir, TRAINING_DATA_DIR, key)
+        if not os.path.exists(os.path.join(path, "meta.json")):
+            logger.info("Featurized training data cache miss ({}).".format(key))
+            return None
+
+        meta = utils.read_json_file(os.path.join(path, "meta.json"))
+        X = np.load(os.path.join(path, "X.npy"), mmap_mode="r")
+        y = np.load(os.path.join(path, "y.npy"), mmap_mode="r")
+        featurizer = jsonpickle.decode(meta["featurizer"])
+
+        logger.info(
+            "Featurized training data cache hit ({}), loaded {} examples."
+            "".format(key, len(y))
+        )
+        return {
+            "training_data": DialogueTrainingData(X, y, meta["true_length"]),
+            "featurizer": featurizer,
+        }
+
+    def training_data_dir(self, key: Text) -> Text:
+        """Directory of the featurized data with the key `key`."""
+
+        path = os.path.join(self.cache_dir, TRAINING_DATA_DIR, key)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def persist_training_data(
+        self,
+        key: Text,
+        training_data: "DialogueTrainingData",
+        featurizer: "TrackerFeaturizer",
+    ) -> None:
+        import jsonpickle
+        import numpy as np
+
+        path = self.training_data_dir(key)
+
+        arrays = [("X.npy", training_data.X), ("y.npy", training_data.y)]
+        for filename, array in arrays:
+            filename = os.path.join(path, filename)
+            if getattr(array, "filename", None) == os.path.abspath(filename):
+                # the data was featurized into the cache entry directly
+                array.flush()
+            else:
+                np.save(filename, array)
+
+        true_length = training_data.true_length
+        meta = {
+            "true_length": (
+                [int(l) for l in true_length] if true_length is not None else None
+            ),
+            "featurizer": jsonpickle.encode(featurizer),
+        }
+        # the meta file marks the entry as complete, hence it is written last
+        with io.open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            f.write(json.dumps(meta))
+
+    def _trackers_file(self, key: Text) -> Text:
+        return os.path.join(self.cache_dir, TRACKERS_DIR, key + ".pkl")
@@ -6,13 +6,15 @@ import logging
 import os
 import re
 import warnings
-from typing import Optional, List, Text, Any, Dict, AnyStr, TYPE_CHECKING
+from typing import Optional, List, Text, Any, Dict, AnyStr, Type, TYPE_CHECKING
+
+from async_generator import async_generator, yield_
 
 from rasa.core import utils
 from rasa.core.constants import INTENT_MESSAGE_PREFIX
 from rasa.core.events import ActionExecuted, UserUttered, Event, SlotSet
 from rasa.core.exceptions import StoryParseError
-from rasa.core.interpreter import RegexInterpreter
+from rasa.core.interpreter import NaturalLanguageInterpreter, RegexInterpreter
 from rasa.core.training.structures import (
     Checkpoint,
     STORY_START,
@@ -30,6 +32,16 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+REGEX_INTERPRETER = RegexInterpreter()
+
+COMMENT_REGEX = re.compile(r"<!--.*?-->")
+
+TEMPLATE_VARIABLE_REGEX = re.compile(r"`([^`]+)`")
+
+FORM_LINE_REGEX = re.compile(r"^[*\-]\s+{}".format(FORM_PREFIX))
+
+EVENT_LINE_REGEX = re.compile("^([^{]+)([{].+)?")
+
 
 class EndToEndReader(MarkdownReader):
     def _parse_item(self, line: Text) -> Optional["Message"]:
@@ -151,13 +163,23 @@ class StoryStepBuilder(object):
 class StoryFileReader(object):
     """Helper class to read a story file."""
 
-    def __init__(self, domain, interpreter, template_vars=None, use_e2e=False):
+    def __init__(
+        self, domain, interpreter, template_vars=None, use_e2e=False, parse_cache=None
+    ):
         self.story_steps = []
         self.current_step_builder = None  # type: Optional[StoryStepBuilder]
         self.domain = domain
         self.interpreter = interpreter
         self.template_variables = template_vars if template_vars else {}
         self.use_e2e = use_e2e
+        # parse results of the user messages by their text, can be shared
+        # between the readers of several files
+        self.parse_cache = parse_cache if parse_cache is not None else {}
+        self.e2e_reader = EndToEndReader()
+        self.e2e_messages = {}  # type: Dict[Text, Message]
+        # resolving the type of an event is expensive, e.g. for actions all
+        # event types are checked before falling back to `ActionExecuted`
+        self.event_types = {}  # type: Dict[Text, Optional[Type[Event]]]
 
     @staticmethod
     async def read_from_folder(
@@ -169,21 +191,12 @@ class StoryFileReader(object):
         exclusion_percentage=None,
     ):
         """Given a path reads all contained story files."""
-        import rasa.nlu.utils as nlu_utils
-
-        if not os.path.exists(resource_name):
-            raise ValueError(
-                "Story file or folder could not be found. Make "
-                "sure '{}' exists and points to a story folder "
-                "or file.".format(os.path.abspath(resource_name))
-            )
 
         story_steps = []
-        for f in nlu_utils.list_files(resource_name):
-            steps = await StoryFileReader.read_from_file(
-                f, domain, interpreter, template_variables, use_e2e
-            )
-            story_steps.extend(steps)
+        async for step in StoryFileReader.stream_from_folder(
+            resource_name, domain, interpreter, template_variables, use_e2e
+        ):
+            story_steps.append(step)
 
         # if exclusion percentage is not 100
         if exclusion_percentage and exclusion_percentage is not 100:
@@ -195,6 +208,45 @@ class StoryFileReader(object):
 
         return story_steps
 
+    @staticmethod
+    @async_generator
+    async def stream_from_folder(
+        resource_name,
+        domain,
+        interpreter=RegexInterpreter(),
+        template_variables=None,
+        use_e2e=False,
+    ):
+        """Given a path yields the story steps of all contained story files.
+
+        The files are parsed concurrently. The story steps of a file are
+        yielded as soon as it is parsed and all previous files were yielded."""
+        import rasa.nlu.utils as nlu_utils
+
+        if not os.path.exists(resource_name):
+            raise ValueError(
+                "Story file or folder could not be found. Make "
+                "sure '{}' exists and points to a story folder "
+                "or file.".format(os.path.abspath(resource_name))
+            )
+
+        parse_cache = {}
+        tasks = [
+            asyncio.ensure_future(
+                StoryFileReader.read_from_file(
+                    f, domain, interpreter, template_variables, use_e2e, parse_cache
+                )
+            )
+            for f in nlu_utils.list_files(resource_name)
+        ]
+        try:
+            for task in tasks:
+                for step in await task:
+                    await yield_(step)
+        finally:
+            for task in tasks:
+                task.cancel()
+
     @staticmethod
     async def read_from_file(
         filename,
@@ -202,13 +254,16 @@ class StoryFileReader(object):
         interpreter=RegexInterpreter(),
         template_variables=None,
         use_e2e=False,
+        parse_cache=None,
     ):
         """Given a md file reads the contained stories."""
 
         try:
             with open(filename, "r", encoding="utf-8") as f:
                 lines = f.readlines()
-            reader = StoryFileReader(domain, interpreter, template_variables, use_e2e)
+            reader = StoryFileReader(
+                domain, interpreter, template_variables, use_e2e, parse_cache
+            )
             return await reader.process_lines(lines)
         except ValueError as err:
             file_info = "Invalid story file format. Failed to parse '{}'".format(
@@ -252,7 +307,7 @@ class StoryFileReader(object):
         """Tries to parse a single line as an event with arguments."""
 
         # the regex matches "slot{"a": 1}"
-        m = re.search("^([^{]+)([{].+)?", line)
+        m = EVENT_LINE_REGEX.search(line)
         if m is not None:
             event_name = m.group(1).strip()
             slots_str = m.group(2)
@@ -266,10 +321,19 @@ class StoryFileReader(object):
 
     async def process_lines(self, lines: List[AnyStr]) -> List[StoryStep]:
 
-        for idx, line in enumerate(lines):
-            line_num = idx + 1
+        cleaned_lines = []
+        for line_num, line in enumerate(lines, 1):
+            try:
+                cleaned_lines.append(
+                    self._replace_template_variables(self._clean_up_line(line))
+                )
+            except Exception as e:
+                raise self._line_error(line_num, e)
+
+        await self._parse_user_messages(cleaned_lines)
+
+        for line_num, line in enumerate(cleaned_lines, 1):
             try:
-                line = self._replace_template_variables(self._clean_up_line(line))
                 if line.strip() == "":
                     continue
                 elif line.startswith("#"):
@@ -280,7 +344,7 @@ class StoryFileReader(object):
                     # reached a checkpoint
                     name, conditions = self._parse_event_line(line[1:].strip())
                     self.add_checkpoint(name, conditions)
-                elif re.match(r"^[*\-]\s+{}".format(FORM_PREFIX), line):
+                elif FORM_LINE_REGEX.match(line):
                     logger.debug(
                         "Skipping line {}, "
                         "because it was generated by "
@@ -292,7 +356,7 @@ class StoryFileReader(object):
                     self.add_event(event_name, parameters)
                 elif line.startswith("*"):
                     # reached a user message
-                    user_messages = [el.strip() for el in line[1:].split(" OR ")]
+                    user_messages = self._user_messages(line)
                     if self.use_e2e:
                         await self.add_e2e_messages(user_messages, line_num)
                     else:
@@ -306,12 +370,57 @@ class StoryFileReader(object):
                         "".format(line_num, line)
                     )
             except Exception as e:
-                msg = "Error in line {}: {}".format(line_num, e)
-                logger.error(msg, exc_info=1)
-                raise ValueError(msg)
+                raise self._line_error(line_num, e)
         self._add_current_stories_to_result()
         return self.story_steps
 
+    @staticmethod
+    def _line_error(line_num: int, e: Exception) -> ValueError:
+        msg = "Error in line {}: {}".format(line_num, e)
+        logger.error(msg, exc_info=1)
+        return ValueError(msg)
+
+    @staticmethod
+    def _user_messages(line: Text) -> List[Text]:
+        return [el.strip() for el in line[1:].split(" OR ")]
+
+    def _interpreter_for(self, text: Text) -> NaturalLanguageInterpreter:
+        if text.startswith(INTENT_MESSAGE_PREFIX):
+            return REGEX_INTERPRETER
+        else:
+            return self.interpreter
+
+    async def _parse_user_messages(self, lines: List[Text]) -> None:
+        """Parses the user messages of all lines which are not cached yet.
+
+        Instead of calling the interpreter for every single message, all
+        messages are passed to it at once."""
+
+        texts = []
+        for line_num, line in enumerate(lines, 1):
+            if not line.startswith("*") or FORM_LINE_REGEX.match(line):
+                continue
+            for m in self._user_messages(line):
+                if self.use_e2e:
+                    try:
+                        message = self.e2e_reader._parse_item(m)
+                    except Exception as e:
+                        raise self._line_error(line_num, e)
+                    self.e2e_messages[m] = message
+                    m = message.text
+                if m not in self.parse_cache:
+                    texts.append(m)
+
+        texts = list(set(texts))
+        regex_texts = [t for t in texts if t.startswith(INTENT_MESSAGE_PREFIX)]
+        nlu_texts = [t for t in texts if not t.startswith(INTENT_MESSAGE_PREFIX)]
+        regex_results, nlu_results = await asyncio.gather(
+            REGEX_INTERPRETER.parse_batch(regex_texts),
+            self.interpreter.parse_batch(nlu_texts),
+        )
+        self.parse_cache.update(zip(regex_texts, regex_results))
+        self.parse_cache.update(zip(nlu_texts, nlu_results))
+
     def _replace_template_variables(self, line):
         def process_match(matchobject):
             varname = matchobject.group(1)
@@ -324,14 +433,13 @@ class StoryFileReader(object):
                     "".format(var=varname, line=line)
                 )
 
-        template_rx = re.compile(r"`([^`]+)`")
-        return template_rx.sub(process_match, line)
+        return TEMPLATE_VARIABLE_REGEX.sub(process_match, line)
 
     @staticmethod
     def _clean_up_line(line: Text) -> Text:
         """Removes comments and trailing spaces"""
 
-        return re.sub(r"<!--.*?-->", "", line).strip()
+        return COMMENT_REGEX.sub("", line).strip()
 
     def _add_current_stories_to_result(self):
         if self.current_step_builder:
@@ -354,10 +462,13 @@ class StoryFileReader(object):
         self.current_step_builder.add_checkpoint(name, conditions)
 
     async def _parse_message(self, message, line_num):
-        if message.startswith(INTENT_MESSAGE_PREFIX):
-            parse_data = await RegexInterpreter().parse(message)
-        else:
-            parse_data = await self.interpreter.parse(message)
+        parse_data = self.parse_cache.get(message)
+        if parse_data is None:
+            parse_data = await self._interpreter_for(message).parse(message)
+            self.parse_cache[message] = parse_data
+        # the parse data is shared by all occurrences of the message, copy it
+        # so that e.g. the end-to-end annotations are only added to this one
+        parse_data = dict(parse_data)
         utterance = UserUttered(
             message, parse_data.get("intent"), parse_data.get("entities"), parse_data
         )
@@ -377,9 +488,11 @@ class StoryFileReader(object):
                 "User message '{}' at invalid location. "
                 "Expected story start.".format(messages)
             )
-        parsed_messages = await asyncio.gather(
-            *[self._parse_message(m, line_num) for m in messages]
-        )
+        # the messages were usually parsed in advance by `_parse_user_messages`,
+        # hence they are not gathered to avoid scheduling a task per message
+        parsed_messages = []
+        for m in messages:
+            parsed_messages.append(await self._parse_message(m, line_num))
         self.current_step_builder.add_user_messages(parsed_messages)
 
     async def add_e2e_messages(self, e2e_messages, line_num):
@@ -389,10 +502,9 @@ class StoryFileReader(object):
                 "location. Expected story start."
                 "".format(e2e_messages)
             )
-        e2e_reader = EndToEndReader()
         parsed_messages = []
         for m in e2e_messages:
-            message = e2e_reader._parse_item(m)
+            message = self.e2e_messages.get(m) or self.e2e_reader._parse_item(m)
             parsed = await self._parse_message(message.text, line_num)
 
             parsed.parse_data["true_intent"] = message.data["true_intent"]
@@ -407,9 +519,16 @@ class StoryFileReader(object):
         if "name" not in parameters and event_name != SlotSet.type_name:
             parameters["name"] = event_name
 
-        parsed_events = Event.from_story_string(
-            event_name, parameters, default=ActionExecuted
-        )
+        if event_name not in self.event_types:
+            self.event_types[event_name] = Event.resolve_by_type(
+                event_name, default=ActionExecuted
+            )
+        event_type = self.event_types[event_name]
+        if event_type is not None:
+            parsed_events = event_type._from_story_string(parameters)
+        else:
+            parsed_events = None
+
         if parsed_events is None:
             raise StoryParseError(
                 "Unknown event '{}'. It is Neither an event "
@@ -85,18 +85,19 @@ class TrackerWithCachedStates(DialogueStateTracker):
     def copy(self, sender_id: Text = "") -> "TrackerWithCachedStates":
         """Creates a duplicate of this tracker.
 
-        A new tracker will be created and all events
-        will be replayed."""
+        Instead of replaying all events, the event history, the cached
+        states and the tracker state derived from the events are copied.
+        Events are immutable, so both trackers share them."""
 
         # This is an optimization, we could use the original copy, but
         # the states would be lost and we would need to recalculate them
 
-        tracker = self.init_copy()
+        tracker = copy.copy(self)
         tracker.sender_id = sender_id
 
-        for event in self.events:
-            tracker.update(event, skip_states=True)
-
+        tracker.events = deque(self.events, self._max_event_history)
+        tracker.slots = {name: copy.copy(slot) for name, slot in self.slots.items()}
+        tracker.active_form = dict(self.active_form)
         tracker._states = copy.copy(self._states)
 
         return tracker  # yields the final state
@@ -154,19 +155,25 @@ class TrainingDataGenerator(object):
         tracker_limit: Optional[int] = None,
         use_story_concatenation: bool = True,
         debug_plots: bool = False,
+        worker_processes: int = 1,
     ):
         """Given a set of story parts, generates all stories that are possible.
 
         The different story parts can end and start with checkpoints
         and this generator will match start and end checkpoints to
         connect complete stories. Afterwards, duplicate stories will be
-        removed and the data is augmented (if augmentation is enabled)."""
+        removed and the data is augmented (if augmentation is enabled).
+
+        If `worker_processes` is larger than one, the stories of parts of
+        the graph which do not share any checkpoints are generated in
+        separate processes."""
 
         self.story_graph = story_graph.with_cycles_removed()
         if debug_plots:
             self.story_graph.visualize("story_blocks_connections.html")
 
         self.domain = domain
+        self.worker_processes = worker_processes
 
         # 10x factor is a heuristic for augmentation rounds
         max_number_of_augmented_trackers = augmentation_factor * 10
@@ -200,6 +207,113 @@ class TrainingDataGenerator(object):
 
         self._mark_first_action_in_story_steps_as_unpredictable()
 
+        shards = self._shards() if self.worker_processes > 1 else []
+        if len(shards) > 1:
+            generated = self._generate_in_parallel(shards, silent)
+        else:
+            finished, deduplicated, story_ends, unused = self._generate(silent=silent)
+            generated = finished + deduplicated, story_ends, unused
+
+        return self._augment(*generated, silent=silent)
+
+    def _shards(self) -> List[Set[Text]]:
+        """Split the story steps into one shard per worker process.
+
+        The parts of the story graph which do not share any checkpoints
+        are distributed over the shards, the largest parts first."""
+
+        components = self.story_graph.connected_components()
+        components.sort(key=lambda c: len(c.story_steps), reverse=True)
+
+        shards = [set() for _ in range(min(self.worker_processes, len(components)))]
+        for component in components:
+            smallest = min(shards, key=len)
+            smallest.update(step.id for step in component.story_steps)
+
+        return shards
+
+    def _generate_in_parallel(
+        self, shards: List[Set[Text]], silent: bool = False
+    ) -> Tuple[
+        List[TrackerWithCachedStates], List[TrackerWithCachedStates], Set[Text]
+    ]:
+        """Run the data generation rounds of each shard in a worker process.
+
+        The trackers are deduplicated across the shards in the same way
+        as in a single process. Augmentation needs all story end trackers
+        and is done afterwards on the merged trackers."""
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        logger.debug(
+            "Generating trackers for {} shards of the story graph "
+            "using {} processes.".format(len(shards), self.worker_processes)
+        )
+
+        kwargs = dict(
+            remove_duplicates=self.config.remove_duplicates,
+            unique_last_num_states=self.config.unique_last_num_states,
+            tracker_limit=self.config.tracker_limit,
+            use_story_concatenation=self.config.use_story_concatenation,
+        )
+        arguments = [(self.story_graph, self.domain, s, kwargs) for s in shards]
+
+        with ProcessPoolExecutor(max_workers=self.worker_processes) as pool:
+            results = list(pool.map(_generate_shard, arguments))
+
+        finished_trackers = []
+        story_end_trackers = []
+        unused_checkpoints = set()  # type: Set[Text]
+        deduplicated_trackers = []
+        for finished, deduplicated, story_ends, unused, order in results:
+            for t in finished + deduplicated + story_ends:
+                # the trackers were pickled together with a copy of the domain
+                t.domain = self.domain
+
+            finished_trackers.extend(finished)
+            trackers = iter(deduplicated), iter(story_ends)
+            deduplicated_trackers.extend(
+                (position, next(trackers[position[-1]])) for position in order
+            )
+            unused_checkpoints.update(unused - {STORY_START})
+
+        if all(STORY_START in result[3] for result in results):
+            unused_checkpoints.add(STORY_START)
+
+        # hashes of the states differ between processes, hence the
+        # trackers which are deduplicated across all story steps are
+        # deduplicated again in the order of a single process
+        deduplicated_trackers.sort(key=lambda t: t[0])
+        for (_, _, is_story_end), tracker in deduplicated_trackers:
+            unique = self._remove_duplicate_story_end_trackers([tracker])
+            if is_story_end:
+                story_end_trackers.extend(unique)
+            else:
+                finished_trackers.extend(unique)
+
+        return finished_trackers, story_end_trackers, unused_checkpoints
+
+    def _generate(
+        self,
+        step_ids: Optional[Set[Text]] = None,
+        order: Optional[List[Tuple[int, int, bool]]] = None,
+        silent: bool = False,
+    ) -> Tuple[
+        List[TrackerWithCachedStates],
+        List[TrackerWithCachedStates],
+        List[TrackerWithCachedStates],
+        Set[Text],
+    ]:
+        """Run the data generation rounds.
+
+        Returns the finished trackers, the finished trackers which were
+        deduplicated across all story steps, the trackers which reached a
+        story end and the checkpoints which were never used. If `step_ids`
+        is given, only the story steps with these ids are processed. If
+        `order` is given, the round, the position of the story step and
+        whether it is a story end are appended to it for every tracker
+        which is deduplicated across all story steps."""
+
         active_trackers = defaultdict(list)
 
         init_tracker = TrackerWithCachedStates(
@@ -212,181 +326,153 @@ class TrainingDataGenerator(object):
 
         # trackers that are sent to a featurizer
         finished_trackers = []
+        # trackers which are unique in their states (but not in
+        # the last `unique_last_num_states` of them)
+        deduplicated_trackers = []
         # keep story end trackers separately for augmentation
         story_end_trackers = []
 
         phase = 0  # one phase is one traversal of all story steps.
-        min_num_aug_phases = 3 if self.config.augmentation_factor > 0 else 0
-        logger.debug("Number of augmentation rounds is {}".format(min_num_aug_phases))
 
         # placeholder to track gluing process of checkpoints
-        used_checkpoints = set()
-        previous_unused = set()
+        used_checkpoints = set()  # type: Set[Text]
+        previous_unused = set()  # type: Set[Text]
         everything_reachable_is_reached = False
 
         # we will continue generating data until we have reached all
         # checkpoints that seem to be reachable. This is a heuristic,
         # if we did not reach any new checkpoints in an iteration, we
         # assume we have reached all and stop.
-        while not everything_reachable_is_reached or phase < min_num_aug_phases:
+        while not everything_reachable_is_reached:
             phase_name = self._phase_name(everything_reachable_is_reached, phase)
 
-            num_active_trackers = self._count_trackers(active_trackers)
+            logger.debug(
+                "Starting {} ... (with {} trackers)"
+                "".format(phase_name, self._count_trackers(active_trackers))
+            )
 
-            if num_active_trackers:
-                logger.debug(
-                    "Starting {} ... (with {} trackers)"
-                    "".format(phase_name, num_active_trackers)
-                )
-            else:
-                logger.debug("There are no trackers for {}".format(phase_name))
-                break
+            unused_checkpoints = self._process_phase(
+                active_trackers,
+                used_checkpoints,
+                finished_trackers,
+                deduplicated_trackers,
+                story_end_trackers,
+                step_ids=step_ids,
+                phase=phase,
+                order=order,
+                silent=silent,
+            )
+
+            # prepare next round
+            phase += 1
 
-            # track unused checkpoints for this phase
-            unused_checkpoints = set()  # type: Set[Text]
+            # check if we reached all nodes that can be reached
+            # if we reached at least one more node this round
+            # than last one, we assume there is still
+            # something left to reach and we continue
 
-            pbar = tqdm(
-                self.story_graph.ordered_steps(),
-                desc="Processed Story Blocks",
-                disable=silent,
+            unused_checkpoints = self._add_unused_end_checkpoints(
+                set(active_trackers.keys()), unused_checkpoints, used_checkpoints
             )
-            for step in pbar:
-                incoming_trackers = []  # type: List[TrackerWithCachedStates]
-                for start in step.start_checkpoints:
-                    if active_trackers[start.name]:
-                        ts = start.filter_trackers(active_trackers[start.name])
-                        incoming_trackers.extend(ts)
-                        used_checkpoints.add(start.name)
-                    elif start.name not in used_checkpoints:
-                        # need to skip - there was no previous step that
-                        # had this start checkpoint as an end checkpoint
-                        # it will be processed in next phases
-                        unused_checkpoints.add(start.name)
-
-                if not incoming_trackers:
-                    # if there are no trackers,
-                    # we can skip the rest of the loop
-                    continue
-
-                # these are the trackers that reached this story
-                # step and that need to handle all events of the step
-
-                if self.config.remove_duplicates:
-                    incoming_trackers, end_trackers = self._remove_duplicate_trackers(
-                        incoming_trackers
-                    )
-                    # append end trackers to finished trackers
-                    finished_trackers.extend(end_trackers)
-
-                if everything_reachable_is_reached:
-                    # augmentation round
-                    incoming_trackers = self._subsample_trackers(
-                        incoming_trackers, self.config.max_number_of_augmented_trackers
-                    )
-
-                # update progress bar
-                pbar.set_postfix({"# trackers": "{:d}".format(len(incoming_trackers))})
-
-                trackers, end_trackers = self._process_step(step, incoming_trackers)
-                # add end trackers to finished trackers
-                finished_trackers.extend(end_trackers)
-
-                # update our tracker dictionary with the trackers
-                # that handled the events of the step and
-                # that can now be used for further story steps
-                # that start with the checkpoint this step ended with
-
-                for end in step.end_checkpoints:
-
-                    start_name = self._find_start_checkpoint_name(end.name)
-
-                    active_trackers[start_name].extend(trackers)
-
-                    if start_name in used_checkpoints:
-                        # add end checkpoint as unused
-                        # if this checkpoint was processed as
-                        # start one before
-                        unused_checkpoints.add(start_name)
-
-                if not step.end_checkpoints:
-                    unique_ends = self._remove_duplicate_story_end_trackers(trackers)
-                    story_end_trackers.extend(unique_ends)
-
-            num_finished = len(finished_trackers) + len(story_end_trackers)
-            logger.debug(
-                "Finished phase ({} training samples found).".format(num_finished)
+            active_trackers = self._filter_active_trackers(
+                active_trackers, unused_checkpoints
             )
+            num_active_trackers = self._count_trackers(active_trackers)
 
-            # prepare next round
-            phase += 1
+            everything_reachable_is_reached = (
+                unused_checkpoints == previous_unused or num_active_trackers == 0
+            )
+            previous_unused = unused_checkpoints
+
+            if everything_reachable_is_reached:
+                # should happen only once
 
-            if not everything_reachable_is_reached:
-                # check if we reached all nodes that can be reached
-                # if we reached at least one more node this round
-                # than last one, we assume there is still
-                # something left to reach and we continue
+                previous_unused -= used_checkpoints
+                # add trackers with unused checkpoints
+                # to finished trackers
+                for start_name in previous_unused:
+                    finished_trackers.extend(active_trackers[start_name])
 
-                unused_checkpoints = self._add_unused_end_checkpoints(
-                    set(active_trackers.keys()), unused_checkpoints, used_checkpoints
+                logger.debug("Data generation rounds finished.")
+                logger.debug("Found {} unused checkpoints".format(len(previous_unused)))
+            else:
+                logger.debug(
+                    "Found {} unused checkpoints "
+                    "in current phase."
+                    "".format(len(unused_checkpoints))
                 )
-                active_trackers = self._filter_active_trackers(
-                    active_trackers, unused_checkpoints
+                logger.debug(
+                    "Found {} active trackers "
+                    "for these checkpoints."
+                    "".format(num_active_trackers)
                 )
-                num_active_trackers = self._count_trackers(active_trackers)
 
-                everything_reachable_is_reached = (
-                    unused_checkpoints == previous_unused or num_active_trackers == 0
-                )
-                previous_unused = unused_checkpoints
-
-                if everything_reachable_is_reached:
-                    # should happen only once
-
-                    previous_unused -= used_checkpoints
-                    # add trackers with unused checkpoints
-                    # to finished trackers
-                    for start_name in previous_unused:
-                        finished_trackers.extend(active_trackers[start_name])
-
-                    logger.debug("Data generation rounds finished.")
-                    logger.debug(
-                        "Found {} unused checkpoints".format(len(previous_unused))
-                    )
-                    phase = 0
-                else:
-                    logger.debug(
-                        "Found {} unused checkpoints "
-                        "in current phase."
-                        "".format(len(unused_checkpoints))
-                    )
-                    logger.debug(
-                        "Found {} active trackers "
-                        "for these checkpoints."
-                        "".format(num_active_trackers)
-                    )
+        return (
+            finished_trackers,
+            deduplicated_trackers,
+            story_end_trackers,
+            previous_unused,
+        )
 
-            if everything_reachable_is_reached:
-                # augmentation round, so we process only
-                # story end checkpoints
-                # reset used checkpoints
-                used_checkpoints = set()  # type: Set[Text]
-
-                # generate active trackers for augmentation
-                active_trackers = self._create_start_trackers_for_augmentation(
-                    story_end_trackers
+    def _augment(
+        self,
+        finished_trackers: List[TrackerWithCachedStates],
+        story_end_trackers: List[TrackerWithCachedStates],
+        unused_checkpoints: Set[Text],
+        silent: bool = False,
+    ) -> List[TrackerWithCachedStates]:
+        """Run the augmentation rounds and collect all training trackers."""
+
+        # the order of the generated trackers depends on the order of the
+        # story steps, which is not stable. Sorting them makes the sampled
+        # augmentation independent of it.
+        story_end_trackers = sorted(story_end_trackers, key=self._sort_key)
+
+        min_num_aug_phases = 3 if self.config.augmentation_factor > 0 else 0
+        logger.debug("Number of augmentation rounds is {}".format(min_num_aug_phases))
+
+        for phase in range(min_num_aug_phases):
+            phase_name = self._phase_name(True, phase)
+
+            # augmentation round, so we process only
+            # story end checkpoints
+            active_trackers = self._create_start_trackers_for_augmentation(
+                story_end_trackers
+            )
+            num_active_trackers = self._count_trackers(active_trackers)
+
+            if num_active_trackers:
+                logger.debug(
+                    "Starting {} ... (with {} trackers)"
+                    "".format(phase_name, num_active_trackers)
                 )
+            else:
+                logger.debug("There are no trackers for {}".format(phase_name))
+                break
+
+            self._process_phase(
+                active_trackers,
+                set(),
+                finished_trackers,
+                finished_trackers,
+                story_end_trackers,
+                augmentation=True,
+                silent=silent,
+            )
 
         finished_trackers.extend(story_end_trackers)
-        self._issue_unused_checkpoint_notification(previous_unused)
+        self._issue_unused_checkpoint_notification(unused_checkpoints)
         logger.debug("Found {} training trackers.".format(len(finished_trackers)))
 
+        augmented_trackers, original_trackers = [], []
+        for t in finished_trackers:
+            if t.is_augmented:
+                augmented_trackers.append(t)
+            else:
+                original_trackers.append(t)
+        original_trackers.sort(key=self._sort_key)
+
         if self.config.augmentation_factor > 0:
-            augmented_trackers, original_trackers = [], []
-            for t in finished_trackers:
-                if t.is_augmented:
-                    augmented_trackers.append(t)
-                else:
-                    original_trackers.append(t)
             augmented_trackers = self._subsample_trackers(
                 augmented_trackers, self.config.max_number_of_augmented_trackers
             )
@@ -397,9 +483,114 @@ class TrainingDataGenerator(object):
             logger.debug(
                 "There are {} original trackers.".format(len(original_trackers))
             )
-            finished_trackers = original_trackers + augmented_trackers
 
-        return finished_trackers
+        return original_trackers + augmented_trackers
+
+    def _process_phase(
+        self,
+        active_trackers: TrackerLookupDict,
+        used_checkpoints: Set[Text],
+        finished_trackers: List[TrackerWithCachedStates],
+        deduplicated_trackers: List[TrackerWithCachedStates],
+        story_end_trackers: List[TrackerWithCachedStates],
+        augmentation: bool = False,
+        step_ids: Optional[Set[Text]] = None,
+        phase: int = 0,
+        order: Optional[List[Tuple[int, int, bool]]] = None,
+        silent: bool = False,
+    ) -> Set[Text]:
+        """Traverse all story steps once and return the unused checkpoints."""
+
+        # track unused checkpoints for this phase
+        unused_checkpoints = set()  # type: Set[Text]
+
+        pbar = tqdm(
+            self.story_graph.ordered_steps(),
+            desc="Processed Story Blocks",
+            disable=silent,
+        )
+        for position, step in enumerate(pbar):
+            if step_ids is not None and step.id not in step_ids:
+                continue
+
+            incoming_trackers = []  # type: List[TrackerWithCachedStates]
+            for start in step.start_checkpoints:
+                if active_trackers[start.name]:
+                    ts = start.filter_trackers(active_trackers[start.name])
+                    incoming_trackers.extend(ts)
+                    used_checkpoints.add(start.name)
+                elif start.name not in used_checkpoints:
+                    # need to skip - there was no previous step that
+                    # had this start checkpoint as an end checkpoint
+                    # it will be processed in next phases
+                    unused_checkpoints.add(start.name)
+
+            if not incoming_trackers:
+                # if there are no trackers,
+                # we can skip the rest of the loop
+                continue
+
+            # these are the trackers that reached this story
+            # step and that need to handle all events of the step
+
+            if self.config.remove_duplicates:
+                incoming_trackers, end_trackers = self._remove_duplicate_trackers(
+                    incoming_trackers
+                )
+                # append end trackers to finished trackers
+                deduplicated_trackers.extend(end_trackers)
+                if order is not None:
+                    order.extend([(phase, position, False)] * len(end_trackers))
+
+            if augmentation:
+                incoming_trackers = self._subsample_trackers(
+                    incoming_trackers, self.config.max_number_of_augmented_trackers
+                )
+
+            # update progress bar
+            pbar.set_postfix({"# trackers": "{:d}".format(len(incoming_trackers))})
+
+            trackers, end_trackers = self._process_step(step, incoming_trackers)
+            # add end trackers to finished trackers
+            finished_trackers.extend(end_trackers)
+
+            # update our tracker dictionary with the trackers
+            # that handled the events of the step and
+            # that can now be used for further story steps
+            # that start with the checkpoint this step ended with
+
+            for end in step.end_checkpoints:
+
+                start_name = self._find_start_checkpoint_name(end.name)
+
+                active_trackers[start_name].extend(trackers)
+
+                if start_name in used_checkpoints:
+                    # add end checkpoint as unused
+                    # if this checkpoint was processed as
+                    # start one before
+                    unused_checkpoints.add(start_name)
+
+            if not step.end_checkpoints:
+                unique_ends = self._remove_duplicate_story_end_trackers(trackers)
+                story_end_trackers.extend(unique_ends)
+                if order is not None:
+                    order.extend([(phase, position, True)] * len(unique_ends))
+
+        num_finished = len(finished_trackers) + len(story_end_trackers)
+        if deduplicated_trackers is not finished_trackers:
+            num_finished += len(deduplicated_trackers)
+        logger.debug("Finished phase ({} training samples found).".format(num_finished))
+
+        return unused_checkpoints
+
+    def _sort_key(self, tracker: TrackerWithCachedStates) -> Tuple:
+        """Order trackers by their states, independent of the step order."""
+
+        states = tuple(
+            tuple(sorted(state)) for state in tracker.past_states(self.domain)
+        )
+        return states, tracker.sender_id
 
     @staticmethod
     def _count_trackers(active_trackers: TrackerLookupDict) -> int:
@@ -700,3 +891,26 @@ class TrainingDataGenerator(object):
                     "story blocks that start "
                     "with this checkpoint.".format(cp, block_name)
                 )
+
+
+def _generate_shard(
+    arguments: Tuple[StoryGraph, Domain, Set[Text], Dict]
+) -> Tuple[
+    List[TrackerWithCachedStates],
+    List[TrackerWithCachedStates],
+    List[TrackerWithCachedStates],
+    Set[Text],
+    List[Tuple[int, int, bool]],
+]:
+    """Run the data generation rounds for the story steps of a shard.
+
+    Module level function, so that it can be run in a worker process."""
+
+    story_graph, domain, step_ids, kwargs = arguments
+    generator = TrainingDataGenerator(story_graph, domain, **kwargs)
+    # the graph has no cycles anymore, keep the step order of the parent
+    generator.story_graph = story_graph
+
+    order = []
+    generated = generator._generate(step_ids, order, silent=True)
+    return generated + (order,)
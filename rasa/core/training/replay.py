@@ -0,0 +1,105 @@
+import logging
+import os
+import random
+import typing
+from typing import Any, Dict, List, Optional, Text
+
+from rasa.core import utils
+
+if typing.TYPE_CHECKING:
+    from rasa.core.domain import Domain
+    from rasa.core.trackers import DialogueStateTracker
+
+logger = logging.getLogger(__name__)
+
+REPLAY_BUFFER_FILE = "replay_buffer.json"
+
+DEFAULT_REPLAY_BUFFER_SIZE = 500
+
+
+class ReplayBuffer(object):
+    """Bounded sample of the dialogues a policy ensemble was trained on.
+
+    Continued trainings mix the new dialogues with dialogues from the
+    buffer, so the policies don't forget what they learned before, without
+    having to load the original training data.
+
+    The buffer is a reservoir sample: every dialogue which was added has
+    the same chance to be in the buffer, regardless of when it was added."""
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_REPLAY_BUFFER_SIZE,
+        dialogues: Optional[List[Dict[Text, Any]]] = None,
+        num_seen: int = 0,
+    ) -> None:
+        self.max_size = max_size
+        self.dialogues = dialogues or []
+        # number of dialogues which were ever added
+        self.num_seen = max(num_seen, len(self.dialogues))
+        # seeded trainings depend on the global random state
+        self._random = random.Random()
+
+    def __len__(self) -> int:
+        return len(self.dialogues)
+
+    def add(self, trackers: List["DialogueStateTracker"]) -> None:
+        """Adds the dialogues of `trackers`, augmented ones are skipped."""
+
+        for tracker in trackers:
+            if getattr(tracker, "is_augmented", False):
+                continue
+
+            self.num_seen += 1
+            if len(self.dialogues) < self.max_size:
+                self.dialogues.append(self._as_dialogue(tracker))
+            else:
+                i = self._random.randrange(self.num_seen)
+                # only dialogues which are kept are serialized
+                if i < self.max_size:
+                    self.dialogues[i] = self._as_dialogue(tracker)
+
+    @staticmethod
+    def _as_dialogue(tracker: "DialogueStateTracker") -> Dict[Text, Any]:
+        return {
+            "sender_id": tracker.sender_id,
+            "events": [e.as_dict() for e in tracker.events],
+        }
+
+    def trackers(self, domain: "Domain") -> List["DialogueStateTracker"]:
+        """Recreates the trackers of the dialogues in the buffer."""
+        from rasa.core.trackers import DialogueStateTracker
+
+        return [
+            DialogueStateTracker.from_dict(
+                dialogue["sender_id"], dialogue["events"], domain.slots
+            )
+            for dialogue in self.dialogues
+        ]
+
+    def persist(self, path: Text) -> None:
+        utils.dump_obj_as_json_to_file(
+            os.path.join(path, REPLAY_BUFFER_FILE),
+            {
+                "max_size": self.max_size,
+                "num_seen": self.num_seen,
+                "dialogues": self.dialogues,
+            },
+        )
+
+    @classmethod
+    def load(cls, path: Text) -> "ReplayBuffer":
+        """Loads the buffer persisted in `path`.
+
+        Returns an empty buffer for models which were persisted without one."""
+
+        buffer_file = os.path.join(path, REPLAY_BUFFER_FILE)
+        if not os.path.isfile(buffer_file):
+            logger.debug(
+                "No replay buffer found in '{}', continued trainings will "
+                "only use the new dialogues.".format(path)
+            )
+            return cls()
+
+        data = utils.read_json_file(buffer_file)
+        return cls(data["max_size"], data["dialogues"], data["num_seen"])
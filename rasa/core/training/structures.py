@@ -2,7 +2,7 @@ import json
 import logging
 import sys
 import uuid
-from collections import deque, defaultdict
+from collections import deque, defaultdict, OrderedDict
 from typing import List, Text, Dict, Optional, Tuple, Any, Set, ValuesView
 
 from rasa.core import utils
@@ -428,6 +428,45 @@ class StoryGraph(object):
 
         return {cp.name for cp in cps} & {cp.name for cp in other_cps}
 
+    def connected_components(self) -> List["StoryGraph"]:
+        """Split the graph into graphs which do not share any checkpoints.
+
+        Every story starts at the conversation start, hence `STORY_START`
+        does not connect the steps. The components are ordered by the
+        position of their first step in this graph."""
+
+        parents = {s.id: s.id for s in self.story_steps}
+
+        def find(step_id):
+            while parents[step_id] != step_id:
+                parents[step_id] = parents[parents[step_id]]
+                step_id = parents[step_id]
+            return step_id
+
+        steps_by_checkpoint = defaultdict(list)
+        for step in self.story_steps:
+            for start in step.start_checkpoints:
+                steps_by_checkpoint[start.name].append(step.id)
+            for end in step.end_checkpoints:
+                name = self.story_end_checkpoints.get(end.name, end.name)
+                steps_by_checkpoint[name].append(step.id)
+
+        for name, step_ids in steps_by_checkpoint.items():
+            if name == STORY_START:
+                continue
+            root = find(step_ids[0])
+            for step_id in step_ids[1:]:
+                parents[find(step_id)] = root
+
+        components = OrderedDict()
+        for step in self.story_steps:
+            components.setdefault(find(step.id), []).append(step)
+
+        return [
+            StoryGraph(steps, self.story_end_checkpoints)
+            for steps in components.values()
+        ]
+
     def with_cycles_removed(self) -> "StoryGraph":
         """Create a graph with the cyclic edges removed from this graph."""
 
@@ -1,5 +1,7 @@
-from collections import defaultdict, deque
+from collections import defaultdict
 
+import itertools
+import logging
 import random
 import re
 from typing import Any, Text, List, Dict, Optional, TYPE_CHECKING
@@ -15,6 +17,8 @@ if TYPE_CHECKING:
     from rasa.nlu.training_data import TrainingData, Message
     import networkx
 
+logger = logging.getLogger(__name__)
+
 EDGE_NONE_LABEL = "NONE"
 
 START_NODE_ID = 0
@@ -71,46 +75,44 @@ class UserMessageGenerator(object):
         return structured_info.get("text")
 
 
-def _fingerprint_node(graph, node, max_history):
-    """Fingerprint a node in a graph.
+def _fingerprint_nodes(graph, nodes, max_history):
+    """Fingerprint the nodes in a graph.
 
     Can be used to identify nodes that are similar and can be merged within the
     graph.
-    Generates all paths starting at `node` following the directed graph up to
-    the length of `max_history`, and returns a set of strings describing the
-    found paths. If the fingerprint creation for two nodes results in the same
-    sets these nodes are indistinguishable if we walk along the path and only
-    remember max history number of nodes we have visited. Hence, if we randomly
-    walk on our directed graph, always only remembering the last `max_history`
-    nodes we have visited, we can never remember if we have visited node A or
-    node B if both have the same fingerprint. """
-
-    # the candidate list contains all node paths that haven't been
-    # extended till `max_history` length yet.
-    candidates = deque()
-    candidates.append([node])
-    continuations = []
-    while len(candidates) > 0:
-        candidate = candidates.pop()
-        last = candidate[-1]
-        empty = True
-        for _, succ_node in graph.out_edges(last):
-            next_candidate = candidate[:]
-            next_candidate.append(succ_node)
-            # if the path is already long enough, we add it to the results,
-            # otherwise we add it to the candidates
-            # that we still need to visit
-            if len(next_candidate) == max_history:
-                continuations.append(next_candidate)
+    Generates all paths starting at a node following the directed graph up to
+    the length of `max_history`, and returns a set of label sequences
+    describing the found paths. If the fingerprint creation for two nodes
+    results in the same sets these nodes are indistinguishable if we walk along
+    the path and only remember max history number of nodes we have visited.
+    Hence, if we randomly walk on our directed graph, always only remembering
+    the last `max_history` nodes we have visited, we can never remember if we
+    have visited node A or node B if both have the same fingerprint.
+
+    The paths of a node are the paths of its successors prefixed with the
+    node, hence the paths starting at each node are only generated once per
+    path length and shared by all nodes which lead to it."""
+
+    paths = {}
+
+    def _paths(node, length):
+        if (node, length) not in paths:
+            label = graph.nodes[node]["label"]
+            successors = set(graph.successors(node))
+            if not successors:
+                found = {(label,)}
+            elif length + 1 >= max_history:
+                found = {(label, graph.nodes[s]["label"]) for s in successors}
             else:
-                candidates.append(next_candidate)
-            empty = False
-        if empty:
-            continuations.append(candidate)
-    return {
-        " - ".join([graph.node[node]["label"] for node in continuation])
-        for continuation in continuations
-    }
+                found = {
+                    (label,) + path
+                    for s in successors
+                    for path in _paths(s, length + 1)
+                }
+            paths[(node, length)] = frozenset(found)
+        return paths[(node, length)]
+
+    return {node: _paths(node, 1) for node in nodes}
 
 
 def _incoming_edges(graph, node):
@@ -144,13 +146,88 @@ def _outgoing_edges_are_similar(graph, node_a, node_b):
 
 def _nodes_are_equivalent(graph, node_a, node_b, max_history):
     """Decides if two nodes are equivalent based on their fingerprints."""
-    return graph.node[node_a]["label"] == graph.node[node_b]["label"] and (
-        _outgoing_edges_are_similar(graph, node_a, node_b)
-        or _incoming_edges(graph, node_a) == _incoming_edges(graph, node_b)
-        or _fingerprint_node(graph, node_a, max_history)
-        == _fingerprint_node(graph, node_b, max_history)
+
+    if graph.nodes[node_a]["label"] != graph.nodes[node_b]["label"]:
+        return False
+    if _outgoing_edges_are_similar(graph, node_a, node_b):
+        return True
+    if _incoming_edges(graph, node_a) == _incoming_edges(graph, node_b):
+        return True
+
+    fingerprints = _fingerprint_nodes(graph, [node_a, node_b], max_history)
+    return fingerprints[node_a] == fingerprints[node_b]
+
+
+def _node_properties(graph, node, fingerprint):
+    """Properties of a node which make it equivalent to nodes with the same
+    label and the same property.
+
+    Nodes with the same incoming edges, the same outgoing edges (it doesn't
+    matter if you are in one or the other as the outgoing edges will lead you
+    to the same nodes anyways) or the same fingerprint are equivalent. A node
+    without outgoing edges is equivalent to any node with the same label."""
+
+    label = graph.nodes[node]["label"]
+    outgoing = frozenset(
+        (target, k) for target, k in _outgoing_edges(graph, node) if target != node
     )
 
+    properties = [
+        ("incoming", label, frozenset(_incoming_edges(graph, node))),
+        ("fingerprint", label, fingerprint),
+        ("outgoing", label, outgoing) if outgoing else ("no outgoing", label),
+    ]
+    return properties, not outgoing
+
+
+def _equivalence_candidates(graph, max_history):
+    """Finds the pairs of nodes of the graph which might be equivalent.
+
+    Instead of comparing all pairs of nodes, the nodes are bucketed by their
+    properties (see `_node_properties`), a node is only compared with the
+    nodes which share a bucket with it and with its neighbours of the same
+    label (the edges between two nodes are ignored when comparing their
+    outgoing edges).
+
+    The buckets reflect the graph at the time of the call. Merging nodes
+    changes their properties, hence the pairs have to be checked against
+    the changed graph.
+
+    Yields:
+        Pairs of nodes `(i, j)` with `i < j`, sorted by the node ids.
+    """
+
+    nodes = sorted(n for n in graph.nodes() if n > 0)
+    fingerprints = _fingerprint_nodes(graph, nodes, max_history)
+
+    buckets = defaultdict(list)
+    lookups = {}
+    for n in nodes:
+        properties, has_no_outgoing_edges = _node_properties(
+            graph, n, fingerprints[n]
+        )
+        label = graph.nodes[n]["label"]
+        for p in properties + [("label", label)]:
+            buckets[p].append(n)
+
+        lookups[n] = properties + [("no outgoing", label)]
+        if has_no_outgoing_edges:
+            lookups[n].append(("label", label))
+
+    for n in nodes:
+        if not graph.has_node(n):
+            continue
+
+        label = graph.nodes[n]["label"]
+        candidates = {m for p in lookups[n] for m in buckets[p] if m > n}
+        candidates.update(
+            m
+            for m in itertools.chain(graph.successors(n), graph.predecessors(n))
+            if m > n and graph.nodes[m]["label"] == label
+        )
+        for m in sorted(candidates):
+            yield n, m
+
 
 def _add_edge(graph, u, v, key, label=None, **kwargs):
     """Adds an edge to the graph if the edge is not already present. Uses the
@@ -189,6 +266,29 @@ def _transfer_style(source, target):
     return target
 
 
+def _merge_nodes(graph, i, j):
+    """Merges node `j` into node `i`."""
+
+    # make sure we keep special styles
+    _transfer_style(graph.nodes[j], graph.nodes[i])
+
+    # moves all outgoing edges to the other node
+    j_outgoing_edges = list(graph.out_edges(j, keys=True, data=True))
+    for _, succ_node, k, d in j_outgoing_edges:
+        _add_edge(
+            graph, i, succ_node, k, d.get("label"), **{"class": d.get("class", "")}
+        )
+        graph.remove_edge(j, succ_node)
+    # moves all incoming edges to the other node
+    j_incoming_edges = list(graph.in_edges(j, keys=True, data=True))
+    for prev_node, _, k, d in j_incoming_edges:
+        _add_edge(
+            graph, prev_node, i, k, d.get("label"), **{"class": d.get("class", "")}
+        )
+        graph.remove_edge(prev_node, j)
+    graph.remove_node(j)
+
+
 def _merge_equivalent_nodes(graph, max_history):
     """Searches for equivalent nodes in the graph and merges them."""
 
@@ -198,47 +298,15 @@ def _merge_equivalent_nodes(graph, max_history):
     # the graph doesn't change anymore
     while changed:
         changed = False
-        remaining_node_ids = [n for n in graph.nodes() if n > 0]
-        for idx, i in enumerate(remaining_node_ids):
-            if graph.has_node(i):
-                # assumes node equivalence is cumulative
-                for j in remaining_node_ids[idx + 1 :]:
-                    if graph.has_node(j) and _nodes_are_equivalent(
-                        graph, i, j, max_history
-                    ):
-                        # make sure we keep special styles
-                        _transfer_style(
-                            graph.nodes(data=True)[j], graph.nodes(data=True)[i]
-                        )
-
-                        changed = True
-                        # moves all outgoing edges to the other node
-                        j_outgoing_edges = list(
-                            graph.out_edges(j, keys=True, data=True)
-                        )
-                        for _, succ_node, k, d in j_outgoing_edges:
-                            _add_edge(
-                                graph,
-                                i,
-                                succ_node,
-                                k,
-                                d.get("label"),
-                                **{"class": d.get("class", "")}
-                            )
-                            graph.remove_edge(j, succ_node)
-                        # moves all incoming edges to the other node
-                        j_incoming_edges = list(graph.in_edges(j, keys=True, data=True))
-                        for prev_node, _, k, d in j_incoming_edges:
-                            _add_edge(
-                                graph,
-                                prev_node,
-                                i,
-                                k,
-                                d.get("label"),
-                                **{"class": d.get("class", "")}
-                            )
-                            graph.remove_edge(prev_node, j)
-                        graph.remove_node(j)
+        for i, j in _equivalence_candidates(graph, max_history):
+            # compares the nodes as changed by the previous merges
+            if (
+                graph.has_node(i)
+                and graph.has_node(j)
+                and _nodes_are_equivalent(graph, i, j, max_history)
+            ):
+                _merge_nodes(graph, i, j)
+                changed = True
 
 
 async def _replace_edge_labels_with_nodes(
@@ -402,8 +470,12 @@ async def visualize_neighborhood(
     should_merge_nodes: bool = True,
     max_distance: int = 1,
     fontsize: int = 12,
+    max_nodes: Optional[int] = None,
 ):
-    """Given a set of event lists, visualizing the flows."""
+    """Given a set of event lists, visualizing the flows.
+
+    If `max_nodes` is set, no further event lists are added once the graph
+    has that many nodes."""
 
     graph = _create_graph(fontsize)
     _add_default_nodes(graph)
@@ -412,7 +484,15 @@ async def visualize_neighborhood(
     special_node_idx = -3
     path_ellipsis_ends = set()
 
-    for events in event_sequences:
+    for i, events in enumerate(event_sequences):
+        if max_nodes and graph.number_of_nodes() >= max_nodes:
+            logger.warning(
+                "The graph reached its maximum size of {} nodes, the last {} "
+                "of {} conversations are not visualized."
+                "".format(max_nodes, len(event_sequences) - i, len(event_sequences))
+            )
+            break
+
         if current and max_distance:
             prefix = _length_of_common_action_prefix(current, events)
         else:
@@ -530,6 +610,7 @@ async def visualize_stories(
     should_merge_nodes: bool = True,
     fontsize: int = 12,
     silent: bool = False,
+    max_nodes: Optional[int] = None,
 ):
     """Given a set of stories, generates a graph visualizing the flows in the
     stories.
@@ -557,7 +638,11 @@ async def visualize_stories(
     The training data parameter can be used to pass in a Rasa NLU training
     data instance. It will
     be used to replace the user messages from the story file with actual
-    messages from the training data."""
+    messages from the training data.
+
+    Large story files result in large graphs which take long to merge and
+    to render, `max_nodes` limits the number of nodes of the graph (before
+    merging)."""
 
     story_graph = StoryGraph(story_steps)
 
@@ -581,5 +666,6 @@ async def visualize_stories(
         should_merge_nodes,
         max_distance=1,
         fontsize=fontsize,
+        max_nodes=max_nodes,
     )
     return graph
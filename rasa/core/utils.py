@@ -512,8 +512,11 @@ class AvailableEndpoints(object):
             endpoint_file, endpoint_type="tracker_store"
         )
         event_broker = read_endpoint_config(endpoint_file, endpoint_type="event_broker")
+        reminder_store = read_endpoint_config(
+            endpoint_file, endpoint_type="reminder_store"
+        )
 
-        return cls(nlg, nlu, action, model, tracker_store, event_broker)
+        return cls(nlg, nlu, action, model, tracker_store, event_broker, reminder_store)
 
     def __init__(
         self,
@@ -523,6 +526,7 @@ class AvailableEndpoints(object):
         model=None,
         tracker_store=None,
         event_broker=None,
+        reminder_store=None,
     ):
         self.model = model
         self.action = action
@@ -530,6 +534,7 @@ class AvailableEndpoints(object):
         self.nlg = nlg
         self.tracker_store = tracker_store
         self.event_broker = event_broker
+        self.reminder_store = reminder_store
 
 
 # noinspection PyProtectedMember
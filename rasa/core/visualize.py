@@ -2,18 +2,18 @@ import argparse
 import asyncio
 import logging
 import os
-from typing import Text
+from typing import Optional, Text
 
 import rasa.utils.io
-import rasa.core.cli
-import rasa.core.cli.arguments
-import rasa.core.cli.train
 
 logger = logging.getLogger(__name__)
 
 
 def add_arguments(parser: argparse.ArgumentParser):
     """Parse all the command line arguments for the visualisation script."""
+    import rasa.core.cli.arguments
+    import rasa.core.cli.visualization
+
     rasa.core.cli.arguments.add_logging_option_arguments(parser)
     rasa.core.cli.visualization.add_visualization_arguments(parser)
     rasa.core.cli.arguments.add_config_arg(parser, nargs=1)
@@ -31,6 +31,7 @@ async def visualize(
     nlu_data_path: Text,
     output_path: Text,
     max_history: int,
+    max_nodes: Optional[int] = None,
 ):
     from rasa.core.agent import Agent
     from rasa.core import config
@@ -51,7 +52,11 @@ async def visualize(
 
     logger.info("Starting to visualize stories...")
     await agent.visualize(
-        stories_path, output_path, max_history, nlu_training_data=nlu_data_path
+        stories_path,
+        output_path,
+        max_history,
+        nlu_training_data=nlu_data_path,
+        max_nodes=max_nodes,
     )
 
     full_output_path = "file://{}".format(os.path.abspath(output_path))
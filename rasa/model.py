@@ -5,6 +5,8 @@ import os
 import shutil
 import tarfile
 import tempfile
+import time
+from collections import OrderedDict
 from typing import Text, Tuple, Union, Optional, List, Dict, Any
 
 from rasa.constants import DEFAULT_MODELS_PATH
@@ -22,6 +24,34 @@ FINGERPRINT_RASA_VERSION_KEY = "version"
 FINGERPRINT_STORIES_KEY = "stories"
 FINGERPRINT_NLU_DATA_KEY = "messages"
 FINGERPRINT_TRAINED_AT_KEY = "trained_at"
+FINGERPRINT_POLICIES_KEY = "policies"
+FINGERPRINT_NLU_COMPONENTS_KEY = "nlu_components"
+
+# file extensions of the supported model archive formats
+ARCHIVE_FORMATS = OrderedDict([("gz", ".tar.gz"), ("tar", ".tar"), ("zst", ".tar.zst")])
+DEFAULT_ARCHIVE_FORMAT = "gz"
+ZSTD_MAGIC_NUMBER = b"\x28\xb5\x2f\xfd"
+
+
+def _user_cache_directory() -> Text:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "rasa", "models")
+
+
+# models unpacked without a working directory are unpacked once per user
+# into a directory which only the user can access
+UNPACK_CACHE_DIRECTORY = _user_cache_directory()
+# the least recently used models are removed from the cache once it holds
+# more models, models which are locked by a running process are kept
+UNPACK_CACHE_MAX_MODELS = 10
+# written into an unpacked model after its extraction was verified
+UNPACK_COMPLETE_MARKER = ".unpacked"
+
+# lock files of the cached models used by this process, the locks are
+# held until the process exits as models might be read lazily
+_cached_model_locks = {}  # type: Dict[Text, Any]
 
 
 def get_model(model_path: Text = DEFAULT_MODELS_PATH) -> Optional[Text]:
@@ -59,7 +89,9 @@ def get_latest_model(model_path: Text = DEFAULT_MODELS_PATH) -> Optional[Text]:
     if not os.path.exists(model_path) or os.path.isfile(model_path):
         model_path = os.path.dirname(model_path)
 
-    list_of_files = glob.glob(os.path.join(model_path, "*.tar.gz"))
+    list_of_files = []
+    for extension in ARCHIVE_FORMATS.values():
+        list_of_files += glob.glob(os.path.join(model_path, "*" + extension))
 
     if len(list_of_files) == 0:
         return None
@@ -115,30 +147,229 @@ def unpack_model(model_file: Text, working_directory: Optional[Text] = None) ->
     Args:
         model_file: Path to zipped model.
         working_directory: Location where the model should be unpacked to.
-                           If `None` a temporary directory will be created.
+                           If `None` the model is unpacked to a cache
+                           directory which is shared by all processes of
+                           the user. It must not be modified.
 
     Returns:
         Path to unpacked Rasa model.
 
     """
-    import tarfile
-
     if working_directory is None:
-        working_directory = tempfile.mkdtemp()
-
-    tar = tarfile.open(model_file)
+        return _unpack_model_to_cache(model_file)
 
     # cast `working_directory` as str for py3.5 compatibility
     working_directory = str(working_directory)
 
     # All files are in a subdirectory.
-    tar.extractall(working_directory)
-    tar.close()
+    _extract_archive(model_file, working_directory)
     logger.debug("Extracted model to '{}'.".format(working_directory))
 
     return working_directory
 
 
+def _unpack_model_to_cache(model_file: Text) -> Text:
+    """Unpack a model to a directory named after the hash of its content,
+    unless it has been unpacked before."""
+
+    cache_directory = _private_cache_directory()
+    if cache_directory is None:
+        return unpack_model(model_file, tempfile.mkdtemp())
+
+    name = _file_content_hash(model_file)
+    target = os.path.join(cache_directory, name)
+    if target not in _cached_model_locks:
+        # keeps other processes from evicting the model while it is used
+        _cached_model_locks[target] = _lock_cached_model(target)
+
+    if _is_unpacked(target, name):
+        # the modification time tracks when the model was used last
+        os.utime(target)
+        logger.debug("Using model unpacked to '{}' before.".format(target))
+        return target
+
+    # extract to a temporary directory first, so that other processes
+    # never see a partially extracted model
+    unpacked = tempfile.mkdtemp(prefix=".unpacking-", dir=cache_directory)
+    members = _extract_archive(model_file, unpacked)
+    _verify_extracted_files(unpacked, members)
+    with open(os.path.join(unpacked, UNPACK_COMPLETE_MARKER), "w") as f:
+        f.write(name)
+
+    if os.path.exists(target) and not _is_unpacked(target, name):
+        # left behind by an interrupted eviction
+        shutil.rmtree(target, ignore_errors=True)
+    try:
+        os.rename(unpacked, target)
+    except OSError:
+        # another process unpacked the same model in the meantime
+        shutil.rmtree(unpacked, ignore_errors=True)
+        if not _is_unpacked(target, name):
+            raise
+
+    logger.debug("Extracted model to '{}'.".format(target))
+    _evict_unpacked_models(cache_directory, keep=target)
+    return target
+
+
+def _private_cache_directory() -> Optional[Text]:
+    """Creates the unpack cache directory which only the current user can
+    access.
+
+    Returns `None` if an existing directory is accessible by other users,
+    as they could plant models in it."""
+
+    import stat
+
+    try:
+        os.makedirs(UNPACK_CACHE_DIRECTORY, mode=0o700, exist_ok=True)
+        status = os.lstat(UNPACK_CACHE_DIRECTORY)
+    except OSError as e:
+        logger.warning(
+            "Failed to create the model cache '{}': {}"
+            "".format(UNPACK_CACHE_DIRECTORY, e)
+        )
+        return None
+
+    if not stat.S_ISDIR(status.st_mode) or (
+        hasattr(os, "getuid")
+        and (status.st_uid != os.getuid() or status.st_mode & 0o077)
+    ):
+        logger.warning(
+            "Not caching unpacked models in '{}', as the directory is owned "
+            "or accessible by other users. Remove it or restrict its "
+            "permissions to the owner.".format(UNPACK_CACHE_DIRECTORY)
+        )
+        return None
+    return UNPACK_CACHE_DIRECTORY
+
+
+def _is_unpacked(target: Text, name: Text) -> bool:
+    try:
+        with open(os.path.join(target, UNPACK_COMPLETE_MARKER)) as f:
+            return f.read() == name
+    except OSError:
+        return False
+
+
+def _verify_extracted_files(
+    working_directory: Text, members: List[tarfile.TarInfo]
+) -> None:
+    for member in members:
+        path = os.path.join(working_directory, member.name)
+        if member.isfile() and os.path.getsize(path) != member.size:
+            raise ValueError(
+                "Failed to extract '{}' of the model completely.".format(member.name)
+            )
+
+
+def _lock_cached_model(target: Text, exclusive: bool = False) -> Optional[Any]:
+    """Locks the cached model `target`.
+
+    Models are locked shared while they are used and exclusively while
+    they are evicted. Exclusive locks don't wait for other processes.
+
+    Returns:
+        The open lock file, or `None` if the model is locked by another
+        process or file locks are not supported by the platform.
+    """
+
+    try:
+        import fcntl
+    except ImportError:
+        return None
+
+    path = target + ".lock"
+    operation = fcntl.LOCK_EX | fcntl.LOCK_NB if exclusive else fcntl.LOCK_SH
+    while True:
+        lock_file = open(path, "a")
+        try:
+            fcntl.flock(lock_file, operation)
+            # the lock file is removed when a model is evicted
+            if os.path.samestat(os.fstat(lock_file.fileno()), os.stat(path)):
+                return lock_file
+        except OSError:
+            # locked by another process or not supported by the file system
+            lock_file.close()
+            return None
+        lock_file.close()
+
+
+def _evict_unpacked_models(cache_directory: Text, keep: Text) -> None:
+    """Removes the least recently used models from the unpack cache.
+
+    Models which are locked by a running process are kept. Without file
+    locks (e.g. on Windows) no models are removed."""
+
+    cached = []
+    for name in os.listdir(cache_directory):
+        path = os.path.join(cache_directory, name)
+        if path == keep or name.startswith(".") or not os.path.isdir(path):
+            continue
+        try:
+            cached.append((os.path.getmtime(path), path))
+        except OSError:
+            # removed by another process
+            continue
+
+    least_recently_used = sorted(cached, reverse=True)[UNPACK_CACHE_MAX_MODELS - 1 :]
+    for _, path in least_recently_used:
+        lock_file = _lock_cached_model(path, exclusive=True)
+        if lock_file is None:
+            continue
+
+        logger.debug("Removing unused model '{}' from the cache.".format(path))
+        try:
+            shutil.rmtree(path, ignore_errors=True)
+            os.remove(path + ".lock")
+        finally:
+            lock_file.close()
+
+
+def _file_content_hash(path: Text, chunk_size: int = 1024 * 1024) -> Text:
+    from hashlib import md5
+
+    file_hash = md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def _is_zstd_archive(model_file: Text) -> bool:
+    with open(model_file, "rb") as f:
+        return f.read(len(ZSTD_MAGIC_NUMBER)) == ZSTD_MAGIC_NUMBER
+
+
+def _extract_archive(
+    model_file: Text, working_directory: Text
+) -> List[tarfile.TarInfo]:
+    """Extracts the model archive and returns its members."""
+
+    if _is_zstd_archive(model_file):
+        import zstandard
+
+        with open(model_file, "rb") as f:
+            reader = zstandard.ZstdDecompressor().stream_reader(f)
+            with tarfile.open(fileobj=reader, mode="r|") as tar:
+                tar.extractall(working_directory)
+                return tar.getmembers()
+    else:
+        # detects whether the archive is compressed with gzip
+        with tarfile.open(model_file) as tar:
+            tar.extractall(working_directory)
+            return tar.getmembers()
+
+
+def archive_format_from_path(path: Text) -> Optional[Text]:
+    """Returns the archive format belonging to the extension of `path`."""
+
+    for archive_format, extension in ARCHIVE_FORMATS.items():
+        if path.endswith(extension):
+            return archive_format
+    return None
+
+
 def get_model_subdirectories(unpacked_model_path: Text) -> Tuple[Text, Text]:
     """Returns paths for core and nlu model directories.
 
@@ -164,15 +395,15 @@ def create_package_rasa(
     Args:
         training_directory: Path to the directory which contains the trained
                             model files.
-        output_filename: Name of the zipped model file to be created.
+        output_filename: Name of the zipped model file to be created. Its
+                         extension determines the archive format (see
+                         `ARCHIVE_FORMATS`), gzip is used for unknown ones.
         fingerprint: A unique fingerprint to identify the model version.
 
     Returns:
         Path to zipped model.
 
     """
-    import tarfile
-
     if fingerprint:
         persist_fingerprint(training_directory, fingerprint)
 
@@ -180,14 +411,28 @@ def create_package_rasa(
     if not os.path.exists(output_directory):
         os.makedirs(output_directory)
 
-    with tarfile.open(output_filename, "w:gz") as tar:
-        for elem in os.scandir(training_directory):
-            tar.add(elem.path, arcname=elem.name)
+    archive_format = archive_format_from_path(output_filename)
+    if archive_format == "zst":
+        import zstandard
+
+        with open(output_filename, "wb") as f:
+            with zstandard.ZstdCompressor().stream_writer(f) as compressor:
+                with tarfile.open(fileobj=compressor, mode="w|") as tar:
+                    _add_to_archive(tar, training_directory)
+    else:
+        mode = "w" if archive_format == "tar" else "w:gz"
+        with tarfile.open(output_filename, mode) as tar:
+            _add_to_archive(tar, training_directory)
 
     shutil.rmtree(training_directory)
     return output_filename
 
 
+def _add_to_archive(tar: tarfile.TarFile, training_directory: Text) -> None:
+    for elem in os.scandir(training_directory):
+        tar.add(elem.path, arcname=elem.name)
+
+
 def model_fingerprint(
     config_file: Text,
     domain_file: Optional[Text] = None,
@@ -212,16 +457,105 @@ def model_fingerprint(
     import rasa
     import time
 
+    domain_hashes = _get_hashes_for_paths(domain_file)
+    nlu_data_hashes = _get_hashes_for_paths(nlu_data)
+    stories_hashes = _get_hashes_for_paths(stories)
+
     return {
         FINGERPRINT_CONFIG_KEY: _get_hashes_for_paths(config_file),
-        FINGERPRINT_DOMAIN_KEY: _get_hashes_for_paths(domain_file),
-        FINGERPRINT_NLU_DATA_KEY: _get_hashes_for_paths(nlu_data),
-        FINGERPRINT_STORIES_KEY: _get_hashes_for_paths(stories),
+        FINGERPRINT_DOMAIN_KEY: domain_hashes,
+        FINGERPRINT_NLU_DATA_KEY: nlu_data_hashes,
+        FINGERPRINT_STORIES_KEY: stories_hashes,
         FINGERPRINT_TRAINED_AT_KEY: time.time(),
         FINGERPRINT_RASA_VERSION_KEY: rasa.__version__,
+        FINGERPRINT_POLICIES_KEY: _policy_fingerprints(
+            config_file, domain_hashes, stories_hashes
+        ),
+        FINGERPRINT_NLU_COMPONENTS_KEY: _nlu_component_fingerprints(
+            config_file, nlu_data_hashes
+        ),
     }
 
 
+def continued_training_fingerprint(
+    fingerprint: Fingerprint, stories: Text
+) -> Fingerprint:
+    """Creates the fingerprint of a model whose training continued on `stories`.
+
+    The policies of the model were not trained on the data of any
+    configuration, hence they are never reused by later trainings.
+
+    Args:
+        fingerprint: Fingerprint of the model the training continued from.
+        stories: Path to the new story training data.
+
+    Returns:
+        The fingerprint.
+
+    """
+    import time
+
+    stories_hashes = fingerprint.get(FINGERPRINT_STORIES_KEY) or []
+
+    continued = dict(fingerprint)
+    continued[FINGERPRINT_STORIES_KEY] = sorted(
+        stories_hashes + _get_hashes_for_paths(stories)
+    )
+    continued[FINGERPRINT_POLICIES_KEY] = []
+    continued[FINGERPRINT_TRAINED_AT_KEY] = time.time()
+    return continued
+
+
+def _hash_of(*parts: Any) -> Text:
+    from rasa.core.utils import get_text_hash
+
+    return get_text_hash(json.dumps(parts, sort_keys=True))
+
+
+def _policy_fingerprints(
+    config_file: Text, domain_hashes: List[Text], stories_hashes: List[Text]
+) -> List[Text]:
+    """Fingerprint each policy by its configuration and training data."""
+
+    import rasa
+    import rasa.utils.io
+
+    if not config_file or not os.path.isfile(config_file):
+        return []
+
+    policies = (rasa.utils.io.read_yaml_file(config_file) or {}).get("policies")
+    return [
+        _hash_of(policy, domain_hashes, stories_hashes, rasa.__version__)
+        for policy in policies or []
+    ]
+
+
+def _nlu_component_fingerprints(
+    config_file: Text, nlu_data_hashes: List[Text]
+) -> List[Text]:
+    """Fingerprint each NLU component by its configuration and training data.
+
+    A component is trained on the output of the components before it,
+    hence their configuration is part of its fingerprint."""
+
+    import rasa
+    import rasa.nlu.config
+
+    if not config_file or not os.path.isfile(config_file):
+        return []
+
+    nlu_config = rasa.nlu.config.load(config_file)
+    return [
+        _hash_of(
+            nlu_config.language,
+            nlu_config.pipeline[: i + 1],
+            nlu_data_hashes,
+            rasa.__version__,
+        )
+        for i in range(len(nlu_config.pipeline))
+    ]
+
+
 def _get_hashes_for_paths(path: Text) -> List[Text]:
     from rasa.core.utils import get_file_hash
 
@@ -283,7 +617,7 @@ def core_fingerprint_changed(
 
     """
     relevant_keys = [
-        FINGERPRINT_CONFIG_KEY,
+        FINGERPRINT_POLICIES_KEY,
         FINGERPRINT_DOMAIN_KEY,
         FINGERPRINT_STORIES_KEY,
         FINGERPRINT_RASA_VERSION_KEY,
@@ -311,7 +645,7 @@ def nlu_fingerprint_changed(
     """
 
     relevant_keys = [
-        FINGERPRINT_CONFIG_KEY,
+        FINGERPRINT_NLU_COMPONENTS_KEY,
         FINGERPRINT_NLU_DATA_KEY,
         FINGERPRINT_RASA_VERSION_KEY,
     ]
@@ -323,6 +657,58 @@ def nlu_fingerprint_changed(
     return False
 
 
+def reusable_policies(
+    fingerprint1: Fingerprint, fingerprint2: Fingerprint, core_model: Text
+) -> Dict[int, Text]:
+    """Finds the policies of a trained Core model which don't need retraining.
+
+    Args:
+        fingerprint1: Fingerprint of the trained model.
+        fingerprint2: Fingerprint of the model which should be trained.
+        core_model: Path to the Core subdirectory of the trained model.
+
+    Returns:
+        The paths of the persisted policies which have the same fingerprint
+        by the index of the policy in the configuration of the new model.
+
+    """
+    from rasa.core.policies.ensemble import PolicyEnsemble
+
+    old_fingerprints = fingerprint1.get(FINGERPRINT_POLICIES_KEY) or []
+    if not old_fingerprints or not os.path.isdir(core_model):
+        return {}
+
+    policy_names = PolicyEnsemble.load_metadata(core_model)["policy_names"]
+    if len(policy_names) != len(old_fingerprints):
+        return {}
+
+    old_paths = {}
+    for i, (name, fingerprint) in enumerate(zip(policy_names, old_fingerprints)):
+        dir_name = "policy_{}_{}".format(i, name.split(".")[-1])
+        old_paths[fingerprint] = os.path.join(core_model, dir_name)
+
+    reusable = {}
+    for i, fingerprint in enumerate(fingerprint2.get(FINGERPRINT_POLICIES_KEY) or []):
+        if fingerprint in old_paths and os.path.isdir(old_paths[fingerprint]):
+            reusable[i] = old_paths[fingerprint]
+    return reusable
+
+
+def changed_nlu_components(
+    fingerprint1: Fingerprint, fingerprint2: Fingerprint
+) -> List[int]:
+    """Returns the indices of the NLU components whose fingerprint changed."""
+
+    old_fingerprints = set(fingerprint1.get(FINGERPRINT_NLU_COMPONENTS_KEY) or [])
+    return [
+        i
+        for i, fingerprint in enumerate(
+            fingerprint2.get(FINGERPRINT_NLU_COMPONENTS_KEY) or []
+        )
+        if fingerprint not in old_fingerprints
+    ]
+
+
 def merge_model(source: Text, target: Text) -> bool:
     """Merges two model directories.
 
@@ -335,7 +721,8 @@ def merge_model(source: Text, target: Text) -> bool:
 
     """
     try:
-        shutil.move(source, target)
+        # the source might be part of a cached model, hence it is copied
+        shutil.copytree(source, target)
         return True
     except Exception as e:
         logging.debug(e)
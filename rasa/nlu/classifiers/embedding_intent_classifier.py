@@ -9,6 +9,7 @@ from typing import Any, Dict, List, Optional, Text, Tuple
 
 from rasa.nlu.classifiers import INTENT_RANKING_LENGTH
 from rasa.nlu.components import Component
+from rasa.utils import tf_graph
 
 logger = logging.getLogger(__name__)
 
@@ -19,11 +20,6 @@ if typing.TYPE_CHECKING:
     from rasa.nlu.model import Metadata
     from rasa.nlu.training_data import Message
 
-try:
-    import tensorflow as tf
-except ImportError:
-    tf = None
-
 
 class EmbeddingIntentClassifier(Component):
     """Intent classifier using supervised embeddings.
@@ -99,6 +95,11 @@ class EmbeddingIntentClassifier(Component):
         "evaluate_every_num_epochs": 10,  # small values may hurt performance
         # how many examples to use for calculation of training accuracy
         "evaluate_on_num_examples": 1000,  # large values may hurt performance
+        # inference
+        # flag: if true, messages are embedded with numpy using the trained
+        # weights instead of running the tf session, which is faster
+        # for small networks
+        "numpy_inference": False,
     }
 
     def __init__(
@@ -137,6 +138,13 @@ class EmbeddingIntentClassifier(Component):
         self.word_embed = word_embed
         self.intent_embed = intent_embed
 
+        # embeddings of all intents and the weights of the message network,
+        # computed once to speed up inference
+        self.all_intents_embed = None
+        self.message_tower_weights = None
+        if self.session is not None and self.intent_embed is not None:
+            self._prepare_for_inference()
+
     # init helpers
     def _load_nn_architecture_params(self, config: Dict[Text, Any]) -> None:
         self.hidden_layer_sizes = {
@@ -178,6 +186,9 @@ class EmbeddingIntentClassifier(Component):
 
         self.evaluate_on_num_examples = config["evaluate_on_num_examples"]
 
+    def _load_inference_params(self, config: Dict[Text, Any]) -> None:
+        self.numpy_inference = config["numpy_inference"]
+
     def _load_params(self) -> None:
 
         self._load_nn_architecture_params(self.component_config)
@@ -185,6 +196,7 @@ class EmbeddingIntentClassifier(Component):
         self._load_regularization_params(self.component_config)
         self._load_flag_if_tokenize_intents(self.component_config)
         self._load_visual_params(self.component_config)
+        self._load_inference_params(self.component_config)
 
     # package safety checks
     @classmethod
@@ -193,7 +205,9 @@ class EmbeddingIntentClassifier(Component):
 
     @staticmethod
     def _check_tensorflow():
-        if tf is None:
+        try:
+            import tensorflow
+        except ImportError:
             raise ImportError(
                 "Failed to import `tensorflow`. "
                 "Please install `tensorflow`. "
@@ -279,6 +293,8 @@ class EmbeddingIntentClassifier(Component):
     ) -> "tf.Tensor":
         """Create nn with hidden layers and name"""
 
+        import tensorflow as tf
+
         reg = tf.contrib.layers.l2_regularizer(self.C2)
         x = x_in
         for i, layer_size in enumerate(layer_sizes):
@@ -322,6 +338,8 @@ class EmbeddingIntentClassifier(Component):
             sim_emb: between individual embedded intent labels only
         """
 
+        import tensorflow as tf
+
         if self.similarity_type == "cosine":
             # normalize embedding vectors for cosine similarity
             a = tf.nn.l2_normalize(a, -1)
@@ -343,6 +361,8 @@ class EmbeddingIntentClassifier(Component):
     def _tf_loss(self, sim: "tf.Tensor", sim_emb: "tf.Tensor") -> "tf.Tensor":
         """Define loss"""
 
+        import tensorflow as tf
+
         # loss for maximizing similarity with correct action
         loss = tf.maximum(0.0, self.mu_pos - sim[:, 0])
 
@@ -422,6 +442,8 @@ class EmbeddingIntentClassifier(Component):
     ) -> None:
         """Train tf graph"""
 
+        import tensorflow as tf
+
         self.session.run(tf.global_variables_initializer())
 
         if self.evaluate_on_num_examples:
@@ -512,6 +534,8 @@ class EmbeddingIntentClassifier(Component):
     ) -> None:
         """Train the embedding intent classifier on a data set."""
 
+        import tensorflow as tf
+
         intent_dict = self._create_intent_dict(training_data)
         if len(intent_dict) < 2:
             logger.error(
@@ -559,35 +583,96 @@ class EmbeddingIntentClassifier(Component):
             train_op = tf.train.AdamOptimizer().minimize(loss)
 
             # train tensorflow graph
-            self.session = tf.Session()
+            self.session = tf.Session(config=tf_graph.session_config())
 
             self._train_tf(X, Y, intents_for_X, loss, is_training, train_op)
 
+        self._prepare_for_inference()
+
     # process helpers
+    @staticmethod
+    def _l2_normalize(x: np.ndarray) -> np.ndarray:
+        """Normalize the rows of `x` the same way `tf.nn.l2_normalize` does."""
+
+        square_sum = np.sum(np.square(x), -1, keepdims=True)
+        return x / np.sqrt(np.maximum(square_sum, 1e-12))
+
+    def _prepare_for_inference(self) -> None:
+        """Embed all intents once, so that inference only has to embed
+        the message and compare it against a constant matrix."""
+
+        all_Y = self._create_all_Y(1)
+        all_intents_embed = self.session.run(
+            self.intent_embed, feed_dict={self.b_in: all_Y}
+        )[0]
+        if self.similarity_type == "cosine":
+            all_intents_embed = self._l2_normalize(all_intents_embed)
+        self.all_intents_embed = all_intents_embed
+
+        if self.numpy_inference:
+            self.message_tower_weights = self._message_tower_weights()
+
+    def _message_tower_weights(self) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Fetch the kernels and biases of the message embedding network."""
+
+        layer_names = [
+            "hidden_layer_a_{}".format(i)
+            for i in range(len(self.hidden_layer_sizes["a"]))
+        ] + ["embed_layer_a"]
+
+        variables = [
+            (
+                self.graph.get_tensor_by_name("{}/kernel:0".format(name)),
+                self.graph.get_tensor_by_name("{}/bias:0".format(name)),
+            )
+            for name in layer_names
+        ]
+        return self.session.run(variables)
+
     # noinspection PyPep8Naming
-    def _calculate_message_sim(
-        self, X: np.ndarray, all_Y: np.ndarray
-    ) -> Tuple[np.ndarray, List[float]]:
-        """Load tf graph and calculate message similarities"""
+    def _embed_message(self, X: np.ndarray) -> np.ndarray:
+        """Embed the message features, either with numpy or the tf session."""
 
-        message_sim = self.session.run(
-            self.sim_op, feed_dict={self.a_in: X, self.b_in: all_Y}
-        )
-        message_sim = message_sim.flatten()  # sim is a matrix
+        if self.message_tower_weights is None:
+            return self.session.run(self.word_embed, feed_dict={self.a_in: X})
+
+        x = X
+        for kernel, bias in self.message_tower_weights[:-1]:
+            # hidden layers use relu activations, dropout is inactive
+            x = np.maximum(0, x.dot(kernel) + bias)
+        kernel, bias = self.message_tower_weights[-1]
+        return x.dot(kernel) + bias
+
+    # noinspection PyPep8Naming
+    def _calculate_message_sim(self, X: np.ndarray) -> Tuple[np.ndarray, List[float]]:
+        """Calculate the similarities of the message to the intents.
 
-        intent_ids = message_sim.argsort()[::-1]
-        message_sim[::-1].sort()
+        Returns the ids of the best ranked intents with their similarities."""
+
+        message_embed = self._embed_message(X)
+        if self.similarity_type == "cosine":
+            message_embed = self._l2_normalize(message_embed)
+
+        message_sim = message_embed.dot(self.all_intents_embed.T).flatten()
 
         if self.similarity_type == "cosine":
             # clip negative values to zero
             message_sim[message_sim < 0] = 0
         elif self.similarity_type == "inner":
             # normalize result to [0, 1] with softmax
-            message_sim = np.exp(message_sim)
+            message_sim = np.exp(message_sim - np.max(message_sim))
             message_sim /= np.sum(message_sim)
 
+        # only the top ranked intents are reported, so there is no need
+        # to sort all of them
+        ranking_length = min(INTENT_RANKING_LENGTH, message_sim.size)
+        if ranking_length == 0:
+            return np.array([], dtype=int), []
+        top_ids = np.argpartition(-message_sim, ranking_length - 1)[:ranking_length]
+        intent_ids = top_ids[np.argsort(-message_sim[top_ids], kind="stable")]
+
         # transform sim to python list for JSON serializing
-        return intent_ids, message_sim.tolist()
+        return intent_ids, message_sim[intent_ids].tolist()
 
     def process(self, message: "Message", **kwargs: Any) -> None:
         """Return the most likely intent and its similarity to the input."""
@@ -607,13 +692,8 @@ class EmbeddingIntentClassifier(Component):
             # noinspection PyPep8Naming
             X = message.get("text_features").reshape(1, -1)
 
-            # stack encoded_all_intents on top of each other
-            # to create candidates for test examples
-            # noinspection PyPep8Naming
-            all_Y = self._create_all_Y(X.shape[0])
-
-            # load tf graph and session
-            intent_ids, message_sim = self._calculate_message_sim(X, all_Y)
+            # compare the message to the precomputed intent embeddings
+            intent_ids, message_sim = self._calculate_message_sim(X)
 
             # if X contains all zeros do not predict some label
             if X.any() and intent_ids.size > 0:
@@ -638,6 +718,8 @@ class EmbeddingIntentClassifier(Component):
         Return the metadata necessary to load the model again.
         """
 
+        import tensorflow as tf
+
         if self.session is None:
             return {"file": None}
 
@@ -669,6 +751,20 @@ class EmbeddingIntentClassifier(Component):
             saver = tf.train.Saver()
             saver.save(self.session, checkpoint)
 
+        # inference only graph, which is faster to load and run
+        tf_graph.persist_frozen_graph(
+            self.session,
+            self.graph,
+            {
+                "message_placeholder": self.a_in,
+                "intent_placeholder": self.b_in,
+                "similarity_op": self.sim_op,
+                "word_embed": self.word_embed,
+                "intent_embed": self.intent_embed,
+            },
+            os.path.join(model_dir, file_name + ".frozen.pb"),
+        )
+
         with io.open(
             os.path.join(model_dir, file_name + "_inv_intent_dict.pkl"), "wb"
         ) as f:
@@ -690,23 +786,34 @@ class EmbeddingIntentClassifier(Component):
         **kwargs: Any
     ) -> "EmbeddingIntentClassifier":
 
+        import tensorflow as tf
+
         if model_dir and meta.get("file"):
             file_name = meta.get("file")
             checkpoint = os.path.join(model_dir, file_name + ".ckpt")
-            graph = tf.Graph()
-            with graph.as_default():
-                sess = tf.Session()
-                saver = tf.train.import_meta_graph(checkpoint + ".meta")
+            frozen_graph = os.path.join(model_dir, file_name + ".frozen.pb")
 
-                saver.restore(sess, checkpoint)
-
-                a_in = tf.get_collection("message_placeholder")[0]
-                b_in = tf.get_collection("intent_placeholder")[0]
-
-                sim_op = tf.get_collection("similarity_op")[0]
-
-                word_embed = tf.get_collection("word_embed")[0]
-                intent_embed = tf.get_collection("intent_embed")[0]
+            if tf_graph.has_frozen_graph(frozen_graph):
+                graph, sess, tensors = tf_graph.load_frozen_graph(frozen_graph)
+            else:
+                # models persisted before frozen graphs were introduced
+                graph = tf.Graph()
+                with graph.as_default():
+                    sess = tf.Session(config=tf_graph.session_config())
+                    saver = tf.train.import_meta_graph(checkpoint + ".meta")
+
+                    saver.restore(sess, checkpoint)
+
+                    tensors = {
+                        name: tf.get_collection(name)[0]
+                        for name in [
+                            "message_placeholder",
+                            "intent_placeholder",
+                            "similarity_op",
+                            "word_embed",
+                            "intent_embed",
+                        ]
+                    }
 
             with io.open(
                 os.path.join(model_dir, file_name + "_inv_intent_dict.pkl"), "rb"
@@ -723,11 +830,11 @@ class EmbeddingIntentClassifier(Component):
                 encoded_all_intents=encoded_all_intents,
                 session=sess,
                 graph=graph,
-                message_placeholder=a_in,
-                intent_placeholder=b_in,
-                similarity_op=sim_op,
-                word_embed=word_embed,
-                intent_embed=intent_embed,
+                message_placeholder=tensors["message_placeholder"],
+                intent_placeholder=tensors["intent_placeholder"],
+                similarity_op=tensors["similarity_op"],
+                word_embed=tensors["word_embed"],
+                intent_embed=tensors["intent_embed"],
             )
 
         else:
@@ -182,6 +182,12 @@ class Component(object, metaclass=ComponentMetaclass):
     # This is an important feature for backwards compatibility of components.
     language_list = None
 
+    # Whether the component learns anything from the training data. Components
+    # which only process the training examples (e.g. tokenizers or pretrained
+    # featurizers) produce the same results for any subset of the data, hence
+    # their output can be shared, e.g. between cross validation folds.
+    learns_from_data = True
+
     def __init__(self, component_config: Optional[Dict[Text, Any]] = None) -> None:
 
         if not component_config:
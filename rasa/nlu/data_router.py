@@ -14,6 +14,7 @@ from rasa.nlu.emulators import NoEmulator
 from rasa.nlu.model_loader import NLUModel, load_from_server, FALLBACK_MODEL_NAME
 from rasa.nlu.test import run_evaluation
 from rasa.nlu.model import InvalidModelError, UnsupportedModelError
+from rasa.nlu.profiling import PipelineProfiler
 from rasa.nlu.train import do_train_in_worker
 from rasa.utils.endpoints import EndpointConfig
 
@@ -95,7 +96,12 @@ class DataRouter(object):
         else:
             self.component_builder = ComponentBuilder(use_cache=True)
 
-        self.nlu_model = NLUModel.fallback_model(self.component_builder)
+        # per component latency measurements, can be enabled at runtime
+        self.profiler = PipelineProfiler(enabled=False)
+
+        self.nlu_model = NLUModel.fallback_model(
+            self.component_builder, self.profiler
+        )
 
         # tensorflow sessions are not fork-safe,
         # and training processes have to be spawned instead of forked. See
@@ -164,13 +170,15 @@ class DataRouter(object):
 
         if model_path is None:
             logger.warning("Could not load any model. Using fallback model.")
-            self.nlu_model = NLUModel.fallback_model(self.component_builder)
+            self.nlu_model = NLUModel.fallback_model(
+                self.component_builder, self.profiler
+            )
             return
 
         try:
             if os.path.exists(model_path):
                 self.nlu_model = NLUModel.load_local_model(
-                    model_path, self.component_builder
+                    model_path, self.component_builder, self.profiler
                 )
 
             elif self.model_server is not None:
@@ -178,11 +186,15 @@ class DataRouter(object):
                     self.component_builder,
                     self.model_server,
                     self.wait_time_between_pulls,
+                    self.profiler,
                 )
 
             elif self.remote_storage is not None:
                 self.nlu_model = NLUModel.load_from_remote_storage(
-                    self.remote_storage, self.component_builder, model_path
+                    self.remote_storage,
+                    self.component_builder,
+                    model_path,
+                    self.profiler,
                 )
 
             else:
@@ -207,7 +219,7 @@ class DataRouter(object):
             logger.warning(
                 "Model with name '{}' is not loaded. Use default model.".format(model)
             )
-            nlu_model = NLUModel.fallback_model(self.component_builder)
+            nlu_model = NLUModel.fallback_model(self.component_builder, self.profiler)
 
         response = nlu_model.parse(data["text"], data.get("time"))
         response["model"] = nlu_model.name
@@ -222,11 +234,28 @@ class DataRouter(object):
         # process, if run in multi worker mode, there might
         # be other trainings run in different processes we don't know about.
 
-        return {
+        status = {
             "max_worker_processes": self._worker_processes,
             "current_worker_processes": self._current_worker_processes,
             "loaded_model": self.nlu_model.name,
         }
+        if self.profiler.enabled:
+            status["profiling"] = self.profiler.report()
+        return status
+
+    def configure_profiling(
+        self, enabled: bool, trace_allocations: bool = False, reset: bool = False
+    ) -> None:
+        """Switch the per component profiling of parse requests on or off."""
+
+        self.profiler.configure(enabled, trace_allocations)
+        if reset:
+            self.profiler.reset()
+        logger.debug(
+            "Profiling of parse requests is {}.".format(
+                "enabled" if enabled else "disabled"
+            )
+        )
 
     async def start_train_process(
         self,
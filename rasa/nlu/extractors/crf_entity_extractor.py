@@ -8,13 +8,11 @@ from rasa.nlu.extractors import EntityExtractor
 from rasa.nlu.model import Metadata
 from rasa.nlu.training_data import Message, TrainingData
 
-try:
-    import spacy
-except ImportError:
-    spacy = None
-
 logger = logging.getLogger(__name__)
 
+# maximum number of memoized word features, the cache is reset once it is full
+WORD_FEATURES_CACHE_SIZE = 100000
+
 if typing.TYPE_CHECKING:
     from sklearn_crfsuite import CRF
 
@@ -88,10 +86,19 @@ class CRFEntityExtractor(EntityExtractor):
 
         self.ent_tagger = ent_tagger
 
+        self._templates = None
+        self._word_features_cache = {}
+
         self._validate_configuration()
 
         self._check_pos_features_and_spacy()
 
+    def __getstate__(self) -> Any:
+        d = super(CRFEntityExtractor, self).__getstate__()
+        # the memoized word features are rebuilt on demand
+        d["_word_features_cache"] = {}
+        return d
+
     def _check_pos_features_and_spacy(self):
         import itertools
 
@@ -103,7 +110,9 @@ class CRFEntityExtractor(EntityExtractor):
 
     @staticmethod
     def _check_spacy():
-        if spacy is None:
+        try:
+            import spacy
+        except ImportError:
             raise ImportError(
                 "Failed to import `spaCy`. "
                 "`spaCy` is required for POS features "
@@ -140,7 +149,7 @@ class CRFEntityExtractor(EntityExtractor):
             # without annotations
             dataset = self._create_dataset(filtered_entity_examples)
 
-            self._train_model(dataset)
+            self._train_model(dataset, kwargs.get("num_threads", 1))
 
     def _create_dataset(
         self, examples: List[Message]
@@ -389,48 +398,108 @@ class CRFEntityExtractor(EntityExtractor):
 
         return {"file": file_name}
 
+    def _feature_templates(self) -> List[Tuple[int, Text, List[Tuple[Text, Text]]]]:
+        """Precompute the offsets, prefixes and feature names of the
+        configured features, so they are not rebuilt for every word."""
+
+        if self._templates is None:
+            configured_features = self.component_config["features"]
+            half_span = len(configured_features) // 2
+            templates = []
+            for f_i in range(-half_span, half_span + 1):
+                prefix = str(f_i)
+                features = [
+                    (feature, prefix + ":" + feature)
+                    for feature in configured_features[f_i + half_span]
+                ]
+                templates.append((f_i, prefix, features))
+            self._templates = templates
+        return self._templates
+
+    def _word_features(
+        self,
+        word: Tuple[Text, Text, Text, Dict[Text, Any]],
+        f_i: int,
+        prefix: Text,
+        features: List[Tuple[Text, Text]],
+    ) -> Dict[Text, Any]:
+        """Features of a single word at a given offset of the feature window.
+
+        The result only depends on the word's text, tag and regex matches,
+        so it is memoized for repeated words."""
+
+        text, tag, _, pattern = word
+        cache_key = (f_i, text, tag, tuple(sorted(pattern.items())))
+        cached = self._word_features_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        word_features = {}
+        for feature, feature_name in features:
+            if feature == "pattern":
+                # add all regexes as a feature
+                regex_patterns = self.function_dict[feature](word)
+                for p_name, matched in regex_patterns.items():
+                    word_features[feature_name + ":" + p_name] = matched
+            else:
+                # append each feature to a feature vector
+                word_features[feature_name] = self.function_dict[feature](word)
+
+        if len(self._word_features_cache) >= WORD_FEATURES_CACHE_SIZE:
+            self._word_features_cache.clear()
+        self._word_features_cache[cache_key] = word_features
+        return word_features
+
     def _sentence_to_features(
         self, sentence: List[Tuple[Text, Text, Text, Text]]
     ) -> List[Dict[Text, Any]]:
         """Convert a word into discrete features in self.crf_features,
         including word before and word after."""
 
-        configured_features = self.component_config["features"]
+        templates = self._feature_templates()
+        sentence_length = len(sentence)
         sentence_features = []
 
-        for word_idx in range(len(sentence)):
+        for word_idx in range(sentence_length):
             # word before(-1), current word(0), next word(+1)
-            feature_span = len(configured_features)
-            half_span = feature_span // 2
-            feature_range = range(-half_span, half_span + 1)
-            prefixes = [str(i) for i in feature_range]
             word_features = {}
-            for f_i in feature_range:
-                if word_idx + f_i >= len(sentence):
-                    word_features["EOS"] = True
+            for f_i, prefix, features in templates:
+                if word_idx + f_i >= sentence_length:
                     # End Of Sentence
+                    word_features["EOS"] = True
                 elif word_idx + f_i < 0:
-                    word_features["BOS"] = True
                     # Beginning Of Sentence
+                    word_features["BOS"] = True
                 else:
-                    word = sentence[word_idx + f_i]
-                    f_i_from_zero = f_i + half_span
-                    prefix = prefixes[f_i_from_zero]
-                    features = configured_features[f_i_from_zero]
-                    for feature in features:
-                        if feature == "pattern":
-                            # add all regexes as a feature
-                            regex_patterns = self.function_dict[feature](word)
-                            for p_name, matched in regex_patterns.items():
-                                feature_name = prefix + ":" + feature + ":" + p_name
-                                word_features[feature_name] = matched
-                        else:
-                            # append each feature to a feature vector
-                            value = self.function_dict[feature](word)
-                            word_features[prefix + ":" + feature] = value
+                    word_features.update(
+                        self._word_features(
+                            sentence[word_idx + f_i], f_i, prefix, features
+                        )
+                    )
             sentence_features.append(word_features)
         return sentence_features
 
+    def _dataset_to_features(
+        self,
+        dataset: List[List[Tuple[Text, Text, Text, Text]]],
+        num_threads: int = 1,
+    ) -> List[List[Dict[Text, Any]]]:
+        """Convert all sentences of a dataset into crfsuite features.
+
+        If `num_threads` is larger than one, the sentences are split
+        across a pool of worker processes."""
+
+        if num_threads <= 1 or len(dataset) < num_threads:
+            return [self._sentence_to_features(sent) for sent in dataset]
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunksize = max(1, len(dataset) // (num_threads * 4))
+        with ProcessPoolExecutor(max_workers=num_threads) as pool:
+            return list(
+                pool.map(self._sentence_to_features, dataset, chunksize=chunksize)
+            )
+
     @staticmethod
     def _sentence_to_labels(
         sentence: List[Tuple[Text, Text, Text, Text]]
@@ -521,6 +590,8 @@ class CRFEntityExtractor(EntityExtractor):
 
     @staticmethod
     def __tag_of_token(token):
+        import spacy
+
         if spacy.about.__version__ > "2" and token._.has("tag"):
             return token._.get("tag")
         else:
@@ -543,11 +614,13 @@ class CRFEntityExtractor(EntityExtractor):
             crf_format.append((token.text, tag, entity, pattern))
         return crf_format
 
-    def _train_model(self, df_train: List[List[Tuple[Text, Text, Text, Text]]]) -> None:
+    def _train_model(
+        self, df_train: List[List[Tuple[Text, Text, Text, Text]]], num_threads: int = 1
+    ) -> None:
         """Train the crf tagger based on the training data."""
         import sklearn_crfsuite
 
-        X_train = [self._sentence_to_features(sent) for sent in df_train]
+        X_train = self._dataset_to_features(df_train, num_threads)
         y_train = [self._sentence_to_labels(sent) for sent in df_train]
         self.ent_tagger = sklearn_crfsuite.CRF(
             algorithm="lbfgs",
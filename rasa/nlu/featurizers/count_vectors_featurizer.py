@@ -183,9 +183,9 @@ class CountVectorsFeaturizer(Featurizer):
     @staticmethod
     def _get_message_text(message):
         if message.get("spacy_doc"):  # if lemmatize is possible
-            return " ".join([t.lemma_ for t in message.get("spacy_doc")])
+            return " ".join(message.get_view("lemmas"))
         elif message.get("tokens"):  # if directly tokens is provided
-            return " ".join([t.text for t in message.get("tokens")])
+            return " ".join(message.get_view("token_texts"))
         else:
             return message.text
 
@@ -17,6 +17,8 @@ class MitieFeaturizer(Featurizer):
 
     requires = ["tokens", "mitie_feature_extractor"]
 
+    learns_from_data = False
+
     @classmethod
     def required_packages(cls) -> List[Text]:
         return ["mitie", "numpy"]
@@ -70,21 +70,25 @@ class RegexFeaturizer(Featurizer):
         message is tokenized, the function will mark all tokens with a dict
         relating the name of the regex to whether it was matched."""
 
+        tokens = message.get("tokens", [])
+        # fetch the pattern dict of each token once instead of per regex
+        token_patterns = [t.get("pattern", default={}) for t in tokens]
+
         found_patterns = []
         for exp in self.known_patterns:
-            matches = re.finditer(exp["pattern"], message.text)
-            matches = list(matches)
+            matches = list(re.finditer(exp["pattern"], message.text))
             found_patterns.append(False)
-            for token_index, t in enumerate(message.get("tokens", [])):
-                patterns = t.get("pattern", default={})
+            for t, patterns in zip(tokens, token_patterns):
                 patterns[exp["name"]] = False
 
                 for match in matches:
                     if t.offset < match.end() and t.end > match.start():
                         patterns[exp["name"]] = True
                         found_patterns[-1] = True
+                        break
 
-                t.set("pattern", patterns)
+        for t, patterns in zip(tokens, token_patterns):
+            t.set("pattern", patterns)
 
         return np.array(found_patterns).astype(float)
 
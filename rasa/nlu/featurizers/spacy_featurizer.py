@@ -27,6 +27,8 @@ class SpacyFeaturizer(Featurizer):
 
     requires = ["spacy_doc"]
 
+    learns_from_data = False
+
     def train(
         self, training_data: TrainingData, config: RasaNLUModelConfig, **kwargs: Any
     ) -> None:
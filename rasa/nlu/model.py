@@ -2,6 +2,7 @@ import copy
 import datetime
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 from typing import Dict
 from typing import List
@@ -14,6 +15,7 @@ from rasa.nlu import components, utils
 from rasa.nlu.components import Component, ComponentBuilder
 from rasa.nlu.config import RasaNLUModelConfig, component_config_from_pipeline
 from rasa.nlu.persistor import Persistor
+from rasa.nlu.profiling import PipelineProfiler
 from rasa.nlu.training_data import TrainingData, Message
 from rasa.nlu.utils import create_dir, write_json_to_file
 
@@ -116,6 +118,18 @@ class Metadata(object):
         write_json_to_file(filename, metadata, indent=4)
 
 
+def _copy_messages(data: TrainingData) -> TrainingData:
+    return TrainingData(
+        [
+            Message(m.text, dict(m.data), set(m.output_properties), m.time)
+            for m in data.training_examples
+        ],
+        copy.deepcopy(data.entity_synonyms),
+        copy.deepcopy(data.regex_features),
+        copy.deepcopy(data.lookup_tables),
+    )
+
+
 class Trainer(object):
     """Trainer will load the data and train all components.
 
@@ -165,13 +179,17 @@ class Trainer(object):
 
         return pipeline
 
-    def train(self, data: TrainingData, **kwargs: Any) -> "Interpreter":
-        """Trains the underlying pipeline using the provided training data."""
-
-        self.training_data = data
+    @property
+    def num_preprocessing_components(self) -> int:
+        """Number of leading pipeline components which do not learn from the
+        training data (e.g. tokenizers and pretrained featurizers)."""
 
-        self.training_data.validate()
+        for i, component in enumerate(self.pipeline):
+            if component.learns_from_data:
+                return i
+        return len(self.pipeline)
 
+    def _create_context(self, kwargs: Dict[Text, Any]) -> Dict[Text, Any]:
         context = kwargs
 
         for component in self.pipeline:
@@ -183,10 +201,18 @@ class Trainer(object):
         if not self.skip_validation:
             components.validate_arguments(self.pipeline, context)
 
-        # data gets modified internally during the training - hence the copy
-        working_data = copy.deepcopy(data)
+        return context
 
-        for i, component in enumerate(self.pipeline):
+    def _train_components(
+        self,
+        working_data: TrainingData,
+        context: Dict[Text, Any],
+        start: int = 0,
+        end: Optional[int] = None,
+    ) -> None:
+        for i, component in enumerate(self.pipeline[:end]):
+            if i < start:
+                continue
             logger.info("Starting to train component {}".format(component.name))
             component.prepare_partial_processing(self.pipeline[:i], context)
             updates = component.train(working_data, self.config, **context)
@@ -194,6 +220,47 @@ class Trainer(object):
             if updates:
                 context.update(updates)
 
+    def preprocess(self, data: TrainingData, **kwargs: Any) -> TrainingData:
+        """Processes a copy of the training data with the leading components
+        which do not learn from it.
+
+        Any subset of the returned examples (e.g. a cross validation fold)
+        can be passed to ``train(..., preprocessed=True)``, which then only
+        trains the remaining components."""
+
+        data.validate()
+        context = self._create_context(kwargs)
+
+        working_data = copy.deepcopy(data)
+        self._train_components(
+            working_data, context, end=self.num_preprocessing_components
+        )
+        return working_data
+
+    def train(
+        self, data: TrainingData, preprocessed: bool = False, **kwargs: Any
+    ) -> "Interpreter":
+        """Trains the underlying pipeline using the provided training data."""
+
+        self.training_data = data
+
+        self.training_data.validate()
+
+        context = self._create_context(kwargs)
+
+        if preprocessed:
+            # the components which are trained do not modify the properties
+            # set during the preprocessing in place, copying the messages is
+            # sufficient (deep copies of e.g. spaCy docs are expensive)
+            working_data = _copy_messages(data)
+            start = self.num_preprocessing_components
+        else:
+            # data gets modified internally during the training - hence the copy
+            working_data = copy.deepcopy(data)
+            start = 0
+
+        self._train_components(working_data, context, start)
+
         return Interpreter(self.pipeline, context)
 
     @staticmethod
@@ -280,6 +347,7 @@ class Interpreter(object):
         model_dir: Text,
         component_builder: Optional[ComponentBuilder] = None,
         skip_validation: bool = False,
+        num_threads: int = 1,
     ) -> "Interpreter":
         """Create an interpreter based on a persisted model.
 
@@ -290,6 +358,8 @@ class Interpreter(object):
             model_dir: The path of the model to load
             component_builder: The
                 :class:`rasa.nlu.components.ComponentBuilder` to use.
+            num_threads: Number of threads used to load independent
+                components in parallel.
 
         Returns:
             An interpreter that uses the loaded model.
@@ -298,15 +368,22 @@ class Interpreter(object):
         model_metadata = Metadata.load(model_dir)
 
         Interpreter.ensure_model_compatibility(model_metadata)
-        return Interpreter.create(model_metadata, component_builder, skip_validation)
+        return Interpreter.create(
+            model_metadata, component_builder, skip_validation, num_threads
+        )
 
     @staticmethod
     def create(
         model_metadata: Metadata,
         component_builder: Optional[ComponentBuilder] = None,
         skip_validation: bool = False,
+        num_threads: int = 1,
     ) -> "Interpreter":
-        """Load stored model and components defined by the provided metadata."""
+        """Load stored model and components defined by the provided metadata.
+
+        Components which do not provide any context to later components
+        (e.g. classifiers and extractors, but not the spaCy or MITIE
+        language models) are loaded in parallel if `num_threads > 1`."""
 
         context = {}
 
@@ -322,34 +399,84 @@ class Interpreter(object):
         if not skip_validation:
             components.validate_requirements(model_metadata.component_classes)
 
-        for i in range(model_metadata.number_of_components):
-            component_meta = model_metadata.for_component(i)
-            component = component_builder.load_component(
+        def load(component_meta: Dict[Text, Any]) -> Component:
+            return component_builder.load_component(
                 component_meta, model_metadata.model_dir, model_metadata, **context
             )
-            try:
-                updates = component.provide_context()
-                if updates:
-                    context.update(updates)
-                pipeline.append(component)
-            except components.MissingArgumentError as e:
-                raise Exception(
-                    "Failed to initialize component '{}'. "
-                    "{}".format(component.name, e)
-                )
+
+        if num_threads > 1:
+            stages = Interpreter._loading_stages(model_metadata)
+        else:
+            stages = [
+                [model_metadata.for_component(i)]
+                for i in range(model_metadata.number_of_components)
+            ]
+
+        with ThreadPoolExecutor(max_workers=max(num_threads, 1)) as executor:
+            for stage in stages:
+                if len(stage) == 1:
+                    loaded = [load(stage[0])]
+                else:
+                    # the context does not change within a stage, hence
+                    # every component sees the same context as if the
+                    # pipeline was loaded sequentially
+                    loaded = list(executor.map(load, stage))
+
+                for component in loaded:
+                    try:
+                        updates = component.provide_context()
+                        if updates:
+                            context.update(updates)
+                        pipeline.append(component)
+                    except components.MissingArgumentError as e:
+                        raise Exception(
+                            "Failed to initialize component '{}'. "
+                            "{}".format(component.name, e)
+                        )
 
         return Interpreter(pipeline, context, model_metadata)
 
+    @staticmethod
+    def _loading_stages(model_metadata: Metadata) -> List[List[Dict[Text, Any]]]:
+        """Split the pipeline into stages of components which can be
+        loaded in parallel.
+
+        A component that provides context for later components forms a
+        stage on its own."""
+
+        from rasa.nlu import registry
+
+        stages = []
+        current = []
+        for i in range(model_metadata.number_of_components):
+            component_meta = model_metadata.for_component(i)
+            component_class = registry.get_component_class(
+                component_meta.get("class", component_meta["name"])
+            )
+            if component_class.provide_context is not Component.provide_context:
+                if current:
+                    stages.append(current)
+                stages.append([component_meta])
+                current = []
+            else:
+                current.append(component_meta)
+        if current:
+            stages.append(current)
+        return stages
+
     def __init__(
         self,
         pipeline: List[Component],
         context: Optional[Dict[Text, Any]],
         model_metadata: Optional[Metadata] = None,
+        profiler: Optional[PipelineProfiler] = None,
     ) -> None:
 
         self.pipeline = pipeline
         self.context = context if context is not None else {}
         self.model_metadata = model_metadata
+        # measures the cost of each component if set
+        self.profiler = profiler
 
     def parse(
         self,
@@ -373,7 +500,10 @@ class Interpreter(object):
         message = Message(text, self.default_output_attributes(), time=time)
 
         for component in self.pipeline:
-            component.process(message, **self.context)
+            if self.profiler is not None and self.profiler.enabled:
+                self.profiler.process(component, message, **self.context)
+            else:
+                component.process(message, **self.context)
 
         output = self.default_output_attributes()
         output.update(message.as_dict(only_output_properties=only_output_properties))
@@ -14,6 +14,7 @@ from rasa.nlu import utils
 from rasa.nlu.classifiers.keyword_intent_classifier import KeywordIntentClassifier
 from rasa.nlu.components import ComponentBuilder
 from rasa.nlu.model import Interpreter, Metadata, MODEL_NAME_PREFIX
+from rasa.nlu.profiling import PipelineProfiler
 from rasa.nlu.utils import is_url
 from rasa.utils.endpoints import EndpointConfig
 from requests.exceptions import InvalidURL, RequestException
@@ -27,19 +28,22 @@ FALLBACK_MODEL_NAME = "fallback"
 DEFAULT_REQUEST_TIMEOUT = 60 * 5  # 5 minutes
 
 
-def interpreter_for_model(component_builder, model_dir):
+def interpreter_for_model(component_builder, model_dir, profiler=None):
     metadata = Metadata.load(model_dir)
-    return Interpreter.create(metadata, component_builder)
+    interpreter = Interpreter.create(metadata, component_builder)
+    interpreter.profiler = profiler
+    return interpreter
 
 
 async def load_from_server(
     component_builder: ComponentBuilder,
     model_server: EndpointConfig,
     wait_time_between_pulls: Optional[int] = None,
+    profiler: Optional[PipelineProfiler] = None,
 ) -> "NLUModel":
     """Load a persisted model from a server."""
 
-    nlu_model = NLUModel.fallback_model(component_builder)
+    nlu_model = NLUModel.fallback_model(component_builder, profiler)
 
     await _update_model_from_server(model_server, nlu_model, component_builder)
 
@@ -166,11 +170,14 @@ class NLUModel(object):
         interpreter: Interpreter,
         model_path: Optional[Text] = None,
         fingerprint: Optional[Text] = None,
+        profiler: Optional[PipelineProfiler] = None,
     ):
         self.name = model_name
         self.path = model_path
         self.interpreter = interpreter
         self.fingerprint = fingerprint
+        # passed to the interpreters of models loaded by `update_model`
+        self.profiler = profiler
 
         self._reader_lock = Lock()
         self._loader_lock = Lock()
@@ -234,7 +241,9 @@ class NLUModel(object):
 
         self._loader_lock.acquire()
         try:
-            self.interpreter = interpreter_for_model(component_builder, model_dir)
+            self.interpreter = interpreter_for_model(
+                component_builder, model_dir, self.profiler
+            )
             self.path = model_dir
             self.name = model_name
             status = True
@@ -246,7 +255,11 @@ class NLUModel(object):
         return status
 
     @staticmethod
-    def load_local_model(dir: Text, component_builder: ComponentBuilder) -> "NLUModel":
+    def load_local_model(
+        dir: Text,
+        component_builder: ComponentBuilder,
+        profiler: Optional[PipelineProfiler] = None,
+    ) -> "NLUModel":
         if os.path.isfile(dir):
             model_archive = dir
         else:
@@ -254,7 +267,7 @@ class NLUModel(object):
 
         if model_archive is None:
             logger.warning("Could not load local model in '{}'".format(dir))
-            return NLUModel.fallback_model(component_builder)
+            return NLUModel.fallback_model(component_builder, profiler)
 
         working_directory = tempfile.mkdtemp()
         unpacked_model = model.unpack_model(model_archive, working_directory)
@@ -263,13 +276,16 @@ class NLUModel(object):
         model_path = nlu_model if os.path.exists(nlu_model) else unpacked_model
 
         name = os.path.basename(model_archive)
-        interpreter = interpreter_for_model(component_builder, model_path)
+        interpreter = interpreter_for_model(component_builder, model_path, profiler)
 
-        return NLUModel(name, interpreter, model_path)
+        return NLUModel(name, interpreter, model_path, profiler=profiler)
 
     @staticmethod
     def load_from_remote_storage(
-        remote_storage: Text, component_builder: ComponentBuilder, model_name: Text
+        remote_storage: Text,
+        component_builder: ComponentBuilder,
+        model_name: Text,
+        profiler: Optional[PipelineProfiler] = None,
     ) -> "NLUModel":
         from rasa.nlu.persistor import get_persistor
 
@@ -277,14 +293,19 @@ class NLUModel(object):
         if p is not None:
             target_path = tempfile.mkdtemp()
             p.retrieve(model_name, target_path)
-            interpreter = interpreter_for_model(component_builder, target_path)
+            interpreter = interpreter_for_model(
+                component_builder, target_path, profiler
+            )
 
-            return NLUModel(model_name, interpreter, target_path)
+            return NLUModel(model_name, interpreter, target_path, profiler=profiler)
         else:
             raise RuntimeError("Unable to initialize persistor")
 
     @staticmethod
-    def fallback_model(component_builder: ComponentBuilder):
+    def fallback_model(
+        component_builder: ComponentBuilder,
+        profiler: Optional[PipelineProfiler] = None,
+    ):
         meta = Metadata(
             {
                 "pipeline": [
@@ -299,5 +320,6 @@ class NLUModel(object):
             "",
         )
         interpreter = Interpreter.create(meta, component_builder)
+        interpreter.profiler = profiler
 
-        return NLUModel(FALLBACK_MODEL_NAME, interpreter)
+        return NLUModel(FALLBACK_MODEL_NAME, interpreter, profiler=profiler)
@@ -0,0 +1,166 @@
+import bisect
+import itertools
+import logging
+import time
+import tracemalloc
+from collections import OrderedDict
+from typing import Any, Dict, List, Text, Tuple
+
+logger = logging.getLogger(__name__)
+
+# upper bounds (in seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+
+class ComponentStats(object):
+    """Accumulated measurements of a single pipeline component."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.calls = 0
+        self.total_time = 0.0
+        self.allocated_bytes = 0
+        self.buckets = buckets
+        # the last entry counts the calls slower than the largest bucket
+        self.bucket_counts = [0] * (len(buckets) + 1)
+
+    def add(self, duration: float, allocated_bytes: int = 0) -> None:
+        self.calls += 1
+        self.total_time += duration
+        self.allocated_bytes += allocated_bytes
+        self.bucket_counts[bisect.bisect_left(self.buckets, duration)] += 1
+
+    def cumulative_buckets(self) -> List[Tuple[Text, int]]:
+        """Return the histogram as `(upper bound, count)` pairs in which
+        each count includes all faster calls, as Prometheus expects it."""
+
+        bounds = [str(b) for b in self.buckets] + ["+Inf"]
+        counts = list(itertools.accumulate(self.bucket_counts))
+        return list(zip(bounds, counts))
+
+    def as_dict(self) -> Dict[Text, Any]:
+        return {
+            "calls": self.calls,
+            "total_time": self.total_time,
+            "mean_time": self.total_time / self.calls if self.calls else 0.0,
+            "allocated_bytes": self.allocated_bytes,
+            "histogram": OrderedDict(self.cumulative_buckets()),
+        }
+
+
+class PipelineProfiler(object):
+    """Measures the time and memory each pipeline component spends
+    processing messages.
+
+    Allocations are only tracked if `trace_allocations` is set, since
+    `tracemalloc` slows down the interpreter considerably. Profiling can
+    be switched on and off at runtime with `configure`."""
+
+    def __init__(self, enabled: bool = True, trace_allocations: bool = False) -> None:
+        self.enabled = enabled
+        self.trace_allocations = trace_allocations
+        self.stats = OrderedDict()  # type: Dict[Text, ComponentStats]
+        self._started_tracing = False
+
+    def configure(self, enabled: bool, trace_allocations: bool = False) -> None:
+        """Switch profiling and allocation tracing on or off."""
+
+        self.enabled = enabled
+        self.trace_allocations = enabled and trace_allocations
+        if not self.trace_allocations and self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def process(self, component, message, **kwargs: Any) -> None:
+        """Let `component` process `message` and record its cost."""
+
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+        if self.trace_allocations:
+            before, _ = tracemalloc.get_traced_memory()
+
+        start = time.perf_counter()
+        component.process(message, **kwargs)
+        duration = time.perf_counter() - start
+
+        allocated = 0
+        if self.trace_allocations:
+            after, _ = tracemalloc.get_traced_memory()
+            allocated = max(0, after - before)
+
+        self.record(component.name, duration, allocated)
+
+    def record(self, name: Text, duration: float, allocated_bytes: int = 0) -> None:
+        if name not in self.stats:
+            self.stats[name] = ComponentStats()
+        self.stats[name].add(duration, allocated_bytes)
+
+    def report(self) -> Dict[Text, Dict[Text, Any]]:
+        """Return the accumulated measurements per component."""
+
+        return OrderedDict(
+            (name, stats.as_dict()) for name, stats in self.stats.items()
+        )
+
+    def prometheus_text(self, prefix: Text = "rasa_nlu_component") -> Text:
+        """Return the measurements in the Prometheus text exposition format."""
+
+        lines = [
+            "# HELP {}_duration_seconds Time spent processing a message."
+            "".format(prefix),
+            "# TYPE {}_duration_seconds histogram".format(prefix),
+        ]
+        for name, stats in self.stats.items():
+            for bound, count in stats.cumulative_buckets():
+                lines.append(
+                    '{}_duration_seconds_bucket{{component="{}",le="{}"}} {}'
+                    "".format(prefix, name, bound, count)
+                )
+            lines.append(
+                '{}_duration_seconds_sum{{component="{}"}} {}'
+                "".format(prefix, name, stats.total_time)
+            )
+            lines.append(
+                '{}_duration_seconds_count{{component="{}"}} {}'
+                "".format(prefix, name, stats.calls)
+            )
+
+        lines.extend(
+            [
+                "# HELP {}_allocated_bytes_total Memory allocated while "
+                "processing messages.".format(prefix),
+                "# TYPE {}_allocated_bytes_total counter".format(prefix),
+            ]
+        )
+        for name, stats in self.stats.items():
+            lines.append(
+                '{}_allocated_bytes_total{{component="{}"}} {}'
+                "".format(prefix, name, stats.allocated_bytes)
+            )
+        return "\n".join(lines) + "\n"
+
+    def log_report(self) -> None:
+        for name, stats in self.report().items():
+            logger.info(
+                "{}: {} calls, {:.6f}s mean, {} bytes allocated"
+                "".format(
+                    name, stats["calls"], stats["mean_time"], stats["allocated_bytes"]
+                )
+            )
+
+    def reset(self) -> None:
+        self.stats.clear()
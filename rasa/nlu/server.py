@@ -238,6 +238,27 @@ def create_app(
     async def status(request):
         return response.json(data_router.get_status())
 
+    @app.get("/metrics")
+    @requires_auth(app, token)
+    async def metrics(request):
+        """Per component latency histograms in the Prometheus text format."""
+        return response.text(
+            data_router.profiler.prometheus_text(),
+            content_type="text/plain; version=0.0.4",
+        )
+
+    @app.put("/profiling")
+    @requires_auth(app, token)
+    async def configure_profiling(request):
+        """Enable or disable the profiling of parse requests at runtime."""
+        request_params = request.json or {}
+        data_router.configure_profiling(
+            bool(request_params.get("enabled", True)),
+            bool(request_params.get("trace_allocations", False)),
+            bool(request_params.get("reset", False)),
+        )
+        return response.json(data_router.get_status())
+
     def extract_data_and_config(request):
 
         request_content = request.body.decode("utf-8", "strict")
@@ -5,7 +5,6 @@ import json
 import os
 import logging
 import numpy as np
-import shutil
 from typing import List, Optional, Text, Union, Dict
 from tqdm import tqdm
 
@@ -14,6 +13,7 @@ from rasa.nlu.components import ComponentBuilder
 from rasa.nlu.config import RasaNLUModelConfig
 from rasa.nlu.extractors.crf_entity_extractor import CRFEntityExtractor
 from rasa.nlu.model import Interpreter, Trainer, TrainingData
+from rasa.utils.common import limited_threads
 
 logger = logging.getLogger(__name__)
 
@@ -87,6 +87,21 @@ def _add_arguments(parser):
         help="number of CV folds (crossvalidation only)",
     )
 
+    parser.add_argument(
+        "--worker-processes",
+        type=int,
+        default=1,
+        help="number of processes which train and evaluate the CV folds "
+        "in parallel (crossvalidation only)",
+    )
+
+    parser.add_argument(
+        "--random-seed",
+        type=int,
+        default=None,
+        help="seed of the CV fold split (crossvalidation only)",
+    )
+
     parser.add_argument(
         "--report",
         required=False,
@@ -609,26 +624,15 @@ def align_entity_predictions(targets, predictions, tokens, extractors):
              from the extractors
     """
 
-    true_token_labels = []
-    entities_by_extractors = {extractor: [] for extractor in extractors}
-    for p in predictions:
-        entities_by_extractors[p["extractor"]].append(p)
-    extractor_labels = {extractor: [] for extractor in extractors}
-    for t in tokens:
-        true_token_labels.append(determine_token_labels(t, targets, None))
-        for extractor, entities in entities_by_extractors.items():
-            extracted = determine_token_labels(t, entities, extractor)
-            extractor_labels[extractor].append(extracted)
-
-    return {
-        "target_labels": true_token_labels,
-        "extractor_labels": dict(extractor_labels),
-    }
+    return align_all_entity_predictions(
+        [targets], [predictions], [tokens], extractors
+    )[0]
 
 
 def align_all_entity_predictions(targets, predictions, tokens, extractors):
-    """ Aligns entity predictions to the message tokens for the whole dataset
-        using align_entity_predictions
+    """ Aligns entity predictions to the message tokens for the whole dataset.
+        The tokens of all messages are labeled in one pass per extractor,
+        with the same labels as `determine_token_labels` would assign.
     :param targets: list of lists of target entities
     :param predictions: list of lists of predicted entities
     :param tokens: list of original message tokens
@@ -637,11 +641,169 @@ def align_all_entity_predictions(targets, predictions, tokens, extractors):
              labels from the extractors
     """
 
-    aligned_predictions = []
-    for ts, ps, tks in zip(targets, predictions, tokens):
-        aligned_predictions.append(align_entity_predictions(ts, ps, tks, extractors))
+    messages = list(zip(targets, predictions, tokens))
+    tokens = [tks for _, _, tks in messages]
+
+    entities_by_extractors = {extractor: [] for extractor in extractors}
+    for _, ps, _ in messages:
+        for entities in entities_by_extractors.values():
+            entities.append([])
+        for p in ps:
+            entities_by_extractors[p["extractor"]][-1].append(p)
+
+    token_spans = _TokenSpans(tokens)
+    target_labels = _label_tokens(token_spans, [ts for ts, _, _ in messages], None)
+    extractor_labels = {
+        extractor: _label_tokens(token_spans, entities, extractor)
+        for extractor, entities in entities_by_extractors.items()
+    }
+
+    return [
+        {
+            "target_labels": target_labels[i],
+            "extractor_labels": {
+                extractor: labels[i] for extractor, labels in extractor_labels.items()
+            },
+        }
+        for i in range(len(messages))
+    ]
+
+
+class _TokenSpans(object):
+    """Offsets of the tokens of all messages as flat arrays."""
+
+    def __init__(self, tokens):
+        flat_tokens = list(itertools.chain.from_iterable(tokens))
+
+        self.num_tokens = np.array([len(tks) for tks in tokens], dtype=int)
+        self.start = np.array([t.offset for t in flat_tokens], dtype=np.int64)
+        self.end = np.array([t.end for t in flat_tokens], dtype=np.int64)
+        self.length = np.array([len(t.text) for t in flat_tokens], dtype=np.int64)
+        self.message = np.repeat(np.arange(len(tokens)), self.num_tokens)
+
+    def __len__(self):
+        return len(self.start)
+
+
+def _label_tokens(token_spans, entities, extractors):
+    """Determines the labels of the tokens of all messages.
+
+    The entities of all messages are sorted by their start, so the entities
+    which might intersect with a token are found by binary search instead
+    of comparing every token with every entity of its message.
+    :param token_spans: offsets of the tokens of all messages
+    :param entities: list of lists of entities found by a single extractor
+    :param extractors: the extractor which found the entities
+    :return: list of lists of token labels
+    """
+
+    num_tokens = token_spans.num_tokens
+    num_entities = np.array([len(es) for es in entities], dtype=int)
+    flat_entities = list(itertools.chain.from_iterable(entities))
+
+    if not len(token_spans) or not flat_entities:
+        return [["O"] * n for n in num_tokens]
+
+    token_start = token_spans.start
+    token_end = token_spans.end
+    token_length = token_spans.length
+    token_message = token_spans.message
+
+    entity_start = np.array([e["start"] for e in flat_entities], dtype=np.int64)
+    entity_end = np.array([e["end"] for e in flat_entities], dtype=np.int64)
+    entity_label = np.array([e["entity"] for e in flat_entities], dtype=object)
+    entity_message = np.repeat(np.arange(len(entities)), num_entities)
+
+    # spans of different messages must not intersect in the index
+    lowest = min(token_start.min(), entity_start.min(), entity_end.min())
+    width = max(token_end.max(), entity_start.max(), entity_end.max()) - lowest + 1
+
+    def index_key(message, position):
+        return message * width + position - lowest
+
+    entity_key = index_key(entity_message, entity_start)
+    # stable, entities with the same start keep their order
+    order = np.argsort(entity_key, kind="mergesort")
+    sorted_key = entity_key[order]
+    entity_first = np.concatenate([[0], np.cumsum(num_entities)[:-1]])
+
+    if not do_extractors_support_overlap(extractors):
+        _check_entities_do_not_overlap(
+            entity_start[order],
+            entity_end[order],
+            entity_label[order],
+            entity_message[order],
+            num_tokens,
+            flat_entities,
+            order,
+        )
+
+    # an entity can only intersect a token if it starts before the token
+    # ends and less than the length of the longest entity before it starts
+    max_length = max(0, (entity_end - entity_start).max())
+    first = entity_first[token_message]
+    last = first + num_entities[token_message]
+    lo = np.searchsorted(
+        sorted_key, index_key(token_message, token_start) - max_length, side="right"
+    )
+    hi = np.searchsorted(sorted_key, index_key(token_message, token_end), side="left")
+    lo = np.clip(lo, first, last)
+    hi = np.clip(hi, lo, last)
+    # tokens without text are within every entity of their message
+    empty = token_length == 0
+    lo[empty] = first[empty]
+    hi[empty] = last[empty]
+
+    counts = hi - lo
+    pair_token = np.repeat(np.arange(len(token_spans)), counts)
+    pair_entity = order[
+        np.repeat(lo - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+    ]
+
+    intersection = np.maximum(
+        0,
+        np.minimum(token_end[pair_token], entity_end[pair_entity])
+        - np.maximum(token_start[pair_token], entity_start[pair_entity]),
+    )
+    length = token_length[pair_token]
+    is_candidate = (intersection == length) | (
+        (intersection > 0) & (intersection < length)
+    )
+    pair_token = pair_token[is_candidate]
+    pair_entity = pair_entity[is_candidate]
+    intersection = intersection[is_candidate]
+
+    # the candidate with the largest intersection, the first one on ties
+    best = np.lexsort((pair_entity, -intersection, pair_token))
+    labeled_tokens, first_of_token = np.unique(pair_token[best], return_index=True)
 
-    return aligned_predictions
+    labels = np.full(len(token_spans), "O", dtype=object)
+    labels[labeled_tokens] = entity_label[pair_entity[best[first_of_token]]]
+
+    labels = labels.tolist()
+    bounds = np.concatenate([[0], np.cumsum(num_tokens)]).tolist()
+    return [labels[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def _check_entities_do_not_overlap(
+    start, end, label, message, num_tokens, entities, order
+):
+    """Raises a `ValueError` if neighbouring entities of a message with tokens
+    cross each others boundaries (see `do_entities_overlap`)."""
+
+    overlaps = np.flatnonzero(
+        (message[1:] == message[:-1])
+        & (start[1:] < end[:-1])
+        & (label[1:] != label[:-1])
+        & (num_tokens[message[1:]] > 0)
+    )
+    if len(overlaps):
+        i = overlaps[0]
+        logger.warning(
+            "Overlapping entity {} with {}"
+            "".format(entities[order[i]], entities[order[i + 1]])
+        )
+        raise ValueError("The possible entities should not overlap")
 
 
 def get_intent_targets(test_data):  # pragma: no cover
@@ -848,51 +1010,125 @@ def run_evaluation(
     return result
 
 
-def generate_folds(n, td):
-    """Generates n cross validation folds for training data td."""
-
+def _fold_indices(n, td, random_seed=None):
     from sklearn.model_selection import StratifiedKFold
 
-    skf = StratifiedKFold(n_splits=n, shuffle=True)
+    skf = StratifiedKFold(n_splits=n, shuffle=True, random_state=random_seed)
     x = td.intent_examples
     y = [example.get("intent") for example in x]
-    for i_fold, (train_index, test_index) in enumerate(skf.split(x, y)):
+    return list(skf.split(x, y))
+
+
+def _fold_data(td, examples, index):
+    return TrainingData(
+        training_examples=[examples[i] for i in index],
+        entity_synonyms=td.entity_synonyms,
+        regex_features=td.regex_features,
+    )
+
+
+def generate_folds(n, td, random_seed=None):
+    """Generates n cross validation folds for training data td.
+
+    The folds are the same for every call with the same `random_seed`."""
+
+    x = td.intent_examples
+    folds = _fold_indices(n, td, random_seed)
+    for i_fold, (train_index, test_index) in enumerate(folds):
         logger.debug("Fold: {}".format(i_fold))
-        train = [x[i] for i in train_index]
-        test = [x[i] for i in test_index]
-        yield (
-            TrainingData(
-                training_examples=train,
-                entity_synonyms=td.entity_synonyms,
-                regex_features=td.regex_features,
-            ),
-            TrainingData(
-                training_examples=test,
-                entity_synonyms=td.entity_synonyms,
-                regex_features=td.regex_features,
-            ),
-        )
+        yield (_fold_data(td, x, train_index), _fold_data(td, x, test_index))
 
 
-def combine_result(intent_results, entity_results, interpreter, data):
-    """Combines intent and entity result for crossvalidation folds"""
+class _FoldEvaluator(object):
+    """Trains and evaluates the pipeline on cross validation folds.
 
-    intent_current_result, entity_current_result = compute_metrics(interpreter, data)
+    The leading components of the pipeline which do not learn from the data
+    (e.g. tokenizers and pretrained featurizers) process the data only once,
+    the folds are built from the processed examples."""
 
-    intent_results = {
-        k: v + intent_results[k] for k, v in intent_current_result.items()
-    }
+    def __init__(self, data, nlu_config):
+        # cached components, e.g. spaCy models, are loaded only once
+        self.trainer = Trainer(nlu_config, ComponentBuilder(use_cache=True))
+        self.data = self.trainer.preprocess(data)
+        self.examples = self.data.intent_examples
 
-    for k, v in entity_current_result.items():
-        entity_results[k] = {
-            key: val + entity_results[k][key] for key, val in v.items()
-        }
+    def __call__(self, fold):
+        train_index, test_index = fold
+        train = _fold_data(self.data, self.examples, train_index)
+        test = _fold_data(self.data, self.examples, test_index)
+
+        interpreter = self.trainer.train(train, preprocessed=True)
+
+        # calculate train and test accuracy, the entity results are converted
+        # to plain dictionaries to send them between processes
+        results = []
+        for corpus in [train, test]:
+            intent_metrics, entity_metrics = compute_metrics(interpreter, corpus)
+            entity_metrics = {k: dict(v) for k, v in entity_metrics.items()}
+            results.append((intent_metrics, entity_metrics))
+        return results
+
+
+# fold evaluator of a cross validation worker process
+_fold_evaluator = None  # type: Optional[_FoldEvaluator]
+
+
+def _init_fold_evaluator(data, nlu_config):
+    global _fold_evaluator
 
-    return intent_results, entity_results
+    _fold_evaluator = _FoldEvaluator(data, nlu_config)
+
+
+def _evaluate_fold(fold):
+    return _fold_evaluator(fold)
+
+
+def _evaluate_folds(data, folds, nlu_config, worker_processes, num_threads):
+    """Returns the train and test metrics of each fold in the order of
+    the folds."""
+
+    if worker_processes <= 1:
+        evaluator = _FoldEvaluator(data, nlu_config)
+        return [evaluator(fold) for fold in folds]
+
+    import multiprocessing
+
+    if num_threads is None:
+        num_threads = max(1, (os.cpu_count() or 1) // worker_processes)
+
+    # forked processes would inherit e.g. initialized tensorflow or
+    # openmp thread pools of the parent
+    with limited_threads(num_threads):
+        pool = multiprocessing.get_context("spawn").Pool(
+            worker_processes,
+            initializer=_init_fold_evaluator,
+            initargs=(data, nlu_config),
+        )
+    try:
+        return pool.map(_evaluate_fold, folds, chunksize=1)
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _merge_fold_metrics(intent_results, entity_results, fold_metrics):
+    intent_metrics, entity_metrics = fold_metrics
+
+    for k, v in intent_metrics.items():
+        intent_results[k].extend(v)
+
+    for extractor, metrics in entity_metrics.items():
+        for k, v in metrics.items():
+            entity_results[extractor][k].extend(v)
 
 
 def cross_validate(
-    data: TrainingData, n_folds: int, nlu_config: Union[RasaNLUModelConfig, Text]
+    data: TrainingData,
+    n_folds: int,
+    nlu_config: Union[RasaNLUModelConfig, Text],
+    worker_processes: int = 1,
+    num_threads: Optional[int] = None,
+    random_seed: Optional[int] = None,
 ) -> CVEvaluationResult:
     """Stratified cross validation on data.
 
@@ -900,41 +1136,42 @@ def cross_validate(
         data: Training Data
         n_folds: integer, number of cv folds
         nlu_config: nlu config file
+        worker_processes: number of processes which train and evaluate
+            the folds in parallel
+        num_threads: maximum number of threads of the numerical libraries
+            in each worker process (defaults to an equal share of the CPUs)
+        random_seed: seed of the fold split, the results are reproducible
+            if the components of the pipeline are seeded as well
 
     Returns:
         dictionary with key, list structure, where each entry in list
               corresponds to the relevant result for one fold
     """
-    from collections import defaultdict
-    import tempfile
 
     if isinstance(nlu_config, str):
         nlu_config = config.load(nlu_config)
 
-    trainer = Trainer(nlu_config)
+    folds = _fold_indices(n_folds, data, random_seed)
+    worker_processes = min(worker_processes, len(folds))
+    fold_results = _evaluate_folds(
+        data, folds, nlu_config, worker_processes, num_threads
+    )
+
     intent_train_results = defaultdict(list)
     intent_test_results = defaultdict(list)
     entity_train_results = defaultdict(lambda: defaultdict(list))
     entity_test_results = defaultdict(lambda: defaultdict(list))
-    tmp_dir = tempfile.mkdtemp()
-
-    for train, test in generate_folds(n_folds, data):
-        interpreter = trainer.train(train)
-
-        # calculate train accuracy
-        intent_train_results, entity_train_results = combine_result(
-            intent_train_results, entity_train_results, interpreter, train
-        )
-        # calculate test accuracy
-        intent_test_results, entity_test_results = combine_result(
-            intent_test_results, entity_test_results, interpreter, test
-        )
 
-    shutil.rmtree(tmp_dir, ignore_errors=True)
+    for train_metrics, test_metrics in fold_results:
+        _merge_fold_metrics(intent_train_results, entity_train_results, train_metrics)
+        _merge_fold_metrics(intent_test_results, entity_test_results, test_metrics)
 
     return (
         CVEvaluationResult(dict(intent_train_results), dict(intent_test_results)),
-        CVEvaluationResult(dict(entity_train_results), dict(entity_test_results)),
+        CVEvaluationResult(
+            {k: dict(v) for k, v in entity_train_results.items()},
+            {k: dict(v) for k, v in entity_test_results.items()},
+        ),
     )
 
 
@@ -1055,7 +1292,11 @@ def main():
         data = training_data.load_data(cmdline_args.data)
         data = drop_intents_below_freq(data, cutoff=5)
         results, entity_results = cross_validate(
-            data, int(cmdline_args.folds), nlu_config
+            data,
+            int(cmdline_args.folds),
+            nlu_config,
+            cmdline_args.worker_processes,
+            random_seed=cmdline_args.random_seed,
         )
         logger.info("CV evaluation (n={})".format(cmdline_args.folds))
 
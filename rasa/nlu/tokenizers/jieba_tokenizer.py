@@ -23,6 +23,8 @@ class JiebaTokenizer(Tokenizer, Component):
 
     language_list = ["zh"]
 
+    learns_from_data = False
+
     defaults = {"dictionary_path": None}  # default don't load custom dictionary
 
     def __init__(self, component_config: Dict[Text, Any] = None) -> None:
@@ -10,6 +10,8 @@ class MitieTokenizer(Tokenizer, Component):
 
     provides = ["tokens"]
 
+    learns_from_data = False
+
     @classmethod
     def required_packages(cls) -> List[Text]:
         return ["mitie"]
@@ -16,6 +16,8 @@ class SpacyTokenizer(Tokenizer, Component):
 
     requires = ["spacy_doc"]
 
+    learns_from_data = False
+
     def train(
         self, training_data: TrainingData, config: RasaNLUModelConfig, **kwargs: Any
     ) -> None:
@@ -11,6 +11,8 @@ class WhitespaceTokenizer(Tokenizer, Component):
 
     provides = ["tokens"]
 
+    learns_from_data = False
+
     def train(
         self, training_data: TrainingData, config: RasaNLUModelConfig, **kwargs: Any
     ) -> None:
@@ -1,5 +1,6 @@
 import argparse
 import logging
+import typing
 from typing import Any, Optional, Text, Tuple, Union
 
 from rasa.nlu import config, utils
@@ -9,7 +10,9 @@ from rasa.nlu.model import Interpreter, Trainer
 from rasa.nlu.training_data import load_data
 from rasa.nlu.training_data.loading import load_data_from_endpoint
 from rasa.nlu.utils import read_endpoints
-from rasa.utils.endpoints import EndpointConfig
+
+if typing.TYPE_CHECKING:
+    from rasa.utils.endpoints import EndpointConfig
 
 logger = logging.getLogger(__name__)
 
@@ -136,7 +139,7 @@ def train(
     fixed_model_name: Optional[Text] = None,
     storage: Optional[Text] = None,
     component_builder: Optional[ComponentBuilder] = None,
-    training_data_endpoint: Optional[EndpointConfig] = None,
+    training_data_endpoint: Optional["EndpointConfig"] = None,
     **kwargs: Any
 ) -> Tuple[Trainer, Interpreter, Text]:
     """Loads the trainer and the data and runs the training of the model."""
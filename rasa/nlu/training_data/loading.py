@@ -1,6 +1,5 @@
 import json
 import logging
-import requests
 import typing
 from typing import Optional, Text
 
@@ -15,9 +14,9 @@ from rasa.nlu.training_data.formats.dialogflow import (
     DIALOGFLOW_INTENT_EXAMPLES,
     DIALOGFLOW_PACKAGE,
 )
-from rasa.utils.endpoints import EndpointConfig
 
 if typing.TYPE_CHECKING:
+    from rasa.utils.endpoints import EndpointConfig
     from rasa.nlu.training_data import TrainingData
     from rasa.nlu.training_data.formats.readerwriter import TrainingDataReader
 
@@ -65,9 +64,10 @@ def load_data(resource_name: Text, language: Optional[Text] = "en") -> "Training
 
 
 async def load_data_from_endpoint(
-    data_endpoint: EndpointConfig, language: Optional[Text] = "en"
+    data_endpoint: "EndpointConfig", language: Optional[Text] = "en"
 ) -> "TrainingData":
     """Load training data from a URL."""
+    import requests
 
     if not utils.is_url(data_endpoint.url):
         raise requests.exceptions.InvalidURL(data_endpoint.url)
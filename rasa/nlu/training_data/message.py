@@ -3,11 +3,31 @@
 from rasa.nlu.utils import ordered
 
 
+def _token_texts(message):
+    return [t.text for t in message.get("tokens", [])]
+
+
+def _lemmas(message):
+    if message.get("spacy_doc"):
+        return [t.lemma_ for t in message.get("spacy_doc")]
+    else:
+        return None
+
+
+# lazily computed views on a message which are shared between the pipeline
+# components, mapped to the message properties they are derived from
+MESSAGE_VIEWS = {
+    "token_texts": (("tokens",), _token_texts),
+    "lemmas": (("spacy_doc",), _lemmas),
+}
+
+
 class Message(object):
     def __init__(self, text, data=None, output_properties=None, time=None):
         self.text = text
         self.time = time
         self.data = data if data else {}
+        self._views = {}
 
         if output_properties:
             self.output_properties = output_properties
@@ -18,10 +38,28 @@ class Message(object):
         self.data[prop] = info
         if add_to_output:
             self.output_properties.add(prop)
+        self._invalidate_views(prop)
 
     def get(self, prop, default=None):
         return self.data.get(prop, default)
 
+    def get_view(self, name):
+        """Return a view of the message (e.g. the token texts).
+
+        Views are computed on first access and memoized until one of the
+        properties they are derived from is set again."""
+
+        if name not in self._views:
+            _, compute = MESSAGE_VIEWS[name]
+            self._views[name] = compute(self)
+        return self._views[name]
+
+    def _invalidate_views(self, prop):
+        if self._views:
+            for name in list(self._views):
+                if prop in MESSAGE_VIEWS[name][0]:
+                    del self._views[name]
+
     def as_dict(self, only_output_properties=False):
         if only_output_properties:
             d = {
@@ -13,8 +13,6 @@ import simplejson
 
 import rasa.utils.io
 
-from rasa.utils.endpoints import read_endpoint_config
-
 
 def add_logging_option_arguments(parser, default=logging.WARNING):
     """Add options to an argument parser to configure logging levels."""
@@ -326,6 +324,8 @@ def concat_url(base: Text, subpath: Optional[Text]) -> Text:
 
 
 def read_endpoints(endpoint_file: Text) -> "AvailableEndpoints":
+    from rasa.utils.endpoints import read_endpoint_config
+
     model = read_endpoint_config(endpoint_file, endpoint_type="model")
     data = read_endpoint_config(endpoint_file, endpoint_type="data")
 
@@ -14,6 +14,8 @@ class MitieNLP(Component):
 
     provides = ["mitie_feature_extractor", "mitie_file"]
 
+    learns_from_data = False
+
     defaults = {
         # name of the language model to load - this contains
         # the MITIE feature extractor
@@ -18,6 +18,8 @@ class SpacyNLP(Component):
 
     provides = ["spacy_doc", "spacy_nlp"]
 
+    learns_from_data = False
+
     defaults = {
         # name of the language model to load - if it is not set
         # we will be looking for a language model that is named
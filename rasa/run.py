@@ -1,6 +1,5 @@
 import logging
 import os
-import shutil
 import typing
 from typing import Dict, Text
 
@@ -72,11 +71,10 @@ def run(
     elif os.path.exists(nlu_path):
         rasa.nlu.run.run_cmdline(nlu_path)
 
-    shutil.rmtree(model_path)
-
 
 def create_agent(model: Text, endpoints: Text = None) -> "Agent":
     from rasa.core.interpreter import RasaNLUInterpreter
+    from rasa.core.reminders import ReminderStore
     from rasa.core.tracker_store import TrackerStore
     from rasa.core import broker
     from rasa.core.utils import AvailableEndpoints
@@ -96,10 +94,12 @@ def create_agent(model: Text, endpoints: Text = None) -> "Agent":
     _tracker_store = TrackerStore.find_tracker_store(
         None, _endpoints.tracker_store, _broker
     )
+    _reminder_store = ReminderStore.find_reminder_store(_endpoints.reminder_store)
 
     return Agent.load(
         core_path,
         generator=_endpoints.nlg,
         tracker_store=_tracker_store,
         action_endpoint=_endpoints.action,
+        reminder_store=_reminder_store,
     )
@@ -11,14 +11,16 @@ from rasa.cli.utils import minimal_kwargs
 logger = logging.getLogger(__name__)
 
 
-def test_compare(models: List[Text], stories: Text, output: Text):
+def test_compare(
+    models: List[Text], stories: Text, output: Text, worker_processes: int = 1
+):
     from rasa.core.test import compare, plot_curve
     import rasa.core.utils as core_utils
 
     model_directory = copy_models_to_compare(models)
 
     loop = asyncio.get_event_loop()
-    loop.run_until_complete(compare(model_directory, stories, output))
+    loop.run_until_complete(compare(model_directory, stories, output, worker_processes))
 
     story_n_path = os.path.join(model_directory, "num_stories.json")
     number_of_stories = core_utils.read_json_file(story_n_path)
@@ -74,7 +76,9 @@ def test_core(
         kwargs = minimal_kwargs(kwargs, rasa.core.test, ["stories", "agent"])
 
         loop.run_until_complete(
-            rasa.core.test(stories, _agent, out_directory=output, **kwargs)
+            rasa.core.test(
+                stories, _agent, out_directory=output, model_path=core_path, **kwargs
+            )
         )
     else:
         logger.error(
@@ -93,14 +97,22 @@ def test_nlu(model: Optional[Text], nlu_data: Optional[Text], kwargs: Optional[D
         run_evaluation(nlu_data, nlu_model, **kwargs)
 
 
-def test_nlu_with_cross_validation(config: Text, nlu: Text, folds: int = 3):
+def test_nlu_with_cross_validation(
+    config: Text,
+    nlu: Text,
+    folds: int = 3,
+    worker_processes: int = 1,
+    random_seed: Optional[int] = None,
+):
     import rasa.nlu.config
     import rasa.nlu.test as nlu_test
 
     nlu_config = rasa.nlu.config.load(config)
     data = rasa.nlu.training_data.load_data(nlu)
     data = nlu_test.drop_intents_below_freq(data, cutoff=5)
-    results, entity_results = nlu_test.cross_validate(data, int(folds), nlu_config)
+    results, entity_results = nlu_test.cross_validate(
+        data, int(folds), nlu_config, worker_processes, random_seed=random_seed
+    )
     logger.info("CV evaluation (n={})".format(folds))
 
     if any(results):
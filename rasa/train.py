@@ -1,8 +1,11 @@
 import asyncio
+import logging
+import multiprocessing
 import os
 import tempfile
+import traceback
 import typing
-from typing import Text, Optional, List, Union, Dict
+from typing import Callable, Text, Optional, List, Union, Dict, Tuple
 
 from rasa import model, data
 from rasa.cli.utils import (
@@ -20,6 +23,13 @@ from rasa.constants import (
     CONFIG_MANDATORY_KEYS_NLU,
     FALLBACK_CONFIG_PATH,
 )
+from rasa.utils.common import limited_threads
+
+logger = logging.getLogger(__name__)
+
+
+class TrainingFailed(Exception):
+    """Raised if a training which runs in a separate process fails."""
 
 
 def train(
@@ -29,10 +39,19 @@ def train(
     output: Text = DEFAULT_MODELS_PATH,
     force_training: bool = False,
     kwargs: Optional[Dict] = None,
+    archive_format: Text = model.DEFAULT_ARCHIVE_FORMAT,
 ) -> Optional[Text]:
     loop = asyncio.get_event_loop()
     return loop.run_until_complete(
-        train_async(domain, config, training_files, output, force_training, kwargs)
+        train_async(
+            domain,
+            config,
+            training_files,
+            output,
+            force_training,
+            kwargs,
+            archive_format,
+        )
     )
 
 
@@ -43,6 +62,7 @@ async def train_async(
     output: Text = DEFAULT_MODELS_PATH,
     force_training: bool = False,
     kwargs: Optional[Dict] = None,
+    archive_format: Text = model.DEFAULT_ARCHIVE_FORMAT,
 ) -> Optional[Text]:
     """Trains a Rasa model (Core and NLU).
 
@@ -53,6 +73,7 @@ async def train_async(
         output: Output path.
         force_training: If `True` retrain model even if data has not changed.
         kwargs: Additional training parameters.
+        archive_format: Format of the model archive (`gz`, `tar` or `zst`).
 
     Returns:
         Path of the trained model archive.
@@ -83,12 +104,12 @@ async def train_async(
         print_warning(
             "No dialogue data present. Just a Rasa NLU model will be trained."
         )
-        return train_nlu(config, nlu_data_directory, output, None)
+        return train_nlu(config, nlu_data_directory, output, None, archive_format)
 
     if nlu_data_not_present:
         print_warning("No NLU data present. Just a Rasa Core model will be trained.")
         return await train_core_async(
-            domain, config, story_directory, output, None, kwargs
+            domain, config, story_directory, output, None, kwargs, archive_format
         )
 
     if not force_training and old_model:
@@ -99,28 +120,39 @@ async def train_async(
         if not model.core_fingerprint_changed(last_fingerprint, new_fingerprint):
             target_path = os.path.join(train_path, "core")
             retrain_core = not model.merge_model(old_core, target_path)
+        else:
+            kwargs = _reuse_unchanged_policies(
+                last_fingerprint, new_fingerprint, old_core, config, kwargs
+            )
 
         if not model.nlu_fingerprint_changed(last_fingerprint, new_fingerprint):
             target_path = os.path.join(train_path, "nlu")
             retrain_nlu = not model.merge_model(old_nlu, target_path)
+        else:
+            _print_changed_nlu_components(last_fingerprint, new_fingerprint, config)
+
+    core_args = (domain, config, story_directory, output, train_path, kwargs)
+    nlu_args = (config, nlu_data_directory, output, train_path)
 
-    if force_training or retrain_core:
-        await train_core_async(
-            domain, config, story_directory, output, train_path, kwargs
+    if (force_training or retrain_core) and (force_training or retrain_nlu):
+        await train_in_parallel(
+            [("core", train_core, core_args), ("nlu", train_nlu, nlu_args)]
         )
-    else:
+    elif force_training or retrain_core:
+        await train_core_async(*core_args)
+    elif force_training or retrain_nlu:
+        train_nlu(*nlu_args)
+
+    if not (force_training or retrain_core):
         print (
             "Dialogue data / configuration did not change. "
             "No need to retrain dialogue model."
         )
-
-    if force_training or retrain_nlu:
-        train_nlu(config, nlu_data_directory, output, train_path)
-    else:
+    if not (force_training or retrain_nlu):
         print ("NLU data / configuration did not change. No need to retrain NLU model.")
 
     if retrain_core or retrain_nlu:
-        output = create_output_path(output)
+        output = create_output_path(output, archive_format=archive_format)
         model.create_package_rasa(train_path, output, new_fingerprint)
 
         print_success("Your bot is trained and ready to take for a spin!")
@@ -135,6 +167,163 @@ async def train_async(
         return old_model
 
 
+def _reuse_unchanged_policies(
+    last_fingerprint: model.Fingerprint,
+    new_fingerprint: model.Fingerprint,
+    old_core: Text,
+    config: Text,
+    kwargs: Optional[Dict],
+) -> Optional[Dict]:
+    """Add the policies of the last model which don't need to be retrained
+    to the training arguments."""
+
+    import rasa.utils.io
+
+    reusable = model.reusable_policies(last_fingerprint, new_fingerprint, old_core)
+    if not reusable:
+        return kwargs
+
+    policies = rasa.utils.io.read_yaml_file(config).get("policies", [])
+    print (
+        "Reusing {} of {} policies from the previous model: {}."
+        "".format(
+            len(reusable),
+            len(policies),
+            ", ".join(policies[i].get("name") for i in sorted(reusable)),
+        )
+    )
+
+    kwargs = dict(kwargs or {})
+    kwargs["reused_policies"] = reusable
+    return kwargs
+
+
+def _print_changed_nlu_components(
+    last_fingerprint: model.Fingerprint,
+    new_fingerprint: model.Fingerprint,
+    config: Text,
+) -> None:
+    import rasa.nlu.config
+
+    changed = model.changed_nlu_components(last_fingerprint, new_fingerprint)
+    if changed:
+        pipeline = rasa.nlu.config.load(config).pipeline
+        print (
+            "NLU components changed: {}. All components are retrained, since "
+            "each component is trained on the output of the ones before it."
+            "".format(", ".join(pipeline[i].get("name") for i in changed))
+        )
+
+
+async def train_in_parallel(
+    trainings: List[Tuple[Text, Callable, Tuple]],
+    num_threads: Optional[int] = None,
+) -> None:
+    """Run each training function in its own process.
+
+    The processes share the available CPUs, so the thread pools of
+    tensorflow and the numerical libraries are limited to `num_threads`
+    per process. If a training fails, the other trainings are stopped
+    and a `TrainingFailed` exception is raised.
+
+    Args:
+        trainings: Name, function and arguments of each training.
+        num_threads: Number of threads per process (defaults to an equal
+            share of the CPUs).
+    """
+
+    if num_threads is None:
+        num_threads = max(1, (os.cpu_count() or 1) // len(trainings))
+
+    # forking a process which already created tensorflow sessions
+    # leaves the child with broken thread pools
+    context = multiprocessing.get_context("spawn")
+    loglevel = logging.getLogger().getEffectiveLevel()
+    loop = asyncio.get_event_loop()
+
+    processes, results = [], []
+    for name, function, args in trainings:
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(
+            target=_train_in_process,
+            args=(name, function, args, sender, loglevel),
+            name="rasa-train-{}".format(name),
+        )
+        with limited_threads(num_threads):
+            process.start()
+        # only the child writes to the pipe, so `recv` fails if it dies
+        sender.close()
+        processes.append(process)
+        results.append(loop.run_in_executor(None, _receive_result, name, receiver))
+
+    try:
+        for result in asyncio.as_completed(results):
+            await result
+    finally:
+        for process in processes:
+            if process.is_alive():
+                logger.debug("Stopping training process '{}'.".format(process.name))
+                process.terminate()
+            process.join()
+        await asyncio.gather(*results, return_exceptions=True)
+
+
+def _train_in_process(
+    name: Text,
+    function: Callable,
+    args: Tuple,
+    sender: "multiprocessing.connection.Connection",
+    loglevel: int,
+) -> None:
+    try:
+        _configure_process_logging(name, loglevel)
+        function(*args)
+        sender.send(None)
+    except Exception:
+        sender.send(traceback.format_exc())
+    finally:
+        sender.close()
+
+
+def _receive_result(
+    name: Text, receiver: "multiprocessing.connection.Connection"
+) -> None:
+    try:
+        error = receiver.recv()
+    except EOFError:
+        error = "The process was stopped."
+    finally:
+        receiver.close()
+
+    if error is not None:
+        raise TrainingFailed("Training of {} failed.\n{}".format(name, error))
+
+
+class _PrefixFilter(logging.Filter):
+    def __init__(self, prefix: Text) -> None:
+        super(_PrefixFilter, self).__init__()
+        self.prefix = prefix
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # the same record is passed to every handler
+        if not getattr(record, "prefixed", False):
+            record.msg = "[{}] {}".format(self.prefix, record.msg)
+            record.prefixed = True
+        return True
+
+
+def _configure_process_logging(name: Text, loglevel: int) -> None:
+    """Configure the logging of a spawned process, prefixing each message
+    with `name` to tell the interleaved logs of the processes apart."""
+
+    import rasa.utils.io
+
+    rasa.utils.io.configure_colored_logging(loglevel)
+    prefix_filter = _PrefixFilter(name)
+    for handler in logging.getLogger().handlers:
+        handler.addFilter(prefix_filter)
+
+
 def train_core(
     domain: Text,
     config: Text,
@@ -142,10 +331,13 @@ def train_core(
     output: Text,
     train_path: Optional[Text],
     kwargs: Optional[Dict],
+    archive_format: Text = model.DEFAULT_ARCHIVE_FORMAT,
 ) -> Optional[Text]:
     loop = asyncio.get_event_loop()
     return loop.run_until_complete(
-        train_core_async(domain, config, stories, output, train_path, kwargs)
+        train_core_async(
+            domain, config, stories, output, train_path, kwargs, archive_format
+        )
     )
 
 
@@ -156,6 +348,7 @@ async def train_core_async(
     output: Text,
     train_path: Optional[Text] = None,
     kwargs: Optional[Dict] = None,
+    archive_format: Text = model.DEFAULT_ARCHIVE_FORMAT,
 ) -> Optional[Text]:
     """Trains a Core model.
 
@@ -167,6 +360,7 @@ async def train_core_async(
         train_path: If `None` the model will be trained in a temporary
             directory, otherwise in the provided directory.
         kwargs: Additional training parameters.
+        archive_format: Format of the model archive (`gz`, `tar` or `zst`).
 
     Returns:
         If `train_path` is given it returns the path to the model archive,
@@ -199,7 +393,9 @@ async def train_core_async(
 
     if not train_path:
         # Only Core was trained.
-        output_path = create_output_path(output, prefix="core-")
+        output_path = create_output_path(
+            output, prefix="core-", archive_format=archive_format
+        )
         new_fingerprint = model.model_fingerprint(
             config, domain, stories=story_directory
         )
@@ -213,8 +409,99 @@ async def train_core_async(
     return _train_path
 
 
+def continue_training(
+    model_path: Text,
+    stories: Text,
+    output: Text = DEFAULT_MODELS_PATH,
+    kwargs: Optional[Dict] = None,
+    archive_format: Text = model.DEFAULT_ARCHIVE_FORMAT,
+) -> Optional[Text]:
+    loop = asyncio.get_event_loop()
+    return loop.run_until_complete(
+        continue_training_async(model_path, stories, output, kwargs, archive_format)
+    )
+
+
+async def continue_training_async(
+    model_path: Text,
+    stories: Text,
+    output: Text = DEFAULT_MODELS_PATH,
+    kwargs: Optional[Dict] = None,
+    archive_format: Text = model.DEFAULT_ARCHIVE_FORMAT,
+) -> Optional[Text]:
+    """Continues training the Core model of a trained model on new stories.
+
+    The memoization policies memorize the new stories, the other policies
+    are trained on the new stories and a bounded sample of the stories
+    they were trained on before. The NLU model is copied unchanged.
+
+    Args:
+        model_path: Path to the trained model archive or to a directory of
+            models, in which case the latest model is used.
+        stories: Path to the new Core training data.
+        output: Output path.
+        kwargs: Additional training parameters, e.g. `epochs`, `batch_size`
+            and `augmentation_factor`.
+        archive_format: Format of the model archive (`gz`, `tar` or `zst`).
+
+    Returns:
+        Path of the new model archive.
+
+    """
+    from rasa.core.agent import Agent
+
+    kwargs = dict(kwargs or {})
+
+    unpacked = model.get_model(model_path)
+    if not unpacked:
+        print_error("No model found at '{}'.".format(model_path))
+        return
+
+    old_core, old_nlu = model.get_model_subdirectories(unpacked)
+    if not os.path.isdir(old_core):
+        print_error(
+            "The model at '{}' does not contain a Rasa Core model, hence its "
+            "training can not be continued.".format(model_path)
+        )
+        return
+
+    story_directory = data.get_core_directory(stories)
+    if not os.listdir(story_directory):
+        print_error(
+            "No dialogue data given. Please provide the new dialogue data "
+            "in order to continue the training."
+        )
+        return
+
+    train_path = tempfile.mkdtemp()
+    model.merge_model(old_nlu, os.path.join(train_path, "nlu"))
+
+    agent = Agent.load(old_core)
+    trackers = await agent.load_data(
+        story_directory, augmentation_factor=kwargs.pop("augmentation_factor", 0)
+    )
+    agent.continue_training(trackers, **kwargs)
+    agent.persist(os.path.join(train_path, "core"))
+
+    new_fingerprint = model.continued_training_fingerprint(
+        model.fingerprint_from_path(unpacked), story_directory
+    )
+    output_path = create_output_path(output, archive_format=archive_format)
+    model.create_package_rasa(train_path, output_path, new_fingerprint)
+    print_success(
+        "The training continued on {} new stories, the model is saved at "
+        "'{}'.".format(len(trackers), output_path)
+    )
+
+    return output_path
+
+
 def train_nlu(
-    config: Text, nlu_data: Text, output: Text, train_path: Optional[Text]
+    config: Text,
+    nlu_data: Text,
+    output: Text,
+    train_path: Optional[Text],
+    archive_format: Text = model.DEFAULT_ARCHIVE_FORMAT,
 ) -> Optional[Text]:
     """Trains a NLU model.
 
@@ -224,6 +511,7 @@ def train_nlu(
         output: Output path.
         train_path: If `None` the model will be trained in a temporary
             directory, otherwise in the provided directory.
+        archive_format: Format of the model archive (`gz`, `tar` or `zst`).
 
     Returns:
         If `train_path` is given it returns the path to the model archive,
@@ -249,7 +537,9 @@ def train_nlu(
     )
 
     if not train_path:
-        output_path = create_output_path(output, prefix="nlu-")
+        output_path = create_output_path(
+            output, prefix="nlu-", archive_format=archive_format
+        )
         new_fingerprint = model.model_fingerprint(config, nlu_data=nlu_data_directory)
         model.create_package_rasa(_train_path, output_path, new_fingerprint)
         print_success(
@@ -1,7 +1,7 @@
 import os
-from typing import Any, Callable, Dict, List, Text
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Text
 
-import rasa.core.utils
 import rasa.utils.io
 from rasa.constants import GLOBAL_USER_CONFIG_PATH
 
@@ -25,6 +25,7 @@ def read_global_config() -> Dict[Text, Any]:
 
 def write_global_config_value(name: Text, value: Any) -> None:
     """Read global Rasa configuration."""
+    import rasa.core.utils
 
     os.makedirs(os.path.dirname(GLOBAL_USER_CONFIG_PATH), exist_ok=True)
 
@@ -51,3 +52,41 @@ def read_global_config_value(name: Text, unavailable_ok: bool = True) -> Any:
         return c[name]
     else:
         return not_found()
+
+
+def limit_threads(num_threads: int) -> None:
+    """Limit the thread pools of the libraries used during training.
+
+    Has to be called before these libraries are imported. Values set by
+    the user take precedence."""
+
+    from rasa.utils import tf_graph
+
+    for variable in [
+        "OMP_NUM_THREADS",
+        "MKL_NUM_THREADS",
+        "OPENBLAS_NUM_THREADS",
+        tf_graph.ENV_INTRA_OP_THREADS,
+    ]:
+        os.environ.setdefault(variable, str(num_threads))
+    # the operations of the trained graphs mostly depend on each other
+    os.environ.setdefault(tf_graph.ENV_INTER_OP_THREADS, "1")
+
+
+@contextmanager
+def limited_threads(num_threads: int) -> Iterator[None]:
+    """Limit the thread pools of the libraries used by the processes
+    started within the context.
+
+    A spawned process imports these libraries while unpickling its target
+    and arguments, before any of its code runs. Hence the limits are set
+    in the environment of the current process, which started processes
+    inherit, and removed again when leaving the context."""
+
+    environment = dict(os.environ)
+    limit_threads(num_threads)
+    try:
+        yield
+    finally:
+        for variable in set(os.environ) - set(environment):
+            del os.environ[variable]
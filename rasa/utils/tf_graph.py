@@ -0,0 +1,114 @@
+import io
+import json
+import logging
+import os
+import typing
+from typing import Dict, Optional, Text, Tuple
+
+import rasa.utils.io
+
+if typing.TYPE_CHECKING:
+    import tensorflow as tf
+
+logger = logging.getLogger(__name__)
+
+# environment variables to override the thread counts of tf sessions,
+# e.g. to tune a model for the serving machine without retraining it
+ENV_INTRA_OP_THREADS = "TF_INTRA_OP_PARALLELISM_THREADS"
+ENV_INTER_OP_THREADS = "TF_INTER_OP_PARALLELISM_THREADS"
+
+
+def session_config(
+    tf_config: Optional["tf.ConfigProto"] = None
+) -> Optional["tf.ConfigProto"]:
+    """Apply the thread counts set in the environment to a session config.
+
+    Returns the passed config unchanged if none of the environment
+    variables is set."""
+
+    import tensorflow as tf
+
+    intra_op = os.environ.get(ENV_INTRA_OP_THREADS)
+    inter_op = os.environ.get(ENV_INTER_OP_THREADS)
+
+    if intra_op is None and inter_op is None:
+        return tf_config
+
+    config = tf.ConfigProto()
+    if tf_config is not None:
+        config.CopyFrom(tf_config)
+    if intra_op is not None:
+        config.intra_op_parallelism_threads = int(intra_op)
+    if inter_op is not None:
+        config.inter_op_parallelism_threads = int(inter_op)
+    return config
+
+
+def persist_frozen_graph(
+    session: "tf.Session",
+    graph: "tf.Graph",
+    tensors: Dict[Text, Optional["tf.Tensor"]],
+    path: Text,
+) -> None:
+    """Write an inference only version of a graph to `path`.
+
+    All variables are replaced by constants and everything that is not
+    needed to compute the passed `tensors` (e.g. losses and optimizers)
+    is removed. The names of the `tensors` are stored alongside, so they
+    can be looked up again in the loaded graph."""
+
+    import tensorflow as tf
+
+    tensors = {name: t for name, t in tensors.items() if t is not None}
+    output_nodes = sorted({t.op.name for t in tensors.values()})
+
+    with graph.as_default():
+        frozen_graph_def = tf.graph_util.convert_variables_to_constants(
+            session, graph.as_graph_def(), output_nodes
+        )
+
+    with tf.gfile.GFile(path, "wb") as f:
+        f.write(frozen_graph_def.SerializeToString())
+
+    tensor_names = {name: t.name for name, t in tensors.items()}
+    with io.open(_tensor_names_file(path), "w", encoding="utf-8") as f:
+        f.write(json.dumps(tensor_names, indent=2))
+    logger.debug(
+        "Persisted frozen graph with {} nodes to '{}'."
+        "".format(len(frozen_graph_def.node), path)
+    )
+
+
+def load_frozen_graph(
+    path: Text, tf_config: Optional["tf.ConfigProto"] = None
+) -> Tuple["tf.Graph", "tf.Session", Dict[Text, "tf.Tensor"]]:
+    """Load a graph written by `persist_frozen_graph`.
+
+    Returns the graph, a session to run it and the stored tensors."""
+
+    import tensorflow as tf
+
+    graph_def = tf.GraphDef()
+    with tf.gfile.GFile(path, "rb") as f:
+        graph_def.ParseFromString(f.read())
+
+    tensor_names = json.loads(rasa.utils.io.read_file(_tensor_names_file(path)))
+
+    graph = tf.Graph()
+    with graph.as_default():
+        tf.import_graph_def(graph_def, name="")
+        session = tf.Session(config=session_config(tf_config))
+
+    tensors = {
+        name: graph.get_tensor_by_name(tensor_name)
+        for name, tensor_name in tensor_names.items()
+    }
+    return graph, session, tensors
+
+
+def _tensor_names_file(path: Text) -> Text:
+    return path + ".tensors.json"
+
+
+def has_frozen_graph(path: Text) -> bool:
+    return os.path.exists(path) and os.path.exists(_tensor_names_file(path))
@@ -87,6 +87,7 @@ extras_requires = {
     "spacy": ["spacy>=2.0,<2.2"],
     "mitie": ["mitie"],
     "sql": ["psycopg2~=2.8.2"],
+    "zstd": ["zstandard~=0.11.0"],
 }
 
 setup(
@@ -0,0 +1,58 @@
+import subprocess
+import sys
+from typing import Dict, Text
+
+import pytest
+
+# generous upper bound in seconds, loading e.g. tensorflow exceeds it by far
+IMPORT_TIME_BUDGET = 1.5
+
+HEAVY_MODULES = ["tensorflow", "keras", "sklearn", "spacy", "mitie", "sanic"]
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (3, 7), reason="`-X importtime` requires python 3.7"
+)
+
+
+def _import_times(code: Text) -> Dict[Text, float]:
+    """Run `code` in a new interpreter and return the time in seconds
+    spent on importing each module (excluding its imports)."""
+
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    ).stderr
+
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_time, _, module = line[len("import time:") :].split("|")
+        if self_time.strip().isdigit():
+            times[module.strip()] = int(self_time) / 1e6
+    return times
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        # `rasa --help` and the argument parsing of all subcommands
+        "import rasa.__main__; rasa.__main__.create_argument_parser()",
+        "import rasa",
+    ],
+)
+def test_cli_import_time(code):
+    times = _import_times(code)
+
+    assert not [m for m in times if m.split(".")[0] in HEAVY_MODULES]
+    assert sum(times.values()) < IMPORT_TIME_BUDGET
+
+
+def test_policies_and_components_import_no_ml_libraries():
+    times = _import_times("import rasa.core.policies; import rasa.nlu.registry")
+
+    assert not [
+        m for m in times if m.split(".")[0] in ["tensorflow", "keras", "sklearn"]
+    ]
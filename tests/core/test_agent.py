@@ -128,6 +128,20 @@ async def test_agent_with_model_server_in_thread(
     jobs.kill_scheduler()
 
 
+async def test_agent_loads_model_from_server_with_loading_options(model_server):
+    model_endpoint_config = EndpointConfig.from_dict(
+        {"url": model_server.make_url("/model"), "wait_time_between_pulls": None}
+    )
+
+    agent = Agent(num_threads=2, lazy_policies=True)
+    await rasa.core.agent.load_from_server(agent, model_server=model_endpoint_config)
+
+    # the policies are loaded in the background until they are used
+    assert agent.policy_ensemble._loading_policies is not None
+    assert agent.policy_ensemble.policies
+    jobs.kill_scheduler()
+
+
 async def test_wait_time_between_pulls_without_interval(model_server, monkeypatch):
 
     monkeypatch.setattr(
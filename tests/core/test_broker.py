@@ -1,4 +1,5 @@
 import json
+import threading
 
 from rasa.core import broker
 from rasa.core.broker import FileProducer, PikaProducer, KafkaProducer
@@ -52,6 +53,7 @@ def test_file_broker_logs_to_file(tmpdir):
 
     for e in TEST_EVENTS:
         actual.publish(e.as_dict())
+    actual.flush()
 
     # reading the events from the file one event per line
     recovered = []
@@ -72,6 +74,7 @@ def test_file_broker_properly_logs_newlines(tmpdir):
     event_with_newline = UserUttered("hello \n there")
 
     actual.publish(event_with_newline.as_dict())
+    actual.flush()
 
     # reading the events from the file one event per line
     recovered = []
@@ -82,6 +85,26 @@ def test_file_broker_properly_logs_newlines(tmpdir):
     assert recovered == [event_with_newline]
 
 
+def test_file_broker_compresses_batches(tmpdir):
+    import gzip
+
+    fname = tmpdir.join("events.log.gz").strpath
+
+    actual = broker.from_endpoint_config(
+        EndpointConfig(**{"type": "file", "path": fname, "compression": "gzip"})
+    )
+
+    for e in TEST_EVENTS:
+        actual.publish(e.as_dict())
+    actual.close()
+
+    with gzip.open(fname, "rt") as f:
+        recovered = [Event.from_parameters(json.loads(l)) for l in f]
+
+    assert recovered == TEST_EVENTS
+    assert actual.metrics()["published"] == len(TEST_EVENTS)
+
+
 def test_load_custom_broker_name():
     config = EndpointConfig(**{"type": "rasa.core.broker.FileProducer"})
     assert broker.from_endpoint_config(config)
@@ -110,3 +133,197 @@ def test_kafka_broker_from_config():
     assert actual.sasl_username == expected.sasl_username
     assert actual.sasl_password == expected.sasl_password
     assert actual.topic == expected.topic
+
+
+class StandInBroker(object):
+    """Stands in for a RabbitMQ server by replacing `pika.BlockingConnection`.
+
+    Publishes fail while `failures` is positive, the connection is closed
+    by such a failure."""
+
+    def __init__(self, failures=0):
+        self.messages = []
+        self.connections = []
+        self.failures = failures
+        self.accepting = threading.Event()
+        self.accepting.set()
+
+    def __call__(self, parameters):
+        connection = StandInConnection(self)
+        self.connections.append(connection)
+        return connection
+
+
+class StandInConnection(object):
+    def __init__(self, broker):
+        self.broker = broker
+        self.is_closed = False
+        self.confirmed = False
+
+    def channel(self):
+        return self
+
+    def queue_declare(self, queue, durable=False):
+        pass
+
+    def confirm_delivery(self):
+        self.confirmed = True
+
+    def basic_publish(self, exchange, routing_key, body):
+        self.broker.accepting.wait()
+        if self.broker.failures > 0:
+            self.broker.failures -= 1
+            self.is_closed = True
+            raise ConnectionError("connection lost")
+        self.broker.messages.append((routing_key, json.loads(body)))
+        return True
+
+    def process_data_events(self, time_limit=None):
+        pass
+
+    def close(self):
+        self.is_closed = True
+
+
+def _pika_producer(monkeypatch, stand_in_broker, **kwargs):
+    import pika
+
+    monkeypatch.setattr(pika, "BlockingConnection", stand_in_broker)
+    return PikaProducer("localhost", "username", "password", "queue", **kwargs)
+
+
+def test_pika_producer_publishes_over_one_connection(monkeypatch):
+    stand_in_broker = StandInBroker()
+    producer = _pika_producer(monkeypatch, stand_in_broker, batch_size=2)
+
+    for e in TEST_EVENTS:
+        producer.publish(e.as_dict())
+    producer.close()
+
+    assert stand_in_broker.messages == [("queue", e.as_dict()) for e in TEST_EVENTS]
+    assert len(stand_in_broker.connections) == 1
+    assert stand_in_broker.connections[0].confirmed
+    assert stand_in_broker.connections[0].is_closed
+    assert producer.metrics()["published"] == len(TEST_EVENTS)
+
+
+def test_pika_producer_reconnects(monkeypatch):
+    stand_in_broker = StandInBroker(failures=2)
+    producer = _pika_producer(monkeypatch, stand_in_broker, retry_delay=0)
+
+    for e in TEST_EVENTS:
+        producer.publish(e.as_dict())
+    producer.flush()
+    producer.close()
+
+    assert stand_in_broker.messages == [("queue", e.as_dict()) for e in TEST_EVENTS]
+    metrics = producer.metrics()
+    assert metrics["connections"] == 3
+    assert metrics["failed_publishes"] == 2
+    assert metrics["dropped"] == 0
+
+
+def test_pika_producer_drops_events_if_broker_is_down_while_closing(monkeypatch):
+    stand_in_broker = StandInBroker(failures=1000)
+    producer = _pika_producer(monkeypatch, stand_in_broker, batch_size=1)
+
+    for e in TEST_EVENTS:
+        producer.publish(e.as_dict())
+    producer.close(timeout=10)
+
+    metrics = producer.metrics()
+    assert metrics["dropped"] == len(TEST_EVENTS)
+    assert metrics["queued"] == 0
+    # the first failure while closing drops the remaining events
+    assert metrics["failed_publishes"] <= 2
+
+
+def test_pika_producer_blocks_on_full_queue(monkeypatch):
+    stand_in_broker = StandInBroker()
+    stand_in_broker.accepting.clear()
+    producer = _pika_producer(
+        monkeypatch,
+        stand_in_broker,
+        max_queue_size=1,
+        batch_size=1,
+        publish_timeout=0.01,
+    )
+
+    for _ in range(4):
+        producer.publish(TEST_EVENTS[0].as_dict())
+    stand_in_broker.accepting.set()
+    producer.close()
+
+    metrics = producer.metrics()
+    assert metrics["blocked_publishes"] >= metrics["dropped"] >= 1
+    assert metrics["published"] + metrics["dropped"] == 4
+    assert metrics["queued"] == 0
+
+
+def test_pika_producer_drops_events_on_full_queue(monkeypatch):
+    stand_in_broker = StandInBroker()
+    stand_in_broker.accepting.clear()
+    producer = _pika_producer(
+        monkeypatch, stand_in_broker, max_queue_size=1, batch_size=1
+    )
+
+    for _ in range(4):
+        producer.publish(TEST_EVENTS[0].as_dict())
+    stand_in_broker.accepting.set()
+    producer.close()
+
+    metrics = producer.metrics()
+    assert metrics["blocked_publishes"] == 0
+    assert metrics["dropped"] >= 2
+    assert metrics["published"] + metrics["dropped"] == 4
+
+
+class RecordingEventChannel(broker.BatchingEventChannel):
+    def __init__(self, **kwargs):
+        super(RecordingEventChannel, self).__init__(**kwargs)
+        self.batches = []
+
+    def _publish_batch(self, batch):
+        if "fail" in batch[0]:
+            raise ValueError("broker failure")
+        self.batches.append(batch)
+        return len(batch)
+
+
+def test_batching_event_channel_lingers_for_full_batches():
+    channel = RecordingEventChannel(batch_size=3, linger=10)
+
+    for i in range(6):
+        channel.publish({"event": i})
+    channel.flush()
+
+    assert [len(batch) for batch in channel.batches] == [3, 3]
+
+
+def test_batching_event_channel_limits_batch_bytes():
+    channel = RecordingEventChannel(max_batch_bytes=20, linger=10)
+
+    for i in range(4):
+        channel.publish({"event": i})
+    channel.close()
+
+    # every event is 12 bytes long
+    assert [len(batch) for batch in channel.batches] == [2, 2]
+
+
+def test_batching_event_channel_counts_failed_publishes():
+    channel = RecordingEventChannel(batch_size=1)
+
+    channel.publish({"event": "fail"})
+    channel.publish({"event": "ok"})
+    channel.close()
+
+    metrics = channel.metrics()
+    assert metrics["failed_publishes"] == 1
+    assert metrics["dropped"] == 1
+    assert metrics["published"] == 1
+    assert metrics["queued"] == 0
+
+    # events published after closing are dropped
+    channel.publish({"event": "late"})
+    assert channel.metrics()["dropped"] == 2
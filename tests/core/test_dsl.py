@@ -5,10 +5,12 @@ import json
 from collections import Counter
 
 import numpy as np
+import pytest
 
 from rasa.core import training
 from rasa.core.events import ActionExecuted, UserUttered
-from rasa.core.training.structures import Story
+from rasa.core.training.generator import TrainingDataGenerator
+from rasa.core.training.structures import Story, STORY_START
 from rasa.core.featurizers import (
     MaxHistoryTrackerFeaturizer,
     BinarySingleStateFeaturizer,
@@ -179,6 +181,78 @@ async def test_generate_training_data_original_and_augmented_trackers(default_do
     assert len(training_trackers) <= 33
 
 
+async def test_copied_trackers_equal_replayed_trackers(default_domain):
+    training_trackers = await training.load_data(
+        "data/test_stories/stories_defaultdomain.md",
+        default_domain,
+        augmentation_factor=0,
+    )
+
+    for tracker in training_trackers:
+        copied = tracker.copy("copy")
+        replayed = tracker.init_copy()
+        replayed.sender_id = "copy"
+        for event in tracker.events:
+            replayed.update(event)
+
+        assert copied == replayed
+        assert copied.current_slot_values() == replayed.current_slot_values()
+        assert copied.latest_action_name == replayed.latest_action_name
+        assert copied.active_form == replayed.active_form
+        assert copied.past_states(default_domain) == replayed.past_states(
+            default_domain
+        )
+
+        # the copy is independent of the original tracker
+        copied.update(ActionExecuted("action_listen"))
+        assert len(copied.events) == len(tracker.events) + 1
+
+
+async def test_story_graph_connected_components(default_domain):
+    graph = await training.extract_story_graph(
+        "data/test_stories/stories.md", default_domain
+    )
+    components = graph.with_cycles_removed().connected_components()
+
+    steps = [s.id for c in components for s in c.story_steps]
+    assert sorted(steps) == sorted(s.id for s in graph.story_steps)
+
+    for component in components:
+        names = {cp.name for s in component.story_steps for cp in s.start_checkpoints}
+        for other in components:
+            if other is not component:
+                other_names = {
+                    cp.name for s in other.story_steps for cp in s.end_checkpoints
+                }
+                assert names & other_names <= {STORY_START}
+
+
+@pytest.mark.parametrize("unique_last_num_states", [None, 2])
+async def test_generate_training_data_in_parallel(
+    default_domain, unique_last_num_states
+):
+    graph = await training.extract_story_graph(
+        "data/test_stories/stories.md", default_domain
+    )
+
+    sequential = TrainingDataGenerator(
+        graph, default_domain, unique_last_num_states=unique_last_num_states
+    ).generate()
+    parallel = TrainingDataGenerator(
+        graph,
+        default_domain,
+        unique_last_num_states=unique_last_num_states,
+        worker_processes=2,
+    ).generate()
+
+    assert any(t.is_augmented for t in parallel)
+    assert [t.export_stories() for t in sequential] == [
+        t.export_stories() for t in parallel
+    ]
+    for t in parallel:
+        assert t.domain is default_domain
+
+
 async def test_visualize_training_data_graph(tmpdir, default_domain):
     graph = await training.extract_story_graph(
         "data/test_stories/stories_with_cycle.md", default_domain
@@ -261,3 +335,64 @@ async def test_load_training_data_handles_hidden_files(tmpdir, default_domain):
 
     assert len(data.X) == 0
     assert len(data.y) == 0
+
+
+async def test_read_story_file_parses_each_message_once(tmpdir, default_domain):
+    from rasa.core.interpreter import RegexInterpreter
+    from rasa.core.training.dsl import StoryFileReader
+
+    class CountingInterpreter(RegexInterpreter):
+        def __init__(self):
+            self.batches = []
+
+        async def parse(self, text, message_id=None):
+            raise AssertionError("Messages should be parsed in a batch.")
+
+        async def parse_batch(self, texts):
+            self.batches.append(texts)
+            return [await super(CountingInterpreter, self).parse(t) for t in texts]
+
+    story_file = os.path.join(tmpdir.strpath, "stories.md")
+    with open(story_file, "w") as f:
+        for i in range(10):
+            f.write("## story {}\n* greet\n  - utter_greet\n* /default\n".format(i))
+
+    interpreter = CountingInterpreter()
+    steps = await StoryFileReader.read_from_file(
+        story_file, default_domain, interpreter
+    )
+
+    assert len(steps) == 10
+    assert interpreter.batches == [["greet"]]
+    user_events = [e for s in steps for e in s.events if isinstance(e, UserUttered)]
+    assert {e.intent["name"] for e in user_events} == {"greet", "default"}
+    # messages with the same text must not share their parse data
+    assert user_events[0].parse_data is not user_events[2].parse_data
+
+
+async def test_stream_story_steps_from_folder(default_domain):
+    from rasa.core.training.dsl import StoryFileReader
+
+    folder = "data/test_multifile_stories"
+    streamed = []
+    async for step in StoryFileReader.stream_from_folder(folder, default_domain):
+        streamed.append(step)
+
+    steps = await StoryFileReader.read_from_folder(folder, default_domain)
+
+    assert streamed
+    assert [(s.block_name, s.events) for s in streamed] == [
+        (s.block_name, s.events) for s in steps
+    ]
+
+
+async def test_read_e2e_stories_keeps_true_intents(default_domain):
+    from rasa.core.training.dsl import StoryFileReader
+
+    steps = await StoryFileReader.read_from_file(
+        "data/test_evaluations/end_to_end_story.md", default_domain, use_e2e=True
+    )
+
+    user_events = [e for s in steps for e in s.events if isinstance(e, UserUttered)]
+    assert user_events
+    assert all("true_intent" in e.parse_data for e in user_events)
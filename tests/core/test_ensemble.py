@@ -38,6 +38,33 @@ def test_policy_loading_simple(tmpdir):
     assert original_policy_ensemble.policies == loaded_policy_ensemble.policies
 
 
+class TrainingCountingPolicy(WorkingPolicy):
+    def __init__(self, trained=False):
+        super(TrainingCountingPolicy, self).__init__()
+        self.trained = trained
+        self.loaded_from = None
+
+    @classmethod
+    def load(cls, path):
+        policy = TrainingCountingPolicy(trained=True)
+        policy.loaded_from = path
+        return policy
+
+    def train(self, training_trackers, domain, **kwargs):
+        self.trained = True
+
+
+def test_policy_ensemble_reuses_policies(default_domain):
+    tracker = DialogueStateTracker("default", default_domain.slots)
+    ensemble = PolicyEnsemble([TrainingCountingPolicy(), TrainingCountingPolicy()])
+
+    ensemble.train([tracker], default_domain, reused_policies={1: "old/policy_1"})
+
+    assert all(p.trained for p in ensemble.policies)
+    assert ensemble.policies[0].loaded_from is None
+    assert ensemble.policies[1].loaded_from == "old/policy_1"
+
+
 class ConstantPolicy(Policy):
     def __init__(self, priority: int = None, predict_index: int = None) -> None:
         super(ConstantPolicy, self).__init__(priority=priority)
@@ -158,3 +185,23 @@ def test_valid_policy_configurations(valid_config):
 def test_invalid_policy_configurations(invalid_config):
     with pytest.raises(InvalidPolicyConfig):
         PolicyEnsemble.from_dict(invalid_config)
+
+
+@pytest.mark.parametrize("num_threads, lazy", [(3, False), (1, True), (3, True)])
+def test_policy_loading_in_background(tmpdir, num_threads, lazy):
+    original_policy_ensemble = PolicyEnsemble(
+        [WorkingPolicy(), TrainingCountingPolicy(), WorkingPolicy()]
+    )
+    original_policy_ensemble.train([], None)
+    original_policy_ensemble.persist(str(tmpdir))
+
+    loaded_policy_ensemble = PolicyEnsemble.load(str(tmpdir), num_threads, lazy)
+
+    policies = loaded_policy_ensemble.policies
+    assert [type(p) for p in policies] == [
+        WorkingPolicy,
+        TrainingCountingPolicy,
+        WorkingPolicy,
+    ]
+    # the policies keep their order and directory
+    assert policies[1].loaded_from.endswith("policy_1_TrainingCountingPolicy")
@@ -1,13 +1,23 @@
 import os
+import random
+
+import pytest
 
 from rasa.core.server import nlu_model_and_evaluation_files_from_archive
-from rasa.core.test import _generate_trackers, collect_story_predictions, test
+from rasa.core.test import (
+    _EvaluationTracker,
+    _generate_trackers,
+    collect_story_predictions,
+    test,
+)
+from rasa.core.trackers import DialogueStateTracker
 from rasa.model import add_evaluation_file_to_model
 
 # we need this import to ignore the warning...
 # noinspection PyUnresolvedReferences
 from rasa.nlu.test import run_evaluation
 from tests.core.conftest import (
+    DEFAULT_DOMAIN_PATH,
     DEFAULT_STORIES_FILE,
     E2E_STORY_FILE_UNKNOWN_ENTITY,
     END_TO_END_STORY_FILE,
@@ -43,6 +53,114 @@ async def test_action_evaluation_script(tmpdir, default_agent):
     assert num_stories == 3
 
 
+async def test_action_evaluation_in_worker_processes(
+    default_agent, default_agent_path
+):
+    completed_trackers = await _generate_trackers(
+        DEFAULT_STORIES_FILE, default_agent, use_e2e=False
+    )
+    story_evaluation, _ = collect_story_predictions(completed_trackers, default_agent)
+    parallel_evaluation, num_stories = collect_story_predictions(
+        completed_trackers,
+        default_agent,
+        worker_processes=2,
+        model_path=default_agent_path,
+    )
+
+    assert parallel_evaluation.action_list == story_evaluation.action_list
+    assert len(parallel_evaluation.failed_stories) == 0
+    assert num_stories == 3
+
+
+@pytest.mark.parametrize(
+    "stories_file", [DEFAULT_STORIES_FILE, "data/test_stories/stories_restart.md"]
+)
+async def test_evaluation_tracker_caches_past_states(default_agent, stories_file):
+    domain = default_agent.domain
+    completed_trackers = await _generate_trackers(stories_file, default_agent)
+
+    for tracker in completed_trackers:
+        events = list(tracker.events)
+        cached = _EvaluationTracker.from_events(tracker.sender_id, [], domain.slots)
+        for i, event in enumerate(events):
+            cached.update(event)
+            replayed = DialogueStateTracker.from_events(
+                tracker.sender_id, events[: i + 1], domain.slots
+            )
+            assert cached.past_states(domain) == replayed.past_states(domain)
+
+
+def _comparison_policy_configs(tmpdir):
+    from rasa.core import utils
+
+    policy_configs = []
+    for policy in ["MemoizationPolicy", "AugmentedMemoizationPolicy"]:
+        config_path = os.path.join(tmpdir.strpath, policy + ".yml")
+        utils.dump_obj_as_yaml_to_file(config_path, {"policies": [{"name": policy}]})
+        policy_configs.append(config_path)
+    return policy_configs
+
+
+async def test_compare_models_in_worker_processes(tmpdir):
+    from rasa.core import utils
+    from rasa.core.test import compare
+    from rasa.core.train import train_comparison_models
+
+    models = os.path.join(tmpdir.strpath, "models")
+    await train_comparison_models(
+        DEFAULT_STORIES_FILE,
+        DEFAULT_DOMAIN_PATH,
+        models,
+        exclusion_percentages=[0, 50],
+        policy_configs=_comparison_policy_configs(tmpdir),
+        kwargs={"worker_processes": 2},
+    )
+
+    results = []
+    for worker_processes in [1, 2]:
+        output = os.path.join(tmpdir.strpath, "results_{}".format(worker_processes))
+        os.makedirs(output)
+        await compare(models, DEFAULT_STORIES_FILE, output, worker_processes)
+        results.append(utils.read_json_file(os.path.join(output, "results.json")))
+
+    assert results[0] == results[1]
+    assert set(results[0]) == {"MemoizationPolicy", "AugmentedMemoizationPolicy"}
+    # one run with a model for each exclusion percentage
+    assert [len(r) for r in results[0]["MemoizationPolicy"]] == [2]
+    # the test stories are the training stories
+    assert results[0]["MemoizationPolicy"][0][0] == 3
+
+
+async def test_comparison_models_trained_in_worker_processes_are_equal(tmpdir):
+    from rasa.core import utils
+    from rasa.core.test import compare
+    from rasa.core.train import train_comparison_models
+
+    policy_configs = _comparison_policy_configs(tmpdir)
+
+    results = []
+    for worker_processes in [1, 2]:
+        models = os.path.join(tmpdir.strpath, "models_{}".format(worker_processes))
+        # the same stories are excluded in both comparisons
+        random.seed(42)
+        await train_comparison_models(
+            DEFAULT_STORIES_FILE,
+            DEFAULT_DOMAIN_PATH,
+            models,
+            exclusion_percentages=[0, 50],
+            policy_configs=policy_configs,
+            runs=2,
+            kwargs={"worker_processes": worker_processes},
+        )
+
+        output = os.path.join(tmpdir.strpath, "results_{}".format(worker_processes))
+        os.makedirs(output)
+        await compare(models, DEFAULT_STORIES_FILE, output)
+        results.append(utils.read_json_file(os.path.join(output, "results.json")))
+
+    assert results[0] == results[1]
+
+
 async def test_end_to_end_evaluation_script(tmpdir, default_agent):
     completed_trackers = await _generate_trackers(
         END_TO_END_STORY_FILE, default_agent, use_e2e=True
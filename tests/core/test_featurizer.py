@@ -1,9 +1,16 @@
+import pytest
+
+from rasa.core import training
 from rasa.core.featurizers import (
     TrackerFeaturizer,
     BinarySingleStateFeaturizer,
     LabelTokenizerSingleStateFeaturizer,
+    FullDialogueTrackerFeaturizer,
+    MaxHistoryTrackerFeaturizer,
+    SingleStateFeaturizer,
 )
 import numpy as np
+from tests.core.conftest import DEFAULT_STORIES_FILE
 
 
 def test_fail_to_load_non_existent_featurizer():
@@ -109,3 +116,44 @@ def test_label_tokenizer_featurizer_handles_probabilistic_intents():
         {"intent_a": 0.5, "prev_b": 0.2, "intent_d": 1.0, "prev_action_listen": 1.0}
     )
     assert (encoded == np.array([0.5, 1.0, 1.5, 0.0, 0.2])).all()
+
+
+@pytest.mark.parametrize(
+    "featurizer",
+    [
+        MaxHistoryTrackerFeaturizer(BinarySingleStateFeaturizer(), max_history=3),
+        FullDialogueTrackerFeaturizer(LabelTokenizerSingleStateFeaturizer()),
+    ],
+)
+async def test_featurize_trackers_into_files(featurizer, default_domain, tmpdir):
+    trackers = await training.load_data(
+        DEFAULT_STORIES_FILE, default_domain, augmentation_factor=0
+    )
+
+    in_memory = featurizer.featurize_trackers(trackers, default_domain)
+    on_disk = featurizer.featurize_trackers(
+        trackers, default_domain, out_dir=tmpdir.strpath
+    )
+
+    assert isinstance(on_disk.X, np.memmap)
+    assert on_disk.X.dtype == in_memory.X.dtype
+    assert np.array_equal(on_disk.X, in_memory.X)
+    assert np.array_equal(on_disk.y, in_memory.y)
+    assert on_disk.true_length == in_memory.true_length
+    assert np.array_equal(np.load(tmpdir.join("X.npy").strpath), in_memory.X)
+    assert np.array_equal(np.load(tmpdir.join("y.npy").strpath), in_memory.y)
+
+
+def test_featurize_states_upcasts_float_features(tmpdir):
+    class FloatFeaturizer(SingleStateFeaturizer):
+        def encode(self, state):
+            return np.ones(2) * 0.5 if state.get("b") else np.zeros(2)
+
+    featurizer = TrackerFeaturizer(FloatFeaturizer())
+    states = [[{"a": 1}, {"a": 1}], [{"a": 1}, {"b": 1}]]
+
+    X, _ = featurizer._featurize_states(states, tmpdir.join("X.npy").strpath)
+
+    assert X.dtype == np.float64
+    assert np.array_equal(X[1, 1], [0.5, 0.5])
+    assert np.array_equal(np.load(tmpdir.join("X.npy").strpath), X)
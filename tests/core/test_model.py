@@ -5,6 +5,7 @@ import time
 import pytest
 
 import rasa
+import rasa.model
 import rasa.data as data
 import rasa.core
 import rasa.nlu
@@ -13,17 +14,23 @@ from rasa.model import (
     FINGERPRINT_CONFIG_KEY,
     FINGERPRINT_DOMAIN_KEY,
     FINGERPRINT_FILE_PATH,
+    FINGERPRINT_NLU_COMPONENTS_KEY,
     FINGERPRINT_NLU_DATA_KEY,
+    FINGERPRINT_POLICIES_KEY,
     FINGERPRINT_RASA_VERSION_KEY,
     FINGERPRINT_STORIES_KEY,
     FINGERPRINT_TRAINED_AT_KEY,
+    changed_nlu_components,
     core_fingerprint_changed,
     create_package_rasa,
+    fingerprint_from_path,
     get_latest_model,
     get_model,
     get_model_subdirectories,
     model_fingerprint,
     nlu_fingerprint_changed,
+    reusable_policies,
+    unpack_model,
 )
 
 
@@ -53,7 +60,15 @@ def test_get_model_from_directory_with_subdirectories(trained_model):
     assert os.path.exists(unpacked_nlu)
 
 
-def _fingerprint(config=None, domain=None, rasa_version="1.0", stories=None, nlu=None):
+def _fingerprint(
+    config=None,
+    domain=None,
+    rasa_version="1.0",
+    stories=None,
+    nlu=None,
+    policies=None,
+    nlu_components=None,
+):
     return {
         FINGERPRINT_CONFIG_KEY: config if config is not None else ["test"],
         FINGERPRINT_DOMAIN_KEY: domain if domain is not None else ["test"],
@@ -61,6 +76,10 @@ def _fingerprint(config=None, domain=None, rasa_version="1.0", stories=None, nlu
         FINGERPRINT_RASA_VERSION_KEY: rasa_version,
         FINGERPRINT_STORIES_KEY: stories if stories is not None else ["test"],
         FINGERPRINT_NLU_DATA_KEY: nlu if nlu is not None else ["test"],
+        FINGERPRINT_POLICIES_KEY: policies if policies is not None else ["test"],
+        FINGERPRINT_NLU_COMPONENTS_KEY: (
+            nlu_components if nlu_components is not None else ["test"]
+        ),
     }
 
 
@@ -79,11 +98,11 @@ def test_persist_and_load_fingerprint():
 @pytest.mark.parametrize(
     "fingerprint2",
     [
-        _fingerprint(config=["other"]),
+        _fingerprint(policies=["other"]),
         _fingerprint(domain=["other"]),
         _fingerprint(stories=["test", "other"]),
         _fingerprint(rasa_version="100"),
-        _fingerprint(config=["other"], domain=["other"]),
+        _fingerprint(policies=["other"], domain=["other"]),
     ],
 )
 def test_core_fingerprint_changed(fingerprint2):
@@ -91,13 +110,21 @@ def test_core_fingerprint_changed(fingerprint2):
     assert core_fingerprint_changed(fingerprint1, fingerprint2)
 
 
+def test_core_fingerprint_unchanged_if_only_nlu_config_changed():
+    fingerprint1 = _fingerprint()
+    fingerprint2 = _fingerprint(config=["other"], nlu_components=["other"])
+
+    assert not core_fingerprint_changed(fingerprint1, fingerprint2)
+    assert nlu_fingerprint_changed(fingerprint1, fingerprint2)
+
+
 @pytest.mark.parametrize(
     "fingerprint2",
     [
-        _fingerprint(config=["other"]),
+        _fingerprint(nlu_components=["other"]),
         _fingerprint(nlu=["test", "other"]),
         _fingerprint(rasa_version="100"),
-        _fingerprint(rasa_version="100", config=["other"]),
+        _fingerprint(rasa_version="100", nlu_components=["other"]),
     ],
 )
 def test_nlu_fingerprint_changed(fingerprint2):
@@ -105,6 +132,29 @@ def test_nlu_fingerprint_changed(fingerprint2):
     assert nlu_fingerprint_changed(fingerprint1, fingerprint2)
 
 
+def test_changed_nlu_components():
+    fingerprint1 = _fingerprint(nlu_components=["a", "b", "c"])
+    fingerprint2 = _fingerprint(nlu_components=["a", "b", "other"])
+
+    assert changed_nlu_components(fingerprint1, fingerprint2) == [2]
+
+
+def test_reusable_policies(trained_model):
+    unpacked = get_model(trained_model)
+    core, _ = get_model_subdirectories(unpacked)
+    fingerprint1 = fingerprint_from_path(unpacked)
+
+    policies = fingerprint1[FINGERPRINT_POLICIES_KEY]
+    assert len(policies) > 1
+    fingerprint2 = dict(fingerprint1)
+    fingerprint2[FINGERPRINT_POLICIES_KEY] = ["changed"] + policies[1:]
+
+    reusable = reusable_policies(fingerprint1, fingerprint2, core)
+
+    assert sorted(reusable.keys()) == list(range(1, len(policies)))
+    assert all(os.path.isdir(path) for path in reusable.values())
+
+
 def _project_files(
     project,
     config_file=DEFAULT_CONFIG_PATH,
@@ -141,7 +191,15 @@ def test_create_fingerprint_from_paths(project):
 def test_create_fingerprint_from_invalid_paths(project, project_files):
     project_files = _project_files(project, *project_files)
 
-    expected = _fingerprint([], [], rasa_version=rasa.__version__, stories=[], nlu=[])
+    expected = _fingerprint(
+        [],
+        [],
+        rasa_version=rasa.__version__,
+        stories=[],
+        nlu=[],
+        policies=[],
+        nlu_components=[],
+    )
 
     actual = model_fingerprint(**project_files)
     assert actual[FINGERPRINT_TRAINED_AT_KEY] is not None
@@ -176,3 +234,87 @@ def test_rasa_packaging(trained_model, project, use_fingerprint):
     assert os.path.exists(os.path.join(unpacked, "nlu"))
 
     assert not os.path.exists(unpacked_model_path)
+
+
+@pytest.mark.parametrize("extension", [".tar.gz", ".tar", ".tar.zst"])
+def test_rasa_packaging_formats(trained_model, extension):
+    if extension == ".tar.zst":
+        pytest.importorskip("zstandard")
+
+    model_path = tempfile.mkdtemp()
+    unpack_model(trained_model, model_path)
+    expected = sorted(os.listdir(model_path))
+
+    output_path = os.path.join(tempfile.mkdtemp(), "test" + extension)
+    create_package_rasa(model_path, output_path)
+
+    unpacked = unpack_model(output_path, tempfile.mkdtemp())
+    assert sorted(os.listdir(unpacked)) == expected
+
+
+@pytest.fixture
+def unpack_cache(monkeypatch):
+    cache = os.path.join(tempfile.mkdtemp(), "models")
+    monkeypatch.setattr(rasa.model, "UNPACK_CACHE_DIRECTORY", cache)
+    monkeypatch.setattr(rasa.model, "_cached_model_locks", {})
+    return cache
+
+
+def test_unpack_model_is_cached(trained_model, unpack_cache):
+    unpacked = unpack_model(trained_model)
+    fingerprint_file = os.path.join(unpacked, FINGERPRINT_FILE_PATH)
+    modified_time = os.path.getmtime(fingerprint_file)
+
+    assert os.path.dirname(unpacked) == unpack_cache
+    assert os.stat(unpack_cache).st_mode & 0o777 == 0o700
+    assert unpack_model(trained_model) == unpacked
+    assert os.path.getmtime(fingerprint_file) == modified_time
+
+
+def test_incompletely_unpacked_model_is_replaced(trained_model, unpack_cache):
+    target = os.path.join(unpack_cache, rasa.model._file_content_hash(trained_model))
+    os.makedirs(unpack_cache, mode=0o700)
+    os.mkdir(target)
+
+    assert unpack_model(trained_model) == target
+    assert os.path.exists(os.path.join(target, FINGERPRINT_FILE_PATH))
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="requires unix permissions")
+def test_unpack_cache_accessible_by_other_users_is_not_used(
+    trained_model, unpack_cache
+):
+    os.makedirs(unpack_cache)
+    os.chmod(unpack_cache, 0o777)
+
+    unpacked = unpack_model(trained_model)
+
+    assert os.path.dirname(unpacked) != unpack_cache
+    assert os.listdir(unpack_cache) == []
+
+
+def test_unpack_cache_evicts_least_recently_used_models(
+    trained_model, unpack_cache, monkeypatch
+):
+    pytest.importorskip("fcntl")
+    monkeypatch.setattr(rasa.model, "UNPACK_CACHE_MAX_MODELS", 2)
+
+    os.makedirs(unpack_cache, mode=0o700)
+    now = time.time()
+    for name, last_used in [("recent", now), ("old", now - 10), ("used", now - 20)]:
+        os.mkdir(os.path.join(unpack_cache, name))
+        os.utime(os.path.join(unpack_cache, name), (last_used, last_used))
+    # models locked by a running process are kept
+    lock_file = rasa.model._lock_cached_model(os.path.join(unpack_cache, "used"))
+
+    try:
+        unpacked = unpack_model(trained_model)
+    finally:
+        lock_file.close()
+
+    cached = [
+        name
+        for name in os.listdir(unpack_cache)
+        if os.path.isdir(os.path.join(unpack_cache, name))
+    ]
+    assert sorted(cached) == sorted([os.path.basename(unpacked), "recent", "used"])
@@ -175,6 +175,20 @@ class TestKerasPolicyWithTfConfig(PolicyTestCollection):
         # noinspection PyProtectedMember
         assert loaded.session._config == session_config()
 
+    def test_tf_config_thread_counts_from_environment(
+        self, trained_policy, tmpdir, monkeypatch
+    ):
+        trained_policy.persist(tmpdir.strpath)
+        monkeypatch.setenv("TF_INTRA_OP_PARALLELISM_THREADS", "2")
+        monkeypatch.setenv("TF_INTER_OP_PARALLELISM_THREADS", "1")
+        loaded = trained_policy.__class__.load(tmpdir.strpath)
+        # noinspection PyProtectedMember
+        assert loaded.session._config.intra_op_parallelism_threads == 2
+        # noinspection PyProtectedMember
+        assert loaded.session._config.inter_op_parallelism_threads == 1
+        # noinspection PyProtectedMember
+        assert loaded.session._config.gpu_options.allow_growth
+
 
 class TestFallbackPolicy(PolicyTestCollection):
     @pytest.fixture(scope="module")
@@ -450,6 +464,40 @@ class TestEmbeddingPolicyWithTfConfig(PolicyTestCollection):
         # noinspection PyProtectedMember
         assert loaded.session._config == session_config()
 
+    def test_persists_frozen_graph(self, trained_policy, tmpdir):
+        import os
+        from rasa.core.policies.embedding_policy import FROZEN_GRAPH_FILE_NAME
+
+        trained_policy.persist(tmpdir.strpath)
+        assert os.path.exists(os.path.join(tmpdir.strpath, FROZEN_GRAPH_FILE_NAME))
+
+        loaded = trained_policy.__class__.load(tmpdir.strpath)
+        # the loaded graph only contains what is needed for prediction
+        assert not loaded.graph.get_collection("trainable_variables")
+
+
+class TestEmbeddingPolicyWithBucketing(PolicyTestCollection):
+    @pytest.fixture(scope="module")
+    def create_policy(self, featurizer, priority):
+        # use standard featurizer from EmbeddingPolicy,
+        # since it is using FullDialogueTrackerFeaturizer
+        p = EmbeddingPolicy(priority=priority, bucket_by_dialogue_length=True)
+        return p
+
+    def test_batches_contain_dialogues_of_similar_length(self, trained_policy):
+        true_length = [5, 1, 3, 2, 4, 1, 5, 3, 2, 4]
+
+        batches = trained_policy._create_batch_ids(2, true_length)
+
+        assert sorted(i for b in batches for i in b) == list(range(10))
+        assert sorted(sorted(true_length[i] for i in b) for b in batches) == [
+            [1, 1],
+            [2, 2],
+            [3, 3],
+            [4, 4],
+            [5, 5],
+        ]
+
 
 class TestFormPolicy(PolicyTestCollection):
     @pytest.fixture(scope="module")
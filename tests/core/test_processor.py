@@ -5,7 +5,6 @@ from aioresponses import aioresponses
 
 import asyncio
 import rasa.utils.io
-from rasa.core import jobs
 from rasa.core.channels import CollectingOutputChannel, UserMessage
 from rasa.core.dispatcher import Button, Dispatcher
 from rasa.core.events import (
@@ -145,13 +144,13 @@ async def test_reminder_cancelled(default_processor):
         default_processor.tracker_store.save(t)
         d = Dispatcher(sender_id, out, default_processor.nlg)
         await default_processor._schedule_reminders(t.events, t, d)
-    # check that the jobs were added
-    assert len((await jobs.scheduler()).get_jobs()) == 2
+    # check that the reminders were added
+    assert len(default_processor.reminder_scheduler.store) == 2
 
     for t in trackers:
         await default_processor._cancel_reminders(t.events, t)
-    # check that only one job was removed
-    assert len((await jobs.scheduler()).get_jobs()) == 1
+    # check that only one reminder was removed
+    assert len(default_processor.reminder_scheduler.store) == 1
 
     # execute the jobs
     await asyncio.sleep(3)
@@ -0,0 +1,225 @@
+import asyncio
+import datetime
+import time
+
+import pytest
+
+from rasa.core.channels import CollectingOutputChannel, RestInput
+from rasa.core.dispatcher import Dispatcher
+from rasa.core.events import ReminderScheduled
+from rasa.core.reminders import (
+    InMemoryReminderStore,
+    ReminderScheduler,
+    ReminderStore,
+    ScheduledReminder,
+    SQLReminderStore,
+    trigger_time,
+)
+from rasa.utils.endpoints import EndpointConfig
+
+
+def reminder(action_name, seconds_from_now=-1, name=None):
+    date = datetime.datetime.now() + datetime.timedelta(seconds=seconds_from_now)
+    return ReminderScheduled(action_name, date, name=name)
+
+
+@pytest.fixture(params=["memory", "sql"])
+def store(request, tmpdir):
+    if request.param == "sql":
+        return SQLReminderStore(db=tmpdir.join("rasa.db").strpath)
+    return InMemoryReminderStore()
+
+
+class RecordingProcessor(object):
+    def __init__(self):
+        self.nlg = None
+        self.handled = []
+
+    async def handle_reminder(self, reminder_event, dispatcher):
+        self.handled.append((dispatcher.sender_id, reminder_event.name, dispatcher))
+
+
+def test_find_reminder_store(tmpdir):
+    assert isinstance(ReminderStore.find_reminder_store(), InMemoryReminderStore)
+
+    config = EndpointConfig(type="SQL", db=tmpdir.join("rasa.db").strpath)
+    assert isinstance(ReminderStore.find_reminder_store(config), SQLReminderStore)
+
+
+def test_claim_due_reminders_in_order_of_their_trigger_time(store):
+    for i, seconds in enumerate([-1, -3, 60, -2]):
+        store.schedule(ScheduledReminder("u", reminder("a", seconds, str(i)), "rest"))
+
+    now = datetime.datetime.now().timestamp()
+    due = store.claim_due(now, limit=2)
+    assert [s.reminder.name for s in due] == ["1", "3"]
+    assert due[0].sender_id == "u"
+    assert due[0].output_channel == "rest"
+    assert due[0].reminder == reminder("a", name="1")
+
+    assert [s.reminder.name for s in store.claim_due(now, limit=2)] == ["0"]
+    assert store.claim_due(now, limit=2) == []
+    assert store.next_trigger_time() > now
+
+
+def test_scheduling_reminder_with_same_name_replaces_it(store):
+    store.schedule(ScheduledReminder("u", reminder("a", -1, "r"), "rest"))
+    replaced = reminder("b", 60, "r")
+    store.schedule(ScheduledReminder("u", replaced, "rest"))
+
+    now = datetime.datetime.now().timestamp()
+    assert store.claim_due(now, limit=10) == []
+    assert store.next_trigger_time() == trigger_time(replaced)
+    assert store.cancel("u", "a") == []
+    assert store.cancel("u", "b") == ["r"]
+    assert store.next_trigger_time() is None
+
+
+def test_cancel_reminders_of_conversation_and_action(store):
+    store.schedule(ScheduledReminder("u1", reminder("a", name="1"), "rest"))
+    store.schedule(ScheduledReminder("u1", reminder("a", name="2"), "rest"))
+    store.schedule(ScheduledReminder("u1", reminder("b", name="3"), "rest"))
+    store.schedule(ScheduledReminder("u2", reminder("a", name="4"), "rest"))
+
+    assert sorted(store.cancel("u1", "a")) == ["1", "2"]
+    assert store.cancel("u1", "a") == []
+
+    now = datetime.datetime.now().timestamp()
+    assert [s.reminder.name for s in store.claim_due(now, limit=10)] == ["3", "4"]
+
+
+def test_completed_reminders_are_not_claimed_again(tmpdir):
+    store = SQLReminderStore(db=tmpdir.join("rasa.db").strpath, claim_timeout=60)
+    store.schedule(ScheduledReminder("u", reminder("a", name="1"), "rest"))
+
+    now = datetime.datetime.now().timestamp()
+    [scheduled] = store.claim_due(now, limit=10)
+    assert store.claim_due(now, limit=10) == []
+    assert store.next_trigger_time() > now + 59
+
+    store.complete(scheduled)
+    assert store.next_trigger_time() is None
+
+
+def test_reminders_are_claimed_again_if_not_completed(tmpdir):
+    db = tmpdir.join("rasa.db").strpath
+    store = SQLReminderStore(db=db, claim_timeout=0.1)
+    store.schedule(ScheduledReminder("u", reminder("a", name="1"), "rest"))
+
+    now = datetime.datetime.now().timestamp()
+    assert len(store.claim_due(now, limit=10)) == 1
+
+    # e.g. the instance which claimed the reminder crashed
+    restarted = SQLReminderStore(db=db, claim_timeout=0.1)
+    assert restarted.claim_due(now, limit=10) == []
+    time.sleep(0.2)
+    [scheduled] = restarted.claim_due(time.time(), limit=10)
+    assert scheduled.reminder.name == "1"
+
+
+def test_complete_keeps_rescheduled_reminder(tmpdir):
+    store = SQLReminderStore(db=tmpdir.join("rasa.db").strpath)
+    store.schedule(ScheduledReminder("u", reminder("a", name="r"), "rest"))
+
+    now = datetime.datetime.now().timestamp()
+    [scheduled] = store.claim_due(now, limit=10)
+    rescheduled = reminder("a", 60, "r")
+    store.schedule(ScheduledReminder("u", rescheduled, "rest"))
+    store.complete(scheduled)
+
+    assert store.next_trigger_time() == trigger_time(rescheduled)
+
+
+def test_in_memory_store_drops_cancelled_reminders():
+    store = InMemoryReminderStore()
+    for i in range(5000):
+        store.schedule(ScheduledReminder(str(i), reminder("a", 60), "rest"))
+        store.cancel(str(i), "a")
+
+    assert len(store) == 0
+    assert len(store._queue) <= 1000
+    assert store.next_trigger_time() is None
+
+
+async def test_scheduler_fires_due_reminders_in_batches():
+    processor = RecordingProcessor()
+    scheduler = ReminderScheduler(
+        create_processor=lambda: processor, batch_size=2, poll_interval=0.05
+    )
+
+    for i in range(5):
+        sender_id = "u{}".format(i % 2)
+        dispatcher = Dispatcher(sender_id, CollectingOutputChannel(), None)
+        scheduler.schedule(reminder("a", -5 + i, str(i)), sender_id, dispatcher)
+    scheduler.schedule(reminder("a", 60, "later"), "u0", dispatcher)
+
+    await asyncio.sleep(0.3)
+    scheduler.stop()
+
+    handled = [(sender_id, name) for sender_id, name, _ in processor.handled]
+    assert sorted(handled) == [
+        ("u0", "0"),
+        ("u0", "2"),
+        ("u0", "4"),
+        ("u1", "1"),
+        ("u1", "3"),
+    ]
+    # reminders of a conversation are handled in order
+    assert [n for s, n in handled if s == "u0"] == ["0", "2", "4"]
+    assert len(scheduler.store) == 1
+
+
+async def test_scheduler_does_not_fire_cancelled_reminders():
+    processor = RecordingProcessor()
+    scheduler = ReminderScheduler(
+        create_processor=lambda: processor, poll_interval=0.05
+    )
+
+    dispatcher = Dispatcher("u", CollectingOutputChannel(), None)
+    scheduler.schedule(reminder("a", 0.1, "1"), "u", dispatcher)
+    scheduler.schedule(reminder("b", 0.1, "2"), "u", dispatcher)
+    scheduler.cancel("a", "u")
+
+    await asyncio.sleep(0.3)
+    scheduler.stop()
+
+    assert [name for _, name, _ in processor.handled] == ["2"]
+    assert processor.handled[0][2] is dispatcher
+
+
+async def test_scheduler_fires_reminders_persisted_before_restart(tmpdir):
+    db = tmpdir.join("rasa.db").strpath
+    SQLReminderStore(db=db).schedule(
+        ScheduledReminder("u", reminder("a", name="1"), RestInput.name())
+    )
+
+    processor = RecordingProcessor()
+    scheduler = ReminderScheduler(
+        SQLReminderStore(db=db), lambda: processor, poll_interval=0.05
+    )
+    scheduler.start()
+
+    await asyncio.sleep(0.3)
+    scheduler.stop()
+
+    [(sender_id, name, dispatcher)] = processor.handled
+    assert (sender_id, name) == ("u", "1")
+    # the output channel of the conversation isn't available anymore
+    assert isinstance(dispatcher.output_channel, CollectingOutputChannel)
+    # the reminder is removed once it is handled
+    assert scheduler.store.next_trigger_time() is None
+
+
+async def test_scheduler_keeps_bounded_number_of_dispatchers():
+    scheduler = ReminderScheduler(
+        create_processor=RecordingProcessor, max_dispatchers=2
+    )
+
+    for i in range(3):
+        dispatcher = Dispatcher("u", CollectingOutputChannel(), None)
+        scheduler.schedule(reminder("a", 60, str(i)), "u", dispatcher)
+    scheduler.schedule(reminder("a", 60, "1"), "u", dispatcher)
+    scheduler.stop()
+
+    assert list(scheduler._dispatchers) == ["2", "1"]
+    assert len(scheduler.store) == 3
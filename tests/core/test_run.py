@@ -40,3 +40,12 @@ def test_create_single_input_channels_by_class_wo_credentials():
 
     assert len(channels) == 1
     assert channels[0].name() == "rest"
+
+
+def test_startup_timer_reports_phases():
+    timer = run.StartupTimer()
+    assert timer.timed("nlu model", lambda x: x + 1, 1) == 2
+
+    report = timer.report()
+    assert report.startswith("Server is ready after")
+    assert "nlu model: " in report
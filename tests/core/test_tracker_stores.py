@@ -1,3 +1,4 @@
+from rasa.core.broker import EventChannel
 from rasa.core.channels import UserMessage
 from rasa.core.domain import Domain
 from rasa.core.events import SlotSet, ActionExecuted, Restarted
@@ -6,6 +7,7 @@ from rasa.core.tracker_store import (
     InMemoryTrackerStore,
     RedisTrackerStore,
 )
+from rasa.core.trackers import DialogueStateTracker
 from rasa.utils.endpoints import EndpointConfig, read_endpoint_config
 from tests.core.conftest import DEFAULT_ENDPOINTS_FILE
 
@@ -120,3 +122,114 @@ def test_tracker_store_from_invalid_string(default_domain):
     tracker_store = TrackerStore.find_tracker_store(default_domain, store_config)
 
     assert isinstance(tracker_store, InMemoryTrackerStore)
+
+
+class RecordingEventChannel(EventChannel):
+    def __init__(self):
+        self.published = []
+
+    def publish(self, event):
+        self.published.append(event)
+
+
+class CountingTrackerStore(InMemoryTrackerStore):
+    num_retrieved = 0
+
+    def retrieve(self, sender_id):
+        self.num_retrieved += 1
+        return super(CountingTrackerStore, self).retrieve(sender_id)
+
+
+def test_stream_events_without_retrieving_the_stored_tracker(default_domain):
+    broker = RecordingEventChannel()
+    store = CountingTrackerStore(default_domain, event_broker=broker)
+
+    tracker = store.get_or_create_tracker("myuser")
+    tracker.update(SlotSet("location", "Easter Island"))
+    store.save(tracker)
+    tracker.update(Restarted())
+    store.save(tracker)
+
+    tracker = store.get_or_create_tracker("myuser")
+    tracker.update(ActionExecuted("action_listen"))
+    store.save(tracker)
+
+    assert [e["event"] for e in broker.published] == [
+        "action",
+        "slot",
+        "restart",
+        "action",
+    ]
+    # only `get_or_create_tracker` retrieved the tracker
+    assert store.num_retrieved == 2
+
+
+def test_stream_events_of_tracker_which_was_not_retrieved(default_domain):
+    broker = RecordingEventChannel()
+    store = InMemoryTrackerStore(default_domain, event_broker=broker)
+    store.get_or_create_tracker("myuser")
+
+    replaced = DialogueStateTracker.from_events(
+        "myuser",
+        [ActionExecuted("action_listen"), SlotSet("location", "Easter Island")],
+        default_domain.slots,
+    )
+    store.save(replaced)
+
+    assert [e["event"] for e in broker.published] == ["action", "slot"]
+
+
+class CustomTrackerStore(TrackerStore):
+    def __init__(self, domain, event_broker=None):
+        super(CustomTrackerStore, self).__init__(domain, event_broker)
+        self.store = {}
+
+    def save(self, tracker):
+        if self.event_broker:
+            self.stream_events(tracker)
+        self.store[tracker.sender_id] = self.serialise_tracker(tracker)
+
+    def retrieve(self, sender_id):
+        if sender_id in self.store:
+            return self.deserialise_tracker(sender_id, self.store[sender_id])
+
+
+def test_stream_events_of_custom_tracker_store(default_domain):
+    broker = RecordingEventChannel()
+    store = CustomTrackerStore(default_domain, event_broker=broker)
+
+    tracker = store.get_or_create_tracker("myuser")
+    tracker.update(SlotSet("location", "Easter Island"))
+    store.save(tracker)
+    store.save(tracker)
+
+    assert [e["event"] for e in broker.published] == ["action", "slot"]
+
+
+def test_events_since_persisted_with_max_event_history(default_domain):
+    store = InMemoryTrackerStore(default_domain)
+    tracker = store.get_or_create_tracker("myuser", max_event_history=3)
+    new_events = [SlotSet("location", str(i)) for i in range(5)]
+    for e in new_events:
+        tracker.update(e)
+
+    assert tracker.events_since_persisted() == new_events[-3:]
+
+    store.save(tracker)
+    assert tracker.events_since_persisted() == []
+
+
+def test_sql_tracker_store_saves_only_new_events(default_domain, tmpdir):
+    from rasa.core.tracker_store import SQLTrackerStore
+
+    store = SQLTrackerStore(default_domain, db=tmpdir.join("rasa.db").strpath)
+    tracker = store.get_or_create_tracker("myuser")
+    tracker.update(SlotSet("location", "Easter Island"))
+    store.save(tracker)
+
+    tracker = store.retrieve("myuser")
+    tracker.update(Restarted())
+    store.save(tracker)
+
+    stored = store.session.query(store.SQLEvent).filter_by(sender_id="myuser")
+    assert [e.type_name for e in stored.all()] == ["action", "slot", "restart"]
@@ -44,6 +44,28 @@ async def test_story_visualization_with_merging(default_domain):
     assert 20 < len(generated_graph.edges()) < 33
 
 
+async def test_story_visualization_with_max_nodes(default_domain):
+    story_steps = await StoryFileReader.read_from_file(
+        "data/test_stories/stories.md", default_domain, interpreter=RegexInterpreter()
+    )
+
+    async def visualize(max_nodes):
+        return await visualize_stories(
+            story_steps,
+            default_domain,
+            output_file=None,
+            max_history=3,
+            should_merge_nodes=False,
+            max_nodes=max_nodes,
+        )
+
+    limited_graph = await visualize(max_nodes=10)
+    full_graph = await visualize(max_nodes=None)
+
+    assert 10 <= len(limited_graph.nodes()) < len(full_graph.nodes())
+    assert len(limited_graph.edges()) < len(full_graph.edges())
+
+
 async def test_training_script(tmpdir):
     await train(
         DEFAULT_DOMAIN_PATH,
@@ -108,6 +130,61 @@ async def test_training_script_with_restart_stories(tmpdir):
     assert True
 
 
+async def test_training_script_reuses_cached_training_data(tmpdir, caplog):
+    import logging
+    import os
+
+    cache_dir = os.path.join(tmpdir.strpath, "cache")
+
+    agent_1 = await train(
+        DEFAULT_DOMAIN_PATH,
+        DEFAULT_STORIES_FILE,
+        os.path.join(tmpdir.strpath, "model_1"),
+        interpreter=RegexInterpreter(),
+        policy_config="data/test_config/keras_random_seed.yaml",
+        kwargs={"cache_dir": cache_dir},
+    )
+    assert os.listdir(os.path.join(cache_dir, "trackers"))
+    assert os.listdir(os.path.join(cache_dir, "training_data"))
+
+    with caplog.at_level(logging.INFO, logger="rasa.core.training.cache"):
+        agent_2 = await train(
+            DEFAULT_DOMAIN_PATH,
+            DEFAULT_STORIES_FILE,
+            os.path.join(tmpdir.strpath, "model_2"),
+            interpreter=RegexInterpreter(),
+            policy_config="data/test_config/keras_random_seed.yaml",
+            kwargs={"cache_dir": cache_dir},
+        )
+    assert "Training trackers cache hit" in caplog.text
+    assert "Featurized training data cache hit" in caplog.text
+
+    probs_1 = agent_1.create_processor().predict_next("1")
+    probs_2 = agent_2.create_processor().predict_next("2")
+    assert probs_1["confidence"] == probs_2["confidence"]
+
+
+def test_training_data_key_of_cached_trackers(tmpdir, default_domain):
+    from rasa.core.featurizers import MaxHistoryTrackerFeaturizer
+    from rasa.core.trackers import DialogueStateTracker
+    from rasa.core.training.cache import TrainingDataCache
+
+    cache = TrainingDataCache(tmpdir.strpath)
+    featurizer = MaxHistoryTrackerFeaturizer()
+    trackers = [DialogueStateTracker("default", default_domain.slots)]
+
+    persisted = cache.persist_trackers("trackers", trackers)
+    loaded = cache.load_trackers("trackers", default_domain)
+
+    assert persisted == loaded == trackers
+    key = cache.training_data_key(loaded, featurizer)
+    assert key is not None
+    assert cache.training_data_key(persisted, featurizer) == key
+    # the key is not derived from the identity of the tracker list
+    assert cache.training_data_key(list(loaded), featurizer) is None
+    assert cache.training_data_key(loaded, featurizer, max_history=3) != key
+
+
 def configs_for_random_seed_test():
     # define the configs for the random_seed tests
     return [
@@ -144,3 +221,63 @@ async def test_random_seed(tmpdir, config_file):
     probs_1 = processor_1.predict_next("1")
     probs_2 = processor_2.predict_next("2")
     assert probs_1["confidence"] == probs_2["confidence"]
+
+
+async def test_continue_training_on_new_stories(tmpdir):
+    import os
+    from rasa import model
+    from rasa.train import continue_training_async
+
+    old_stories = tmpdir.join("old_stories.md")
+    old_stories.write("## greet\n* greet\n    - utter_greet\n")
+    new_stories = tmpdir.join("new_stories.md")
+    new_stories.write("## goodbye\n* goodbye\n    - utter_goodbye\n")
+    config = tmpdir.join("config.yml")
+    config.write("policies:\n  - name: MemoizationPolicy\n    max_history: 2\n")
+
+    train_path = tmpdir.join("train").strpath
+    old_agent = await train(
+        DEFAULT_DOMAIN_PATH,
+        old_stories.strpath,
+        os.path.join(train_path, "core"),
+        interpreter=RegexInterpreter(),
+        policy_config=config.strpath,
+        kwargs={"augmentation_factor": 0},
+    )
+    old_model = tmpdir.join("old.tar.gz").strpath
+    old_fingerprint = model.model_fingerprint(
+        config.strpath, DEFAULT_DOMAIN_PATH, stories=old_stories.strpath
+    )
+    model.create_package_rasa(train_path, old_model, old_fingerprint)
+
+    new_model = await continue_training_async(
+        old_model, new_stories.strpath, tmpdir.join("models").strpath
+    )
+
+    unpacked = model.get_model(new_model)
+    fingerprint = model.fingerprint_from_path(unpacked)
+    assert len(fingerprint[model.FINGERPRINT_STORIES_KEY]) == 2
+    assert fingerprint[model.FINGERPRINT_POLICIES_KEY] == []
+
+    agent = Agent.load(os.path.join(unpacked, "core"))
+    old_lookup = old_agent.policy_ensemble.policies[0].lookup
+    new_lookup = agent.policy_ensemble.policies[0].lookup
+    assert set(old_lookup.items()) < set(new_lookup.items())
+    assert agent.policy_ensemble.replay_buffer.num_seen == 2
+    assert [
+        d["sender_id"] for d in agent.policy_ensemble.replay_buffer.dialogues
+    ] == ["greet", "goodbye"]
+
+
+def test_replay_buffer_is_bounded(default_domain):
+    from rasa.core.trackers import DialogueStateTracker
+    from rasa.core.training.replay import ReplayBuffer
+
+    buffer = ReplayBuffer(max_size=3)
+    buffer.add(
+        [DialogueStateTracker(str(i), default_domain.slots) for i in range(10)]
+    )
+
+    assert len(buffer) == 3
+    assert buffer.num_seen == 10
+    assert len(buffer.trackers(default_domain)) == 3
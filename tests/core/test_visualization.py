@@ -99,3 +99,62 @@ async def test_graph_persistence(default_domain, tmpdir):
 
     assert "isClient = true" in content
     assert "graph = `{}`".format(generated_graph.to_string()) in content
+
+
+async def test_merging_repeated_conversations():
+    events = [
+        ActionExecuted("action_listen"),
+        UserUttered("/greet", {"name": "greet", "confidence": 1.0}),
+        ActionExecuted("utter_greet"),
+        ActionExecuted("action_listen"),
+        UserUttered("/goodbye", {"name": "goodbye", "confidence": 1.0}),
+        ActionExecuted("utter_goodbye"),
+    ]
+
+    once = await visualization.visualize_neighborhood(None, [events])
+    repeated = await visualization.visualize_neighborhood(None, [events] * 3)
+
+    assert len(repeated.nodes()) == len(once.nodes())
+    assert len(repeated.edges()) == len(once.edges())
+
+
+def test_equivalence_candidates():
+    import networkx as nx
+
+    graph = nx.MultiDiGraph()
+    for node in [1, 2, 3]:
+        graph.add_node(node, label="utter_greet")
+    graph.add_node(4, label="utter_goodbye")
+    graph.add_node(5, label="utter_thanks")
+    for node, label in [(6, "a"), (7, "b"), (8, "c")]:
+        graph.add_node(node, label=label)
+        graph.add_edge(node, node - 5, key=label)
+    # 1 and 2 lead to the same node, 3 leads somewhere else
+    graph.add_edge(1, 4, key="goodbye")
+    graph.add_edge(2, 4, key="goodbye")
+    graph.add_edge(3, 5, key="thanks")
+
+    candidates = visualization._equivalence_candidates(graph, max_history=2)
+    assert list(candidates) == [(1, 2)]
+
+
+def test_equivalence_of_merged_nodes_is_checked_again():
+    import networkx as nx
+
+    graph = nx.MultiDiGraph()
+    for node in [1, 2, 3]:
+        graph.add_node(node, label="utter_greet")
+    graph.add_node(4, label="utter_goodbye")
+    graph.add_node(5, label="utter_thanks")
+    for node, label in [(6, "a"), (7, "b"), (8, "c")]:
+        graph.add_node(node, label=label)
+        graph.add_edge(node, node - 5, key=label)
+    # 1 is equivalent to 2 and to 3, as it has no outgoing edges, but 2 and 3
+    # lead to different nodes
+    graph.add_edge(2, 4, key="goodbye")
+    graph.add_edge(3, 5, key="thanks")
+
+    visualization._merge_equivalent_nodes(graph, max_history=2)
+
+    labels = [label for _, label in graph.nodes(data="label")]
+    assert labels.count("utter_greet") == 2
@@ -20,6 +20,7 @@ from rasa.nlu.test import (
     remove_duckling_extractors,
     drop_intents_below_freq,
     cross_validate,
+    generate_folds,
     substitute_labels,
     IntentEvaluationResult,
     evaluate_intents,
@@ -27,6 +28,7 @@ from rasa.nlu.test import (
 )
 from rasa.nlu.test import does_token_cross_borders
 from rasa.nlu.test import align_entity_predictions
+from rasa.nlu.test import align_all_entity_predictions
 from rasa.nlu.test import determine_intersection
 from rasa.nlu.test import determine_token_labels
 from rasa.nlu.config import RasaNLUModelConfig
@@ -252,6 +254,40 @@ def test_run_cv_evaluation():
     assert len(entity_results.test["CRFEntityExtractor"]["F1-score"]) == n_folds
 
 
+def test_generate_folds_with_seed_are_reproducible():
+    td = training_data.load_data("data/examples/rasa/demo-rasa.json")
+
+    def fold_texts(random_seed):
+        return [
+            [e.text for e in test.training_examples]
+            for _, test in generate_folds(3, td, random_seed)
+        ]
+
+    assert fold_texts(42) == fold_texts(42)
+    assert fold_texts(42) != fold_texts(43)
+
+
+def test_cross_validate_in_worker_processes():
+    td = training_data.load_data("data/examples/rasa/demo-rasa.json")
+    nlu_config = RasaNLUModelConfig(
+        {
+            "pipeline": [
+                {"name": "WhitespaceTokenizer"},
+                {"name": "RegexFeaturizer"},
+                {"name": "KeywordIntentClassifier"},
+            ]
+        }
+    )
+
+    sequential = cross_validate(td, 3, nlu_config, random_seed=42)
+    parallel = cross_validate(
+        td, 3, nlu_config, worker_processes=2, num_threads=1, random_seed=42
+    )
+
+    assert parallel == sequential
+    assert len(parallel[0].test["Accuracy"]) == 3
+
+
 def test_intent_evaluation_report(tmpdir_factory):
     path = tmpdir_factory.mktemp("evaluation").strpath
     report_folder = os.path.join(path, "reports")
@@ -377,6 +413,68 @@ def test_evaluate_entities_cv():
     }, "Wrong entity prediction alignment"
 
 
+def test_align_all_entity_predictions_labels_like_single_tokens():
+    import random
+
+    rng = random.Random(42)
+    extractors = ["A", "B"]
+    targets, predictions, tokens = [], [], []
+    for _ in range(200):
+        message_tokens = []
+        position = 0
+        for _ in range(rng.randint(0, 10)):
+            position += rng.randint(0, 2)
+            text = "x" * rng.randint(0, 6)
+            message_tokens.append(Token(text, position))
+            position += len(text)
+        tokens.append(message_tokens)
+
+        message_targets = []
+        start = rng.randint(0, 5)
+        while start < position and rng.random() < 0.7:
+            end = start + rng.randint(1, 10)
+            message_targets.append(
+                {"start": start, "end": end, "entity": rng.choice("abc")}
+            )
+            start = end + rng.randint(0, 5)
+        targets.append(message_targets)
+
+        message_predictions = []
+        for _ in range(rng.randint(0, 4)):
+            start = rng.randint(0, position + 2)
+            message_predictions.append(
+                {
+                    "start": start,
+                    "end": start + rng.randint(0, 10),
+                    "entity": rng.choice("abcd"),
+                    "extractor": rng.choice(extractors),
+                }
+            )
+        predictions.append(message_predictions)
+
+    aligned = align_all_entity_predictions(targets, predictions, tokens, extractors)
+
+    for ts, ps, tks, result in zip(targets, predictions, tokens, aligned):
+        assert result["target_labels"] == [
+            determine_token_labels(t, ts, None) for t in tks
+        ]
+        for extractor in extractors:
+            entities = [p for p in ps if p["extractor"] == extractor]
+            assert result["extractor_labels"][extractor] == [
+                determine_token_labels(t, entities, extractor) for t in tks
+            ]
+
+
+def test_align_all_entity_predictions_with_overlapping_targets():
+    with pytest.raises(ValueError):
+        align_all_entity_predictions(
+            [EN_targets, [CH_correct_entity, CH_wrong_entity]],
+            [[], []],
+            [EN_tokens, CH_correct_segmentation],
+            ["A"],
+        )
+
+
 def test_get_entity_extractors(duckling_interpreter):
     assert get_entity_extractors(duckling_interpreter) == {"DucklingHTTPExtractor"}
 
@@ -145,6 +145,31 @@ def test_crf_json_from_non_BILOU(spacy_nlp, ner_crf_pos_feature_config):
     assert rs[4] == {"start": 29, "end": 31, "value": "by", "entity": "where"}
 
 
+def test_crf_features_memoized_and_parallel():
+    from rasa.nlu.extractors.crf_entity_extractor import CRFEntityExtractor
+    from rasa.nlu.tokenizers.whitespace_tokenizer import WhitespaceTokenizer
+
+    ext = CRFEntityExtractor()
+    tokenizer = WhitespaceTokenizer()
+    sentences = ["book a table in Berlin", "a table for Berlin please"]
+    dataset = []
+    for sentence in sentences:
+        message = Message(sentence)
+        message.set("tokens", tokenizer.tokenize(sentence))
+        dataset.append(ext._from_text_to_crf(message))
+
+    first = [ext._sentence_to_features(sent) for sent in dataset]
+    # features of repeated words are served from the cache
+    assert ext._word_features_cache
+    second = [ext._sentence_to_features(sent) for sent in dataset]
+    assert first == second
+    assert first[1][3]["0:low"] == "berlin"
+    assert first[1][3]["-1:low"] == "for"
+    assert "EOS" in first[0][-1]
+
+    assert ext._dataset_to_features(dataset, num_threads=2) == first
+
+
 def test_duckling_entity_extractor(component_builder):
     httpretty.register_uri(
         httpretty.POST,
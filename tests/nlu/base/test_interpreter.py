@@ -65,3 +65,55 @@ def test_model_not_compatible(metadata):
 def test_model_is_compatible(metadata):
     # should not raise an exception
     assert Interpreter.ensure_model_compatibility(metadata) is None
+
+
+def test_interpreter_profiles_components():
+    from rasa.nlu.profiling import PipelineProfiler
+    from rasa.nlu.tokenizers.whitespace_tokenizer import WhitespaceTokenizer
+
+    profiler = PipelineProfiler(trace_allocations=True)
+    interpreter = Interpreter([WhitespaceTokenizer()], {}, profiler=profiler)
+    interpreter.parse("hello there")
+    interpreter.parse("good bye")
+
+    report = profiler.report()
+    assert report["WhitespaceTokenizer"]["calls"] == 2
+    assert report["WhitespaceTokenizer"]["total_time"] > 0
+    assert report["WhitespaceTokenizer"]["allocated_bytes"] >= 0
+
+
+def test_loading_stages_isolate_context_providers():
+    from rasa.nlu.model import Metadata
+
+    pipeline = [
+        {"name": "SpacyNLP", "class": "SpacyNLP"},
+        {"name": "SpacyTokenizer", "class": "SpacyTokenizer"},
+        {"name": "SpacyFeaturizer", "class": "SpacyFeaturizer"},
+        {"name": "MitieNLP", "class": "MitieNLP"},
+        {"name": "MitieEntityExtractor", "class": "MitieEntityExtractor"},
+    ]
+    stages = Interpreter._loading_stages(Metadata({"pipeline": pipeline}, None))
+
+    assert [[c["name"] for c in stage] for stage in stages] == [
+        ["SpacyNLP"],
+        ["SpacyTokenizer", "SpacyFeaturizer"],
+        ["MitieNLP"],
+        ["MitieEntityExtractor"],
+    ]
+
+
+def test_interpreter_loads_components_in_parallel(tmpdir):
+    from rasa.nlu.config import RasaNLUModelConfig
+    from rasa.nlu.model import Trainer
+
+    trainer = Trainer(RasaNLUModelConfig({"pipeline": "keyword"}))
+    trainer.train(training_data.load_data("data/examples/rasa/demo-rasa.json"))
+    model_dir = trainer.persist(tmpdir.strpath)
+
+    sequential = Interpreter.load(model_dir)
+    parallel = Interpreter.load(model_dir, num_threads=4)
+
+    assert [c.name for c in parallel.pipeline] == [
+        c.name for c in sequential.pipeline
+    ]
+    assert parallel.parse("hello")["intent"] == sequential.parse("hello")["intent"]
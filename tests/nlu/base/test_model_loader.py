@@ -29,3 +29,24 @@ async def test_load_model_from_server(trained_nlu_model):
         ComponentBuilder(use_cache=False), model_server=model_endpoint
     )
     assert nlu_model.fingerprint == fingerprint
+
+
+def test_profiling_after_model_update(tmpdir):
+    from rasa.nlu import training_data
+    from rasa.nlu.config import RasaNLUModelConfig
+    from rasa.nlu.model import Trainer
+    from rasa.nlu.profiling import PipelineProfiler
+
+    trainer = Trainer(RasaNLUModelConfig({"pipeline": "keyword"}))
+    trainer.train(training_data.load_data("data/examples/rasa/demo-rasa.json"))
+    model_dir = trainer.persist(tmpdir.strpath)
+
+    profiler = PipelineProfiler()
+    component_builder = ComponentBuilder(use_cache=False)
+    nlu_model = NLUModel.fallback_model(component_builder, profiler)
+    # the model pulling worker replaces the interpreter of the model
+    nlu_model.update_model(component_builder, model_dir, "updated")
+    nlu_model.parse("hello", None)
+
+    assert nlu_model.name == "updated"
+    assert profiler.report()["KeywordIntentClassifier"]["calls"] == 1
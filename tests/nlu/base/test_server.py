@@ -58,6 +58,28 @@ def test_status(app):
     assert "max_worker_processes" in rjs
 
 
+def test_profiling_metrics(app):
+    _, response = app.put("/profiling", json={"enabled": True})
+    assert response.status == 200
+    assert response.json["profiling"] == {}
+
+    _, response = app.get("/parse?q=hello")
+    assert response.status == 200
+
+    _, response = app.get("/status")
+    profiling = response.json["profiling"]
+    # the test model only consists of a keyword intent classifier
+    assert set(profiling) == {"KeywordIntentClassifier"}
+    assert profiling["KeywordIntentClassifier"]["calls"] == 1
+
+    _, response = app.get("/metrics")
+    assert response.status == 200
+    assert "rasa_nlu_component_duration_seconds_count" in response.text
+
+    _, response = app.put("/profiling", json={"enabled": False, "reset": True})
+    assert "profiling" not in response.json
+
+
 def test_version(app):
     _, response = app.get("/version")
     rjs = response.json
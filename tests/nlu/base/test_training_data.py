@@ -501,3 +501,17 @@ def test_markdown_entity_regex():
         ],
     }
     assert fourth.text == "show me chines restaurants"
+
+
+def test_message_views_are_memoized_and_invalidated():
+    from rasa.nlu.training_data import Message
+
+    message = Message("Hello World")
+    message.set("tokens", WhitespaceTokenizer().tokenize(message.text))
+
+    texts = message.get_view("token_texts")
+    assert texts == ["Hello", "World"]
+    assert message.get_view("token_texts") is texts
+
+    message.set("tokens", WhitespaceTokenizer().tokenize("Hello"))
+    assert message.get_view("token_texts") == ["Hello"]
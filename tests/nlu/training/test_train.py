@@ -120,6 +120,30 @@ def test_random_seed(component_builder, tmpdir):
     assert result_a == result_b
 
 
+@utilities.slowtest
+def test_embedding_numpy_inference(component_builder, tmpdir):
+    """test if embedding messages with numpy gives the same intent ranking"""
+
+    _config = utilities.base_test_conf("supervised_embeddings")
+    _config.set_component_attr(5, random_seed=1, epochs=5)
+    (_, _, persisted_path) = train(
+        _config,
+        path=tmpdir.strpath,
+        data=DEFAULT_DATA_PATH,
+        component_builder=component_builder,
+    )
+    loaded = Interpreter.load(persisted_path, component_builder)
+    classifier = loaded.pipeline[-1]
+    assert classifier.all_intents_embed is not None
+
+    result_tf = loaded.parse("hello")["intent"]
+    classifier.message_tower_weights = classifier._message_tower_weights()
+    result_numpy = loaded.parse("hello")["intent"]
+
+    assert result_tf["name"] == result_numpy["name"]
+    assert result_tf["confidence"] == pytest.approx(result_numpy["confidence"], abs=1e-5)
+
+
 @utilities.slowtest
 @pytest.mark.parametrize("language, pipeline", pipelines_for_tests())
 def test_train_model_on_test_pipelines(language, pipeline, component_builder, tmpdir):
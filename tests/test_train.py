@@ -0,0 +1,43 @@
+import io
+import os
+import time
+
+import pytest
+
+from rasa.train import TrainingFailed, train_in_parallel
+
+
+def _fail():
+    raise ValueError("broken training")
+
+
+def _sleep():
+    time.sleep(60)
+
+
+def _write_thread_limit(path):
+    with io.open(path, "w") as f:
+        f.write(os.environ["OMP_NUM_THREADS"])
+
+
+async def test_train_in_parallel(tmpdir):
+    paths = [tmpdir.join("a").strpath, tmpdir.join("b").strpath]
+
+    await train_in_parallel(
+        [(p, _write_thread_limit, (p,)) for p in paths], num_threads=3
+    )
+
+    for path in paths:
+        with io.open(path) as f:
+            # values set by the user are kept
+            assert f.read() == os.environ.get("OMP_NUM_THREADS", "3")
+
+
+async def test_train_in_parallel_stops_trainings_on_failure():
+    start = time.time()
+
+    with pytest.raises(TrainingFailed) as e:
+        await train_in_parallel([("fails", _fail, ()), ("sleeps", _sleep, ())])
+
+    assert "broken training" in str(e.value)
+    assert time.time() - start < 60
@@ -51,3 +51,25 @@ async def test_endpoint_config():
             assert s._default_headers.get("X-Powered-By") == "Rasa"
             assert s._default_auth.login == "user"
             assert s._default_auth.password == "pass"
+
+
+def test_limited_threads_are_inherited_by_started_processes(monkeypatch):
+    import multiprocessing
+    import os
+    from rasa.utils.common import limited_threads
+
+    monkeypatch.delenv("OMP_NUM_THREADS", raising=False)
+    monkeypatch.setenv("MKL_NUM_THREADS", "4")
+
+    with limited_threads(2):
+        pool = multiprocessing.get_context("spawn").Pool(1)
+    try:
+        assert pool.apply(os.getenv, ("OMP_NUM_THREADS",)) == "2"
+        # values set by the user are kept
+        assert pool.apply(os.getenv, ("MKL_NUM_THREADS",)) == "4"
+    finally:
+        pool.terminate()
+        pool.join()
+
+    assert "OMP_NUM_THREADS" not in os.environ
+    assert os.environ["MKL_NUM_THREADS"] == "4"